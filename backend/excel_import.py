@@ -0,0 +1,276 @@
+"""
+Excel import engine
+Shared by the report, iskele, makine and kategori importers. An upload is
+spooled to disk, streamed with openpyxl's read-only mode and validated in
+batches by the importer; the valid rows are then either committed at once or,
+for a dry run, kept under a preview token so that a later commit applies
+them without parsing the file again.
+
+Previews are spooled as JSON files under PREVIEW_DIR/<user>/<token>.json,
+so any worker can commit them; each user keeps at most MAX_PREVIEWS_PER_USER
+and files expire after PREVIEW_TTL_SECONDS.
+
+Each router registers an ExcelImporter with register_importer():
+  validate(batch, context, state) -> (valid [(row, fields)], errors [{row, field, message}], skipped)
+  commit(valid, context, errors) -> number of records written
+`state` lives for one parse (e.g. values already seen in earlier batches);
+`context` carries the request data the importer needs (project, user).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import secrets
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from openpyxl import load_workbook
+from pymongo.errors import BulkWriteError
+
+# Rows parsed/validated and inserted per block
+IMPORT_BATCH_SIZE = 1000
+PREVIEW_ROWS = 20
+PREVIEW_TTL_SECONDS = 30 * 60
+MAX_PREVIEWS_PER_USER = 5
+PREVIEW_DIR = Path(tempfile.gettempdir()) / "ekos_excel_previews"
+PREVIEW_TOKEN = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+ValidRows = List[Tuple[int, dict]]
+
+
+class ExcelImporter(NamedTuple):
+    label: str  # "rapor", "makine", ... as used in messages
+    roles: Tuple[str, ...]
+    validate: Callable[[list, dict, dict], Awaitable[Tuple[ValidRows, List[dict], int]]]
+    commit: Callable[[ValidRows, dict, List[dict]], Awaitable[int]]
+    message: Optional[Callable[[int, int, int], str]] = None
+
+
+IMPORTERS: Dict[str, ExcelImporter] = {}
+
+
+def register_importer(name: str, importer: ExcelImporter):
+    IMPORTERS[name] = importer
+
+
+def cell_text(row: tuple, index: int) -> Optional[str]:
+    """Cell text, None for empty/missing cells"""
+    value = row[index] if index < len(row) else None
+    return str(value) if value else None
+
+
+def row_error(row_idx: int, field: Optional[str], message: str) -> dict:
+    return {"row": row_idx, "field": field, "message": message}
+
+
+async def spool_upload(file: UploadFile, suffix: str = ".xlsx") -> str:
+    """Copy an upload to a temp file in 1MB chunks (read-only openpyxl needs a real file)"""
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(fd, "wb") as f:
+        while chunk := await file.read(1024 * 1024):
+            f.write(chunk)
+    return path
+
+
+def iter_sheet_rows(path: str, batch_size: int = IMPORT_BATCH_SIZE):
+    """(row number, values) of the active sheet in read-only mode, in batches, skipping the header and empty rows"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        batch = []
+        for row_idx, row in enumerate(wb.active.iter_rows(min_row=2, values_only=True), 2):
+            if not row or not any(row):
+                continue
+            batch.append((row_idx, row))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        wb.close()
+
+
+async def insert_rows(collection, docs: List[dict], rows: List[int], errors: List[dict]) -> int:
+    """Unordered insert_many in IMPORT_BATCH_SIZE chunks; rejected documents are reported against their sheet row"""
+    inserted = 0
+    for i in range(0, len(docs), IMPORT_BATCH_SIZE):
+        chunk = docs[i:i + IMPORT_BATCH_SIZE]
+        try:
+            result = await collection.insert_many(chunk, ordered=False)
+            inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            for err in e.details.get("writeErrors", []):
+                message = "Kayıt zaten mevcut" if err.get("code") == 11000 else f"Kaydedilemedi: {err.get('errmsg', '')}"
+                errors.append(row_error(rows[i + err["index"]], None, message))
+            inserted += e.details.get("nInserted", 0)
+    return inserted
+
+
+async def parse_upload(file: UploadFile, importer: ExcelImporter, context: dict) -> dict:
+    """Stream and validate the whole sheet; nothing is written"""
+    if not file.filename.endswith(('.xlsx', '.xls')):
+        raise HTTPException(status_code=400, detail="Sadece Excel dosyaları yüklenebilir")
+
+    path = await spool_upload(file)
+    rows = None
+    parsed = {"total_rows": 0, "valid": [], "errors": [], "skipped": 0}
+    state = {}
+    try:
+        rows = iter_sheet_rows(path)
+        while (batch := await asyncio.to_thread(next, rows, None)) is not None:
+            parsed["total_rows"] += len(batch)
+            valid, errors, skipped = await importer.validate(batch, context, state)
+            parsed["valid"].extend(valid)
+            parsed["errors"].extend(errors)
+            parsed["skipped"] += skipped
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Excel işleme hatası: {str(e)}")
+    finally:
+        if rows is not None:
+            rows.close()
+        os.remove(path)
+    return parsed
+
+
+def _summary(importer: ExcelImporter, imported: int, parsed: dict, errors: List[dict]) -> dict:
+    errors = sorted(errors, key=lambda error: error["row"])
+    if importer.message:
+        message = importer.message(imported, parsed["skipped"], len(errors))
+    else:
+        message = f"{imported} {importer.label} başarıyla içe aktarıldı"
+    return {
+        "message": message,
+        "imported_count": imported,
+        "total_rows": parsed["total_rows"],
+        "skipped_count": parsed["skipped"],
+        "errors": [f"Satır {error['row']}: {error['message']}" for error in errors],
+        "error_rows": errors
+    }
+
+
+async def _commit(importer: ExcelImporter, parsed: dict, context: dict) -> dict:
+    errors = list(parsed["errors"])
+    imported = await importer.commit(parsed["valid"], context, errors) if parsed["valid"] else 0
+    return _summary(importer, imported, parsed, errors)
+
+
+def _user_preview_dir(user_id: str) -> Path:
+    return PREVIEW_DIR / hashlib.sha256(user_id.encode()).hexdigest()[:32]
+
+
+def _preview_path(user_id: str, token: str) -> Path:
+    if not PREVIEW_TOKEN.match(token):
+        raise HTTPException(status_code=404, detail="Önizleme bulunamadı veya süresi doldu, dosyayı tekrar yükleyin")
+    return _user_preview_dir(user_id) / f"{token}.json"
+
+
+def _prune_previews(user_dir: Path):
+    """Remove expired previews (all users) and the user's oldest ones beyond MAX_PREVIEWS_PER_USER - 1"""
+    now = time.time()
+    if PREVIEW_DIR.exists():
+        for path in PREVIEW_DIR.glob("*/*"):
+            try:
+                if now - path.stat().st_mtime > PREVIEW_TTL_SECONDS:
+                    path.unlink(missing_ok=True)
+            except OSError:
+                pass
+    if user_dir.exists():
+        previews = sorted(user_dir.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for path in previews[:max(len(previews) - MAX_PREVIEWS_PER_USER + 1, 0)]:
+            path.unlink(missing_ok=True)
+
+
+def _write_preview(user_id: str, token: str, entry: dict):
+    user_dir = _user_preview_dir(user_id)
+    _prune_previews(user_dir)
+    user_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=user_dir, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp, _preview_path(user_id, token))
+
+
+def _read_preview(path: Path) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry["expires_at"] < time.time():
+        return None
+    entry["parsed"]["valid"] = [(row_idx, fields) for row_idx, fields in entry["parsed"]["valid"]]
+    return entry
+
+
+async def run_import(name: str, file: UploadFile, context: dict, current_user: dict, dry_run: bool = False) -> dict:
+    """
+    Parse and validate an upload (the caller checks the role and builds the
+    context). With dry_run the result is spooled to disk and a
+    preview (counts, first valid rows, every row error) is returned with the
+    token to commit; otherwise it is committed right away.
+    """
+    importer = IMPORTERS[name]
+    parsed = await parse_upload(file, importer, context)
+
+    if not dry_run:
+        return await _commit(importer, parsed, context)
+
+    token = secrets.token_urlsafe(16)
+    await asyncio.to_thread(_write_preview, current_user["id"], token, {
+        "importer": name,
+        "context": context,
+        "parsed": parsed,
+        "expires_at": time.time() + PREVIEW_TTL_SECONDS
+    })
+    errors = sorted(parsed["errors"], key=lambda error: error["row"])
+    return {
+        "dry_run": True,
+        "token": token,
+        "expires_in": PREVIEW_TTL_SECONDS,
+        "total_rows": parsed["total_rows"],
+        "valid_count": len(parsed["valid"]),
+        "error_count": len(errors),
+        "skipped_count": parsed["skipped"],
+        "preview": [{"row": row_idx, **fields} for row_idx, fields in parsed["valid"][:PREVIEW_ROWS]],
+        "errors": [f"Satır {error['row']}: {error['message']}" for error in errors],
+        "error_rows": errors
+    }
+
+
+async def commit_preview(token: str, current_user: dict) -> dict:
+    """
+    Apply a dry-run result once: the file is claimed with an atomic rename,
+    so a second commit (from any worker) finds nothing. The role is checked
+    again in case it changed since the preview.
+    """
+    path = _preview_path(current_user["id"], token)
+    claimed = path.with_suffix(".committing")
+    try:
+        os.rename(path, claimed)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Önizleme bulunamadı veya süresi doldu, dosyayı tekrar yükleyin")
+    try:
+        entry = await asyncio.to_thread(_read_preview, claimed)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Önizleme bulunamadı veya süresi doldu, dosyayı tekrar yükleyin")
+        importer = IMPORTERS[entry["importer"]]
+        if current_user.get("role") not in importer.roles:
+            os.rename(claimed, path)
+            raise HTTPException(status_code=403, detail="Excel içe aktarma yetkiniz yok")
+        return await _commit(importer, entry["parsed"], entry["context"])
+    finally:
+        claimed.unlink(missing_ok=True)
+
+
+def discard_preview(token: str, current_user: dict):
+    path = _preview_path(current_user["id"], token)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Önizleme bulunamadı veya süresi doldu, dosyayı tekrar yükleyin")
+    path.unlink(missing_ok=True)
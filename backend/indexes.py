@@ -0,0 +1,97 @@
+"""
+MongoDB index registry
+Each router module registers the indexes its queries rely on with
+register_index(); startup_db applies them with apply_indexes() and
+index_report() compares the registry with what the database has.
+"""
+
+import logging
+from typing import Dict, List, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+IndexKeys = Union[str, Sequence[Tuple[str, int]]]
+
+# collection -> index name -> {"keys": [(field, direction), ...], "options": {...}}
+INDEX_REGISTRY: Dict[str, Dict[str, dict]] = {}
+
+
+def _normalize_keys(keys: IndexKeys) -> List[Tuple[str, int]]:
+    if isinstance(keys, str):
+        return [(keys, 1)]
+    return [(field, direction) for field, direction in keys]
+
+
+def index_name(keys: IndexKeys) -> str:
+    """MongoDB's default index name for a key spec (e.g. draw_id_1_id_no_1)"""
+    return "_".join(f"{field}_{direction}" for field, direction in _normalize_keys(keys))
+
+
+def register_index(collection: str, keys: IndexKeys, **options):
+    """Declare an index (create_index options such as unique=True are passed through)"""
+    normalized = _normalize_keys(keys)
+    name = options.pop("name", None) or index_name(normalized)
+    INDEX_REGISTRY.setdefault(collection, {})[name] = {"keys": normalized, "options": options}
+
+
+async def apply_indexes(db) -> dict:
+    """
+    Create every registered index. create_index is a no-op for an identical
+    existing index, so this is safe on every startup; an index that cannot be
+    built (e.g. duplicates under a unique key) is reported instead of raising.
+    """
+    report = {"created": [], "existing": [], "failed": []}
+    for collection, indexes in INDEX_REGISTRY.items():
+        try:
+            existing = await db[collection].index_information()
+        except Exception:
+            existing = {}
+        for name, spec in indexes.items():
+            label = f"{collection}.{name}"
+            if name in existing:
+                report["existing"].append(label)
+                continue
+            try:
+                await db[collection].create_index(spec["keys"], name=name, **spec["options"])
+                report["created"].append(label)
+            except Exception as e:
+                report["failed"].append({"index": label, "error": str(e)})
+                logger.warning(f"Index {label} could not be created: {e}")
+    return report
+
+
+async def index_report(db) -> List[dict]:
+    """
+    Per collection: registered indexes missing from the database or built
+    with different keys/uniqueness, indexes the database has but nobody
+    registered, and indexes with no recorded use since the server started
+    ($indexStats).
+    """
+    collections = []
+    for collection in sorted(INDEX_REGISTRY):
+        registered = INDEX_REGISTRY[collection]
+        existing = await db[collection].index_information()
+        usage = {}
+        try:
+            async for stat in db[collection].aggregate([{"$indexStats": {}}]):
+                usage[stat["name"]] = stat["accesses"]["ops"]
+        except Exception as e:
+            logger.warning(f"$indexStats unavailable for {collection}: {e}")
+
+        present = [name for name in existing if name != "_id_"]
+        mismatched = [
+            name for name, spec in registered.items()
+            if name in existing and (
+                [tuple(key) for key in existing[name]["key"]] != spec["keys"]
+                or bool(existing[name].get("unique")) != bool(spec["options"].get("unique"))
+            )
+        ]
+        collections.append({
+            "collection": collection,
+            "missing": [name for name in registered if name not in existing],
+            "mismatched": mismatched,
+            "unregistered": [name for name in present if name not in registered],
+            "unused": [name for name in present if usage.get(name) == 0],
+            "usage": {name: usage.get(name) for name in present}
+        })
+    return collections
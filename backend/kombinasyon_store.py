@@ -0,0 +1,614 @@
+"""
+Kombinasyon Deposu - Şans Topu kombinasyonları için sıkıştırılmış NumPy deposu
+
+Her kombinasyon tek bir satırda tutulur:
+- rows: (N, 6) uint8 dizi -> 5 sıralı ana sayı + 1 bonus
+- keys: (N,) uint64 dizi -> paketlenmiş anahtar
+
+Anahtar yapısı (64 bit):
+- bit 0-33: ana sayı bit maskesi (sayı n -> bit n-1)
+- bit 34-37: bonus sayı (1-14)
+
+1.000.000 kombinasyon ~14 MB tutar (dict/list/tuple yapısında yüzlerce MB).
+
+Üretim motoru beşlileri kombinatoryal sayı sistemi ile sıralar (rank):
+C(34,5) = 278.256 beşlinin her biri 0..278.255 arasında tek bir sayıya karşılık
+gelir. Üretim, bu sıraların NumPy permütasyonu ve vektörel bonus çekimi ile
+tek seferde yapılır.
+
+Snapshot'lar uploads/kombinasyonlar/<çalışma alanı>/<isim>/v<sürüm>/ altında
+ham .npy dosyaları olarak saklanır ve np.load(mmap_mode="r") ile açılır. Böylece
+birden fazla uvicorn worker'ı aynı veriyi işletim sisteminin sayfa önbelleğinden
+paylaşır; indeks de diske yazıldığı için yeniden yükleme anlıktır. Açık
+snapshot'lar bellek bütçeli bir LRU önbellekte tutulur
+(KOMBINASYON_MEMORY_BUDGET_MB).
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from math import comb
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+MAIN_COUNT = 5
+MAIN_MAX = 34
+BONUS_MAX = 14
+ROW_WIDTH = MAIN_COUNT + 1
+
+BONUS_SHIFT = np.uint64(MAIN_MAX)
+MAIN_MASK = np.uint64((1 << MAIN_MAX) - 1)
+# Analytics masks over the main-number bits
+ODD_MASK = np.uint64(sum(1 << (n - 1) for n in range(1, MAIN_MAX + 1, 2)))
+HIGH_MASK = np.uint64(sum(1 << (n - 1) for n in range(MAIN_MAX // 2 + 1, MAIN_MAX + 1)))
+SUM_MIN = sum(range(1, MAIN_COUNT + 1))
+SUM_MAX = sum(range(MAIN_MAX - MAIN_COUNT + 1, MAIN_MAX + 1))
+
+# C(34,5) = 278,256 unique 5-number combinations
+TOTAL_FIVES = comb(MAIN_MAX, MAIN_COUNT)
+# Each five can carry 14 different bonuses
+MAX_COMBINATIONS = TOTAL_FIVES * BONUS_MAX
+
+ROOT_DIR = Path(__file__).parent
+SNAPSHOT_DIR = ROOT_DIR.parent / "uploads" / "kombinasyonlar"
+# Arrays written per snapshot (attribute name -> file name)
+SNAPSHOT_ARRAYS = {
+    "_rows": "rows.npy",
+    "_keys": "keys.npy",
+    "_next_row": "next_row.npy",
+    "_bitmaps": "bitmaps.npy",
+    "_head": "head.npy",
+}
+SNAPSHOT_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+# Versions kept per snapshot name; older ones are removed when a new one is published
+SNAPSHOT_KEEP_VERSIONS = max(int(os.environ.get("KOMBINASYON_KEEP_VERSIONS", "3")), 1)
+
+# Rows unranked per block in chunked generation (background jobs)
+GENERATE_CHUNK_SIZE = 50000  # a multiple of 8: bitmap slices start on a byte
+
+# BINOM[n, k] = C(n, k) for n < 34, k <= 5
+BINOM = np.array(
+    [[comb(n, k) for k in range(MAIN_COUNT + 1)] for n in range(MAIN_MAX)],
+    dtype=np.int64
+)
+
+
+def pack_rows(rows: np.ndarray) -> np.ndarray:
+    """Vectorized key packing for an (N, 6) uint8 array"""
+    bits = np.left_shift(np.uint64(1), rows[:, :MAIN_COUNT].astype(np.uint64) - np.uint64(1))
+    keys = np.bitwise_or.reduce(bits, axis=1)
+    keys |= rows[:, MAIN_COUNT].astype(np.uint64) << BONUS_SHIFT
+    return keys
+
+
+def format_combination(comb: Sequence[int]) -> str:
+    """Format a combination as '5,12,23,27,34+8'"""
+    return f"{comb[0]},{comb[1]},{comb[2]},{comb[3]},{comb[4]}+{comb[5]}"
+
+
+def rank_fives(mains: np.ndarray) -> np.ndarray:
+    """
+    Combinatorial rank of sorted 5-number sets, shape (N, 5) -> (N,).
+    rank = sum C(c_i - 1, i) for i = 1..5 (colex order, 0..278,255)
+    """
+    zero_based = np.asarray(mains, dtype=np.int64).reshape(-1, MAIN_COUNT) - 1
+    ranks = np.zeros(zero_based.shape[0], dtype=np.int64)
+    for i in range(MAIN_COUNT):
+        ranks += BINOM[zero_based[:, i], i + 1]
+    return ranks
+
+
+def unrank_fives(ranks: np.ndarray) -> np.ndarray:
+    """Inverse of rank_fives: ranks (N,) -> sorted 1-based numbers (N, 5) uint8"""
+    remaining = np.asarray(ranks, dtype=np.int64).copy()
+    mains = np.zeros((remaining.shape[0], MAIN_COUNT), dtype=np.uint8)
+    for i in range(MAIN_COUNT, 0, -1):
+        # Largest c with C(c, i) <= remaining
+        c = np.searchsorted(BINOM[:, i], remaining, side="right") - 1
+        mains[:, i - 1] = c + 1
+        remaining -= BINOM[c, i]
+    return mains
+
+
+def draw_ranks(num: int, seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draw (five rank, bonus) pairs for `num` combinations.
+
+    The first min(num, 278,256) rows use every 5-number set at most once
+    (a shuffled permutation of the ranks) with a random bonus. Rows beyond
+    that draw from the (five, bonus) pairs not used yet, so no row repeats.
+    The same seed always produces the same pairs.
+    """
+    rng = np.random.default_rng(seed)
+
+    unique = min(num, TOTAL_FIVES)
+    ranks = rng.permutation(TOTAL_FIVES)[:unique]
+    bonuses = rng.integers(1, BONUS_MAX + 1, size=unique, dtype=np.int64)
+
+    extra = num - unique
+    if extra > 0:
+        # unique == TOTAL_FIVES here, so every rank has a first bonus
+        first_bonus = np.empty(TOTAL_FIVES, dtype=np.int64)
+        first_bonus[ranks] = bonuses
+        pairs = rng.choice(TOTAL_FIVES * (BONUS_MAX - 1), size=extra, replace=False)
+        extra_ranks = pairs // (BONUS_MAX - 1)
+        # Skip over the bonus already used by that five
+        extra_bonuses = (first_bonus[extra_ranks] + pairs % (BONUS_MAX - 1)) % BONUS_MAX + 1
+        ranks = np.concatenate([ranks, extra_ranks])
+        bonuses = np.concatenate([bonuses, extra_bonuses])
+
+    return ranks, bonuses
+
+
+def rows_from_ranks(ranks: np.ndarray, bonuses: np.ndarray) -> np.ndarray:
+    """Build an (N, 6) uint8 block from five ranks and bonuses"""
+    rows = np.empty((len(ranks), ROW_WIDTH), dtype=np.uint8)
+    rows[:, :MAIN_COUNT] = unrank_fives(ranks)
+    rows[:, MAIN_COUNT] = bonuses
+    return rows
+
+
+def iter_generate_rows(num: int, seed: Optional[int] = None,
+                       chunk_size: int = GENERATE_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """Yield the rows of generate_rows(num, seed) in blocks of `chunk_size`"""
+    ranks, bonuses = draw_ranks(num, seed)
+    for start in range(0, num, chunk_size):
+        end = start + chunk_size
+        yield rows_from_ranks(ranks[start:end], bonuses[start:end])
+
+
+def generate_rows(num: int, seed: Optional[int] = None) -> np.ndarray:
+    """Generate `num` combinations as a single (N, 6) uint8 block"""
+    return rows_from_ranks(*draw_ranks(num, seed))
+
+
+class CombinationStore:
+    """
+    Contiguous, append-only store of combinations.
+    Public indices are 1-based (row 0 -> index 1), matching the API.
+
+    The store keeps an inverted index that is updated on every append:
+    - rank chain: head[rank] -> newest row with that five, next_row[row] ->
+      previous row with the same five (exact lookups walk at most 14 rows)
+    - number bitmaps: (34, N/8) packed bits, bit r of bitmap n-1 is set when
+      row r contains number n (partial filters become bitwise ANDs)
+    """
+
+    def __init__(self, capacity: int = 0):
+        self._rows = np.zeros((capacity, ROW_WIDTH), dtype=np.uint8)
+        self._keys = np.zeros(capacity, dtype=np.uint64)
+        self._next_row = np.full(capacity, -1, dtype=np.int32)
+        self._bitmaps = np.zeros((MAIN_MAX, _bitmap_bytes(capacity)), dtype=np.uint8)
+        self._head = np.full(TOTAL_FIVES, -1, dtype=np.int32)
+        self._size = 0
+        self._unique_fives = 0
+        self._analytics: Optional[dict] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def rows(self) -> np.ndarray:
+        """Read-only view of the stored rows"""
+        view = self._rows[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def keys(self) -> np.ndarray:
+        """Read-only view of the packed keys"""
+        view = self._keys[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def nbytes(self) -> int:
+        return (self._rows.nbytes + self._keys.nbytes + self._next_row.nbytes
+                + self._bitmaps.nbytes + self._head.nbytes)
+
+    @property
+    def unique_fives(self) -> int:
+        """Number of distinct 5-number sets"""
+        return self._unique_fives
+
+    def clear(self):
+        self.__init__()
+
+    def save(self, directory: Path):
+        """Write trimmed arrays and metadata into `directory` (must not exist yet)"""
+        directory.mkdir(parents=True)
+        for attr, filename in SNAPSHOT_ARRAYS.items():
+            array = getattr(self, attr)
+            if attr in ("_rows", "_keys", "_next_row"):
+                array = array[:self._size]
+            elif attr == "_bitmaps":
+                array = array[:, :_bitmap_bytes(self._size)]
+            np.save(directory / filename, np.ascontiguousarray(array))
+
+    @classmethod
+    def load(cls, directory: Path, meta: dict, mmap: bool = True) -> "CombinationStore":
+        """Open a saved store; arrays are memory-mapped read-only by default"""
+        store = cls()
+        for attr, filename in SNAPSHOT_ARRAYS.items():
+            setattr(store, attr, np.load(directory / filename, mmap_mode="r" if mmap else None))
+        store._size = int(meta["count"])
+        store._unique_fives = int(meta["unique_fives"])
+        return store
+
+    def reserve(self, capacity: int):
+        """Grow the underlying buffers to hold at least `capacity` rows"""
+        if capacity <= self._rows.shape[0]:
+            return
+        rows = np.zeros((capacity, ROW_WIDTH), dtype=np.uint8)
+        keys = np.zeros(capacity, dtype=np.uint64)
+        next_row = np.full(capacity, -1, dtype=np.int32)
+        bitmaps = np.zeros((MAIN_MAX, _bitmap_bytes(capacity)), dtype=np.uint8)
+        rows[:self._size] = self._rows[:self._size]
+        keys[:self._size] = self._keys[:self._size]
+        next_row[:self._size] = self._next_row[:self._size]
+        bitmaps[:, :self._bitmaps.shape[1]] = self._bitmaps
+        self._rows = rows
+        self._keys = keys
+        self._next_row = next_row
+        self._bitmaps = bitmaps
+
+    def append(self, rows: np.ndarray) -> int:
+        """Append an (N, 6) block of rows; returns the first new 1-based index"""
+        rows = np.asarray(rows, dtype=np.uint8).reshape(-1, ROW_WIDTH)
+        start = self._size
+        end = start + rows.shape[0]
+        if end > self._rows.shape[0]:
+            self.reserve(max(end, self._rows.shape[0] * 2))
+        if not self._head.flags.writeable:
+            # Memory-mapped snapshot: copy on first write
+            self._head = self._head.copy()
+        self._rows[start:end] = rows
+        # Keys and ranks in slices: the (N, 5) int64 temporaries would dwarf the store
+        ranks = np.empty(rows.shape[0], dtype=np.int32)
+        for lo in range(0, rows.shape[0], GENERATE_CHUNK_SIZE):
+            block = rows[lo:lo + GENERATE_CHUNK_SIZE]
+            self._keys[start + lo:start + lo + block.shape[0]] = pack_rows(block)
+            ranks[lo:lo + block.shape[0]] = rank_fives(block[:, :MAIN_COUNT])
+        self._index_ranks(start, ranks)
+        self._size = end
+        self._index_bitmaps(start, end)
+        self._analytics = None
+        return start + 1
+
+    def _index_ranks(self, start: int, ranks: np.ndarray):
+        """Push rows start.. onto their rank chains (vectorized head insertion)"""
+        if not ranks.size:
+            return
+        order = np.argsort(ranks, kind="stable")
+        sorted_ranks = ranks[order]
+        sorted_rows = (order + start).astype(np.int32)
+
+        # Within a run of equal ranks, each row links to the one before it
+        same_as_prev = np.zeros(ranks.size, dtype=bool)
+        same_as_prev[1:] = sorted_ranks[1:] == sorted_ranks[:-1]
+        links = np.empty(ranks.size, dtype=np.int32)
+        links[1:] = sorted_rows[:-1]
+
+        # The first row of each run links to the previous chain head
+        run_starts = np.flatnonzero(~same_as_prev)
+        run_ends = np.append(run_starts[1:], ranks.size) - 1
+        run_ranks = sorted_ranks[run_starts]
+        links[run_starts] = self._head[run_ranks]
+
+        self._next_row[sorted_rows] = links
+        self._unique_fives += int(np.count_nonzero(self._head[run_ranks] < 0))
+        self._head[run_ranks] = sorted_rows[run_ends]
+
+    def _index_bitmaps(self, start: int, end: int):
+        """
+        Rebuild number bitmap bytes covering rows start..end, one
+        GENERATE_CHUNK_SIZE slice and one number at a time, so the
+        temporaries stay at a few slice-sized arrays
+        """
+        aligned = start - start % 8
+        for lo in range(aligned, end, GENERATE_CHUNK_SIZE):
+            keys = self._keys[lo:min(lo + GENERATE_CHUNK_SIZE, end)]
+            col = lo // 8
+            for n in range(MAIN_MAX):
+                packed = np.packbits(((keys >> np.uint64(n)) & np.uint64(1)).astype(bool))
+                self._bitmaps[n, col:col + packed.size] = packed
+
+    def has_index(self, index: int) -> bool:
+        return 1 <= index <= self._size
+
+    def get(self, index: int) -> List[int]:
+        """Return the combination at a 1-based index as a plain list"""
+        return self._rows[index - 1].tolist()
+
+    def take(self, indices: Sequence[int]) -> List[List[int]]:
+        """Return combinations for several 1-based indices"""
+        idx = np.asarray(indices, dtype=np.int64) - 1
+        return self._rows[idx].tolist()
+
+    def analytics(self) -> dict:
+        """
+        Frequency and distribution statistics, computed with vectorized
+        reductions and memoized until the store changes.
+        """
+        if self._analytics is None:
+            self._analytics = self._compute_analytics()
+        return self._analytics
+
+    def _compute_analytics(self) -> dict:
+        used = _bitmap_bytes(self._size)
+        bitmaps = self._bitmaps[:, :used]
+
+        # Pair co-occurrence = popcount(bitmap_i & bitmap_j); diagonal = frequency
+        pairs = np.zeros((MAIN_MAX, MAIN_MAX), dtype=np.int64)
+        for i in range(MAIN_MAX):
+            counts = np.bitwise_count(bitmaps[i:] & bitmaps[i]).sum(axis=1, dtype=np.int64)
+            pairs[i, i:] = counts
+            pairs[i:, i] = counts
+
+        bonus = np.zeros(BONUS_MAX + 1, dtype=np.int64)
+        sums = np.zeros(SUM_MAX + 1, dtype=np.int64)
+        odd = np.zeros(MAIN_COUNT + 1, dtype=np.int64)
+        high = np.zeros(MAIN_COUNT + 1, dtype=np.int64)
+        # Chunked so memory-mapped stores are read sequentially with flat memory
+        for start in range(0, self._size, GENERATE_CHUNK_SIZE):
+            rows = self._rows[start:start + GENERATE_CHUNK_SIZE]
+            keys = self._keys[start:start + GENERATE_CHUNK_SIZE]
+            bonus += np.bincount(rows[:, MAIN_COUNT], minlength=BONUS_MAX + 1)
+            sums += np.bincount(rows[:, :MAIN_COUNT].sum(axis=1, dtype=np.int64), minlength=SUM_MAX + 1)
+            odd += np.bincount(np.bitwise_count(keys & ODD_MASK), minlength=MAIN_COUNT + 1)
+            high += np.bincount(np.bitwise_count(keys & HIGH_MASK), minlength=MAIN_COUNT + 1)
+
+        return {
+            "total": self._size,
+            "number_frequency": np.diag(pairs).tolist(),
+            "bonus_distribution": bonus[1:].tolist(),
+            "pair_matrix": pairs.tolist(),
+            "sum_histogram": {"min": SUM_MIN, "counts": sums[SUM_MIN:].tolist()},
+            "odd_counts": odd.tolist(),
+            "high_counts": high.tolist(),
+        }
+
+    def find(self, main_numbers: Sequence[int], bonus_number: Optional[int] = None) -> np.ndarray:
+        """1-based indices of rows with exactly these five main numbers (O(1) via rank chain)"""
+        rank = int(rank_fives(sorted(main_numbers))[0])
+        found = []
+        row = int(self._head[rank])
+        while row >= 0:
+            if bonus_number is None or self._rows[row, MAIN_COUNT] == bonus_number:
+                found.append(row)
+            row = int(self._next_row[row])
+        return np.array(found[::-1], dtype=np.int64) + 1
+
+    def find_containing(self, numbers: Sequence[int], bonus_number: Optional[int] = None) -> np.ndarray:
+        """1-based indices of rows containing all of `numbers` (bitmap intersection)"""
+        used = _bitmap_bytes(self._size)
+        if numbers:
+            acc = self._bitmaps[numbers[0] - 1, :used].copy()
+            for num in numbers[1:]:
+                acc &= self._bitmaps[num - 1, :used]
+            found = np.flatnonzero(np.unpackbits(acc)[:self._size])
+        else:
+            found = np.arange(self._size)
+        if bonus_number is not None:
+            found = found[self._rows[found, MAIN_COUNT] == bonus_number]
+        return found + 1
+
+
+def _bitmap_bytes(rows: int) -> int:
+    return (rows + 7) // 8
+
+
+def _workspace_dir(workspace: str) -> Path:
+    if not SNAPSHOT_NAME_PATTERN.match(workspace):
+        raise ValueError("Geçersiz çalışma alanı")
+    return SNAPSHOT_DIR / workspace
+
+
+def _snapshot_path(workspace: str, name: str, version: int) -> Path:
+    return _workspace_dir(workspace) / name / f"v{version}"
+
+
+def _read_meta(directory: Path) -> Optional[dict]:
+    try:
+        with open(directory / "meta.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def list_snapshots(workspace: str, name: Optional[str] = None) -> List[dict]:
+    """Metadata of a workspace's saved snapshots, newest version first per name"""
+    root = _workspace_dir(workspace)
+    if not root.exists():
+        return []
+    names = [name] if name else sorted(p.name for p in root.iterdir() if p.is_dir())
+    snapshots = []
+    for snapshot_name in names:
+        base = root / snapshot_name
+        if not base.is_dir():
+            continue
+        versions = []
+        for path in base.iterdir():
+            meta = _read_meta(path) if path.name.startswith("v") else None
+            if meta:
+                versions.append(meta)
+        snapshots.extend(sorted(versions, key=lambda m: m["version"], reverse=True))
+    return snapshots
+
+
+def save_snapshot(store: CombinationStore, workspace: str, name: str,
+                  extra: Optional[dict] = None) -> dict:
+    """
+    Save the store as the next version of snapshot `name` and return its metadata.
+    Arrays are written to a temp dir first and renamed into place, so readers
+    never see a partial snapshot and concurrent writers get distinct versions.
+    """
+    if not SNAPSHOT_NAME_PATTERN.match(name):
+        raise ValueError("Geçersiz snapshot adı (harf, rakam, _ ve - kullanılabilir)")
+
+    base = _workspace_dir(workspace) / name
+    base.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".staging_", dir=base))
+    try:
+        store.save(staging / "data")
+        while True:
+            versions = [m["version"] for m in list_snapshots(workspace, name)]
+            version = max(versions, default=0) + 1
+            meta = {
+                "name": name,
+                "version": version,
+                "count": len(store),
+                "unique_fives": store.unique_fives,
+                "nbytes": store.nbytes,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                **(extra or {})
+            }
+            with open(staging / "data" / "meta.json", "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            try:
+                os.rename(staging / "data", _snapshot_path(workspace, name, version))
+                return meta
+            except OSError:
+                # Another worker took this version number, try the next one
+                continue
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+class SnapshotCache:
+    """
+    Per-process LRU of opened (memory-mapped) snapshots with a byte budget.
+    Evicted sets stay on disk and are re-mapped on the next access, which
+    only costs opening a few files.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._stores: "OrderedDict[Tuple[str, str, int], CombinationStore]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(store.nbytes for store in self._stores.values())
+
+    def __len__(self) -> int:
+        return len(self._stores)
+
+    def get(self, key: Tuple[str, str, int]) -> Optional[CombinationStore]:
+        with self._lock:
+            store = self._stores.get(key)
+            if store is not None:
+                self._stores.move_to_end(key)
+            return store
+
+    def put(self, key: Tuple[str, str, int], store: CombinationStore):
+        with self._lock:
+            self._stores[key] = store
+            self._stores.move_to_end(key)
+            # Always keep the entry just added, even if it alone exceeds the budget
+            while len(self._stores) > 1 and self.nbytes > self.budget_bytes:
+                self._stores.popitem(last=False)
+
+    def discard(self, key: Tuple[str, str, int]):
+        with self._lock:
+            self._stores.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._stores.clear()
+
+
+SNAPSHOT_CACHE = SnapshotCache(int(os.environ.get("KOMBINASYON_MEMORY_BUDGET_MB", "512")) * 1024 * 1024)
+
+
+def load_snapshot(workspace: str, name: str, version: Optional[int] = None) -> Tuple[CombinationStore, dict]:
+    """Memory-map a snapshot (latest version if none given)"""
+    if not SNAPSHOT_NAME_PATTERN.match(name):
+        raise FileNotFoundError(name)
+    if version is None:
+        versions = list_snapshots(workspace, name)
+        if not versions:
+            raise FileNotFoundError(name)
+        version = versions[0]["version"]
+
+    directory = _snapshot_path(workspace, name, version)
+    key = (workspace, name, version)
+    meta = _read_meta(directory)
+    if meta is None:
+        # Deleted (possibly by another worker): drop any mapping still cached here
+        SNAPSHOT_CACHE.discard(key)
+        raise FileNotFoundError(f"{name} v{version}")
+
+    store = SNAPSHOT_CACHE.get(key)
+    if store is None:
+        store = CombinationStore.load(directory, meta)
+        SNAPSHOT_CACHE.put(key, store)
+    return store, meta
+
+
+def delete_snapshot(workspace: str, name: str, version: int) -> bool:
+    if not SNAPSHOT_NAME_PATTERN.match(name):
+        return False
+    directory = _snapshot_path(workspace, name, version)
+    if _read_meta(directory) is None:
+        return False
+    SNAPSHOT_CACHE.discard((workspace, name, version))
+    # meta.json goes first so that no reader opens a half-deleted version
+    (directory / "meta.json").unlink(missing_ok=True)
+    shutil.rmtree(directory, ignore_errors=True)
+    return True
+
+
+def prune_snapshots(workspace: str, name: str, keep: int = SNAPSHOT_KEEP_VERSIONS,
+                    protect: Optional[dict] = None) -> List[int]:
+    """
+    Delete all but the newest `keep` versions of snapshot `name`, never the
+    `protect` ref (the active set). Open memory maps stay valid until closed;
+    load_snapshot stops handing out a deleted version in every worker.
+    """
+    removed = []
+    for meta in list_snapshots(workspace, name)[keep:]:
+        if protect and protect.get("name") == name and protect.get("version") == meta["version"]:
+            continue
+        if delete_snapshot(workspace, name, meta["version"]):
+            removed.append(meta["version"])
+    return removed
+
+
+def _active_path(workspace: str) -> Path:
+    return _workspace_dir(workspace) / "active.json"
+
+
+def set_active_snapshot(workspace: str, ref: Optional[dict]):
+    """Point a workspace at a snapshot ({"name", "version"}) or at nothing (None)"""
+    root = _workspace_dir(workspace)
+    root.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=root, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"name": ref["name"], "version": ref["version"]} if ref else {}, f)
+    os.replace(tmp, _active_path(workspace))
+
+
+def active_snapshot_stamp(workspace: str) -> Optional[Tuple[int, int]]:
+    """Cheap change marker for the workspace pointer (inode, mtime in ns)"""
+    try:
+        stat = os.stat(_active_path(workspace))
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def get_active_snapshot(workspace: str) -> Optional[dict]:
+    try:
+        with open(_active_path(workspace), encoding="utf-8") as f:
+            ref = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return ref or None
@@ -0,0 +1,49 @@
+"""
+Media lookup
+Resolves the media files (medya_dosyalari) of many reports at once: one
+$in query on the indexed rapor_id per MEDYA_LOOKUP_CHUNK reports, grouped
+in memory. Used by the ZIP exports, report deletion and the public view.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from database import db
+from indexes import register_index
+
+register_index("medya_dosyalari", "id", unique=True)
+register_index("medya_dosyalari", "rapor_id")
+
+MEDYA_LOOKUP_CHUNK = 1000
+
+
+async def medya_by_rapor(rapor_ids: Iterable[str], projection: Optional[dict] = None) -> Dict[str, List[dict]]:
+    """rapor_id -> its media documents (reports without media map to [])"""
+    rapor_ids = list(dict.fromkeys(rapor_ids))
+    grouped = {rapor_id: [] for rapor_id in rapor_ids}
+    projection = projection or {"_id": 0}
+    for i in range(0, len(rapor_ids), MEDYA_LOOKUP_CHUNK):
+        chunk = rapor_ids[i:i + MEDYA_LOOKUP_CHUNK]
+        async for dosya in db.medya_dosyalari.find({"rapor_id": {"$in": chunk}}, projection):
+            grouped[dosya["rapor_id"]].append(dosya)
+    return grouped
+
+
+def _unlink_files(paths: List[str]):
+    for path in paths:
+        Path(path).unlink(missing_ok=True)
+
+
+async def delete_medya(rapor_ids: Iterable[str]) -> int:
+    """Delete the media files (disk and database) of the given reports"""
+    rapor_ids = list(dict.fromkeys(rapor_ids))
+    grouped = await medya_by_rapor(rapor_ids, {"_id": 0, "rapor_id": 1, "dosya_yolu": 1})
+    paths = [dosya["dosya_yolu"] for dosyalar in grouped.values() for dosya in dosyalar if dosya.get("dosya_yolu")]
+    await asyncio.to_thread(_unlink_files, paths)
+
+    deleted = 0
+    for i in range(0, len(rapor_ids), MEDYA_LOOKUP_CHUNK):
+        result = await db.medya_dosyalari.delete_many({"rapor_id": {"$in": rapor_ids[i:i + MEDYA_LOOKUP_CHUNK]}})
+        deleted += result.deleted_count
+    return deleted
@@ -0,0 +1,110 @@
+"""
+Report search
+Every report stores `arama_tokens`: the Turkish-folded (ı/İ→i, ş→s, ğ→g, ü→u,
+ö→o, ç→c) word prefixes of its rapor_no, ekipman_adi and firma. A multikey
+index on that field serves prefix search for every keystroke; the candidates
+are ranked in Python (rapor_no before ekipman_adi before firma, whole words
+before prefixes, newest first on ties).
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELD = "arama_tokens"
+# field -> ranking weight
+SEARCH_SOURCE_FIELDS = {"rapor_no": 3, "ekipman_adi": 2, "firma": 1}
+MAX_PREFIX_LENGTH = 20
+BACKFILL_BATCH_SIZE = 1000
+
+_FOLD_TABLE = str.maketrans({
+    "ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c",
+    "â": "a", "î": "i", "û": "u", "\u0307": None
+})
+_WORD = re.compile(r"[0-9a-z]+")
+# PK2025-ANK025 is also searchable by its parts: pk, 2025, ank, 025
+_WORD_PART = re.compile(r"[0-9]+|[a-z]+")
+
+
+def fold(text: Optional[str]) -> str:
+    """Lowercase and strip Turkish diacritics so that 'İSKELE' == 'iskele' == 'ıskele'"""
+    if not text:
+        return ""
+    return str(text).replace("İ", "i").replace("I", "i").lower().translate(_FOLD_TABLE)
+
+
+def _words(text: Optional[str]) -> List[str]:
+    words = []
+    for word in _WORD.findall(fold(text)):
+        words.append(word)
+        parts = _WORD_PART.findall(word)
+        if len(parts) > 1:
+            words.extend(parts)
+    return words
+
+
+def search_tokens(rapor: dict) -> List[str]:
+    """All word prefixes (up to MAX_PREFIX_LENGTH chars) of the searchable fields"""
+    tokens = set()
+    for field in SEARCH_SOURCE_FIELDS:
+        for word in _words(rapor.get(field)):
+            word = word[:MAX_PREFIX_LENGTH]
+            tokens.update(word[:end] for end in range(1, len(word) + 1))
+    return sorted(tokens)
+
+
+def search_fields(rapor: dict) -> Dict[str, List[str]]:
+    """Shadow field to store alongside a report on insert/update"""
+    return {SEARCH_FIELD: search_tokens(rapor)}
+
+
+def query_tokens(arama: Optional[str]) -> List[str]:
+    """Folded words of a search string (each must prefix some word of the report)"""
+    return list(dict.fromkeys(word[:MAX_PREFIX_LENGTH] for word in _WORD.findall(fold(arama))))
+
+
+def search_filter(arama: Optional[str]) -> dict:
+    """Mongo filter for a search string ({} when it holds no searchable word)"""
+    tokens = query_tokens(arama)
+    if not tokens:
+        return {}
+    return {SEARCH_FIELD: {"$all": tokens}}
+
+
+def rank(rapor: dict, arama: str) -> float:
+    """Relevance of a matched report for a search string"""
+    tokens = query_tokens(arama)
+    score = 0.0
+    if fold(rapor.get("rapor_no")).replace(" ", "") == fold(arama).replace(" ", ""):
+        score += 100
+    for field, weight in SEARCH_SOURCE_FIELDS.items():
+        words = _words(rapor.get(field))
+        for token in tokens:
+            if token in words:
+                score += weight * 2
+            elif any(word.startswith(token) for word in words):
+                score += weight
+    return score
+
+
+async def backfill_search_tokens(db) -> int:
+    """Compute arama_tokens for reports stored before search existed (batched)"""
+    projection = {"_id": 1, **{field: 1 for field in SEARCH_SOURCE_FIELDS}}
+    updated = 0
+    batch = []
+    async for rapor in db.raporlar.find({SEARCH_FIELD: {"$exists": False}}, projection):
+        batch.append(UpdateOne({"_id": rapor["_id"]}, {"$set": search_fields(rapor)}))
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            await db.raporlar.bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+    if batch:
+        await db.raporlar.bulk_write(batch, ordered=False)
+        updated += len(batch)
+    if updated:
+        logger.info(f"Search tokens computed for {updated} reports")
+    return updated
@@ -11,8 +11,13 @@ import uuid
 
 from models import User, UserCreate, UserLogin, UserResponse, VerifyEmail, Token
 from database import db
+from indexes import register_index
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
+
+register_index("users", "id", unique=True)
+register_index("users", "email", unique=True)
+register_index("users", "username")
 logger = logging.getLogger(__name__)
 
 # JWT & Password Config
@@ -3,6 +3,7 @@ from datetime import datetime, timezone, timedelta
 
 from routers.auth import get_current_user
 from database import db
+from indexes import index_report
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -137,3 +138,12 @@ async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
             "bilesen_dagilim": bilesen_dagilim
         }
     }
+
+
+@router.get("/indexes")
+async def get_index_report(current_user: dict = Depends(get_current_user)):
+    """Registered indexes missing from the database, unregistered and unused ones"""
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Bu işlem için admin yetkisi gerekli")
+    
+    return {"collections": await index_report(db)}
@@ -3,20 +3,85 @@
 Çekiliş havuzu yönetimi için API endpoint'leri
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response, BackgroundTasks
 from fastapi.responses import StreamingResponse
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from pydantic import BaseModel, Field
 import pandas as pd
-import io
-import random
+import os
+import re
+import hmac
+import hashlib
+import secrets
+import asyncio
+import logging
+import tempfile
+import time
 from datetime import datetime, timezone
 import uuid
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from database import db
+from indexes import register_index, index_name
+from rapor_search import fold
+from zip_stream import iter_file_and_remove
 from routers.auth import get_current_user
 
 router = APIRouter(prefix="/draws", tags=["draws"])
+logger = logging.getLogger(__name__)
+
+register_index("draws", "id", unique=True)
+register_index("draws", [("user_id", 1), ("created_at", -1)])
+# Duplicate check, keyset listing and ordinal sampling all walk this index
+register_index("participants", [("draw_id", 1), ("id_no", 1)], unique=True)
+register_index("participants", "id")
+# Name search: anchored prefix match on the folded copies of the names
+register_index("participants", [("draw_id", 1), ("first_name_search", 1)])
+register_index("participants", [("draw_id", 1), ("last_name_search", 1)])
+register_index("draw_results", "draw_id")
+
+# Participant upload progress per draw (polled while the upload request runs);
+# finished entries are dropped UPLOAD_PROGRESS_TTL_SECONDS after they end
+upload_progress = {}
+UPLOAD_PROGRESS_TTL_SECONDS = 10 * 60
+
+# Background reclamation of deleted draws (same polling pattern as upload_progress)
+delete_jobs = {}
+reclaiming_draws = set()
+RECLAIM_BATCH_SIZE = 10000
+MAX_FINISHED_DELETE_JOBS = 20
+
+# Rows read, deduplicated and written per block during participant upload
+PARTICIPANT_CHUNK_SIZE = 5000
+_participant_index_ready = False
+# (time, error) of the last failed unique index build; retried after PARTICIPANT_INDEX_RETRY_SECONDS
+_participant_index_error: Optional[Tuple[float, str]] = None
+PARTICIPANT_INDEX_RETRY_SECONDS = 10 * 60
+
+# Participant listing page sizes and the columns the UI shows
+PARTICIPANT_PAGE_SIZE = 100
+PARTICIPANT_MAX_PAGE_SIZE = 1000
+PARTICIPANT_LIST_PROJECTION = {"_id": 0, "id": 1, "id_no": 1, "first_name": 1, "last_name": 1, "contact": 1}
+# Full participant documents without the search shadow fields
+PARTICIPANT_PROJECTION = {"_id": 0, "first_name_search": 0, "last_name_search": 0}
+PARTICIPANT_BACKFILL_BATCH_SIZE = 1000
+
+# Result export (write-only workbook)
+EXPORT_PERSON_HEADERS = ['Sıra', 'ID No', 'Ad', 'Soyad', 'İletişim']
+EXPORT_PERSON_WIDTHS = [8, 20, 20, 20, 30]
+EXPORT_BATCH_SIZE = 5000
+EXCEL_MAX_ROWS = 1048576  # Excel sheet row limit (header included)
+
+# Winner selection: seeded HMAC-SHA256 sampler over the participants' id_no order
+DRAW_ALGORITHM = "hmac-sha256-fisher-yates-v1"
+
+# Draws executed at the same time by /execute-batch
+BATCH_EXECUTE_CONCURRENCY = 8
 
 
 # Models
@@ -26,6 +91,10 @@ class DrawCreate(BaseModel):
     backup_count: int = Field(ge=0, le=1000)
 
 
+class DrawBatchExecute(BaseModel):
+    draw_ids: List[str] = Field(min_length=1, max_length=100)
+
+
 class ParticipantCreate(BaseModel):
     id_no: str = Field(min_length=1)
     first_name: str = Field(min_length=1)
@@ -64,7 +133,7 @@ async def list_draws(current_user=Depends(get_current_user)):
     """Kullanıcının tüm çekilişlerini listele"""
     user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
     draws = await db.draws.find(
-        {"user_id": user_id},
+        {"user_id": user_id, "deleted": {"$ne": True}},
         {"_id": 0}
     ).sort("created_at", -1).to_list(length=None)
     
@@ -82,7 +151,7 @@ async def get_draw(draw_id: str, current_user=Depends(get_current_user)):
     """Çekiliş detayını getir"""
     user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
     draw = await db.draws.find_one(
-        {"id": draw_id, "user_id": user_id},
+        {"id": draw_id, "user_id": user_id, "deleted": {"$ne": True}},
         {"_id": 0}
     )
     
@@ -101,7 +170,7 @@ async def get_draw(draw_id: str, current_user=Depends(get_current_user)):
 async def add_participant(draw_id: str, participant_data: ParticipantCreate, current_user=Depends(get_current_user)):
     """Çekilişe manuel katılımcı ekle"""
     user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
-    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id})
+    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id, "deleted": {"$ne": True}})
     if not draw:
         raise HTTPException(status_code=404, detail="Çekiliş bulunamadı")
     
@@ -127,129 +196,381 @@ async def add_participant(draw_id: str, participant_data: ParticipantCreate, cur
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     
-    await db.participants.insert_one(participant_dict)
+    await db.participants.insert_one({**participant_dict, **participant_search_fields(participant_dict)})
     await db.draws.update_one({"id": draw_id}, {"$inc": {"participant_count": 1}})
     
-    participant_dict.pop('_id', None)
     participant_dict['created_at'] = datetime.fromisoformat(participant_dict['created_at'])
     return participant_dict
 
 
+def participant_search_fields(participant: dict) -> dict:
+    """Folded (lowercase, Turkish diacritics stripped) names stored for indexed prefix search"""
+    return {
+        "first_name_search": fold(participant.get("first_name")),
+        "last_name_search": fold(participant.get("last_name"))
+    }
+
+
+async def backfill_participant_search() -> int:
+    """Store the search fields on participants uploaded before name search was indexed (batched)"""
+    updated = 0
+    batch = []
+    async for participant in db.participants.find(
+        {"first_name_search": {"$exists": False}}, {"_id": 1, "first_name": 1, "last_name": 1}
+    ):
+        batch.append(UpdateOne({"_id": participant["_id"]}, {"$set": participant_search_fields(participant)}))
+        if len(batch) >= PARTICIPANT_BACKFILL_BATCH_SIZE:
+            await db.participants.bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+    if batch:
+        await db.participants.bulk_write(batch, ordered=False)
+        updated += len(batch)
+    if updated:
+        logger.info(f"Search fields computed for {updated} participants")
+    return updated
+
+
+def _map_participant_columns(columns) -> dict:
+    """Match upload headers to participant fields (first match wins)"""
+    column_mapping = {}
+    for col in columns:
+        col_lower = str(col).replace('İ', 'i').lower().strip()
+        # 'soyad' must be checked before 'ad', it contains it
+        if 'soyad' in col_lower or 'last' in col_lower:
+            field = 'last_name'
+        elif 'iletişim' in col_lower or 'contact' in col_lower or 'email' in col_lower or 'telefon' in col_lower:
+            field = 'contact'
+        elif 'id' in col_lower or 'no' in col_lower:
+            field = 'id_no'
+        elif 'ad' in col_lower or 'first' in col_lower:
+            field = 'first_name'
+        else:
+            continue
+        column_mapping.setdefault(field, col)
+    return column_mapping
+
+
+def _iter_csv_chunks(path: str):
+    """Read a CSV upload as string DataFrames of PARTICIPANT_CHUNK_SIZE rows"""
+    with pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=PARTICIPANT_CHUNK_SIZE) as reader:
+        yield from reader
+
+
+def _excel_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _iter_xlsx_chunks(path: str):
+    """Read the first sheet of an XLSX upload in read-only mode as string DataFrames"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [_excel_cell(h) for h in header]
+        width = len(header)
+        block = []
+        for row in rows:
+            block.append([_excel_cell(v) for v in row[:width]] + [""] * (width - len(row)))
+            if len(block) == PARTICIPANT_CHUNK_SIZE:
+                yield pd.DataFrame(block, columns=header)
+                block = []
+        if block:
+            yield pd.DataFrame(block, columns=header)
+    finally:
+        wb.close()
+
+
+def _xlsx_row_count(path: str) -> int:
+    wb = load_workbook(path, read_only=True)
+    try:
+        return max((wb.active.max_row or 1) - 1, 0)
+    finally:
+        wb.close()
+
+
+def _normalize_participants(chunk: pd.DataFrame, column_mapping: dict) -> pd.DataFrame:
+    """Select and strip the participant columns and drop rows without an ID No (repeats are handled by the caller)"""
+    frame = pd.DataFrame({
+        field: chunk[col].astype(str).str.strip()
+        for field, col in column_mapping.items()
+    })
+    frame = frame[(frame['id_no'] != '') & (frame['id_no'].str.lower() != 'nan')]
+    return frame
+
+
+async def _ensure_participant_index():
+    """
+    Upload deduplication relies on the unique (draw_id, id_no) index to reject
+    rows that a concurrent or repeated upload inserted after the $in check;
+    build it here too in case startup could not (create_index is idempotent).
+    A failed build (e.g. duplicates already stored) is remembered and
+    reported without rebuilding until PARTICIPANT_INDEX_RETRY_SECONDS pass.
+    """
+    global _participant_index_ready, _participant_index_error
+    if _participant_index_ready:
+        return
+    if _participant_index_error and time.monotonic() - _participant_index_error[0] < PARTICIPANT_INDEX_RETRY_SECONDS:
+        raise HTTPException(status_code=503, detail=f"Katılımcı indeksi oluşturulamadı: {_participant_index_error[1]}")
+    keys = [("draw_id", 1), ("id_no", 1)]
+    try:
+        await db.participants.create_index(keys, unique=True, name=index_name(keys))
+    except Exception as e:
+        _participant_index_error = (time.monotonic(), str(e))
+        logger.warning(f"Participant index could not be created: {e}")
+        raise HTTPException(status_code=503, detail=f"Katılımcı indeksi oluşturulamadı: {e}")
+    _participant_index_ready = True
+    _participant_index_error = None
+
+
+def _prune_upload_progress():
+    """Drop finished upload progress entries older than UPLOAD_PROGRESS_TTL_SECONDS"""
+    now = time.time()
+    expired = [
+        draw_id for draw_id, progress in upload_progress.items()
+        if progress.get("finished_at") is not None and now - progress["finished_at"] > UPLOAD_PROGRESS_TTL_SECONDS
+    ]
+    for draw_id in expired:
+        upload_progress.pop(draw_id, None)
+
+
+async def _insert_participants(docs: List[dict]) -> Tuple[int, int]:
+    """Unordered bulk insert; returns (inserted, duplicate-key rejects)"""
+    try:
+        result = await db.participants.insert_many(docs, ordered=False)
+        return len(result.inserted_ids), 0
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(err.get("code") != 11000 for err in errors):
+            raise
+        return e.details.get("nInserted", 0), len(errors)
+
+
+@router.get("/{draw_id}/participants/upload/progress")
+async def get_upload_progress(draw_id: str, current_user=Depends(get_current_user)):
+    """Katılımcı yükleme ilerlemesi"""
+    user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
+    _prune_upload_progress()
+    progress = upload_progress.get(draw_id)
+    if not progress or progress["user_id"] != user_id:
+        return {"status": "not_found", "progress": 0, "message": "Yükleme bulunamadı"}
+    return progress
+
+
 @router.post("/{draw_id}/participants/upload")
 async def upload_participants(draw_id: str, file: UploadFile = File(...), current_user=Depends(get_current_user)):
-    """Excel dosyasından toplu katılımcı yükle"""
+    """
+    Excel/CSV dosyasından toplu katılımcı yükle.
+    The file is spooled to disk and processed in blocks of PARTICIPANT_CHUNK_SIZE
+    rows: columns are mapped once, each block is deduplicated with vectorized
+    pandas operations against the draw's existing ID Nos (one indexed $in query
+    per block) and written with an unordered insert_many. Progress can be polled
+    at /{draw_id}/participants/upload/progress while the request runs.
+    """
     user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
-    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id})
+    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id, "deleted": {"$ne": True}})
     if not draw:
         raise HTTPException(status_code=404, detail="Çekiliş bulunamadı")
     
     if draw["status"] == "completed":
         raise HTTPException(status_code=400, detail="Tamamlanmış çekilişe katılımcı eklenemez")
     
+    _prune_upload_progress()
+    if upload_progress.get(draw_id, {}).get("status") == "processing":
+        raise HTTPException(status_code=409, detail="Bu çekiliş için devam eden bir yükleme var")
+    
+    await _ensure_participant_index()
+    
+    is_csv = file.filename.lower().endswith('.csv')
+    progress = upload_progress[draw_id] = {
+        "user_id": user_id,
+        "status": "processing",
+        "progress": 0,
+        "message": "Dosya alınıyor...",
+        "processed": 0,
+        "total_rows": None,
+        "added": 0,
+        "duplicates": 0,
+        "skipped": 0,
+        "finished_at": None
+    }
+    
+    fd, path = tempfile.mkstemp(suffix='.csv' if is_csv else '.xlsx')
+    chunks = None
     try:
-        contents = await file.read()
+        line_count = 0
+        with os.fdopen(fd, 'wb') as f:
+            while chunk := await file.read(1024 * 1024):
+                f.write(chunk)
+                line_count += chunk.count(b"\n")
         
-        if file.filename.endswith('.csv'):
-            df = pd.read_csv(io.BytesIO(contents))
+        if is_csv:
+            progress["total_rows"] = max(line_count - 1, 0)
+            chunks = _iter_csv_chunks(path)
         else:
-            df = pd.read_excel(io.BytesIO(contents))
-        
-        column_mapping = {}
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'id' in col_lower or 'no' in col_lower:
-                column_mapping['id_no'] = col
-            elif 'ad' in col_lower or 'first' in col_lower:
-                column_mapping['first_name'] = col
-            elif 'soyad' in col_lower or 'last' in col_lower:
-                column_mapping['last_name'] = col
-            elif 'iletişim' in col_lower or 'contact' in col_lower or 'email' in col_lower or 'telefon' in col_lower:
-                column_mapping['contact'] = col
+            progress["total_rows"] = await asyncio.to_thread(_xlsx_row_count, path)
+            chunks = _iter_xlsx_chunks(path)
+        progress["message"] = "Katılımcılar işleniyor..."
         
-        required = ['id_no', 'first_name', 'last_name', 'contact']
-        missing = [r for r in required if r not in column_mapping]
-        if missing:
-            raise HTTPException(status_code=400, detail=f"Excel'de gerekli sütunlar bulunamadı: {missing}")
+        column_mapping = None
+        created_at = datetime.now(timezone.utc).isoformat()
         
-        existing_ids = set()
-        existing_participants = await db.participants.find({"draw_id": draw_id}, {"id_no": 1}).to_list(length=None)
-        existing_ids = {p["id_no"] for p in existing_participants}
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            if column_mapping is None:
+                column_mapping = _map_participant_columns(chunk.columns)
+                required = ['id_no', 'first_name', 'last_name', 'contact']
+                missing = [r for r in required if r not in column_mapping]
+                if missing:
+                    raise HTTPException(status_code=400, detail=f"Excel'de gerekli sütunlar bulunamadı: {missing}")
+            
+            frame = _normalize_participants(chunk, column_mapping)
+            progress["skipped"] += len(chunk) - len(frame)
+            
+            unique = frame.drop_duplicates('id_no')
+            existing = await db.participants.find(
+                {"draw_id": draw_id, "id_no": {"$in": unique['id_no'].tolist()}},
+                {"_id": 0, "id_no": 1}
+            ).to_list(length=None)
+            if existing:
+                unique = unique[~unique['id_no'].isin([p["id_no"] for p in existing])]
+            
+            duplicates = len(frame) - len(unique)
+            added = 0
+            if len(unique):
+                docs = unique.assign(
+                    id=[str(uuid.uuid4()) for _ in range(len(unique))],
+                    draw_id=draw_id,
+                    user_id=user_id,
+                    created_at=created_at,
+                    first_name_search=unique['first_name'].map(fold),
+                    last_name_search=unique['last_name'].map(fold)
+                ).to_dict("records")
+                added, rejected = await _insert_participants(docs)
+                duplicates += rejected
+                if added:
+                    await db.draws.update_one({"id": draw_id}, {"$inc": {"participant_count": added}})
+            
+            progress["processed"] += len(chunk)
+            progress["added"] += added
+            progress["duplicates"] += duplicates
+            if progress["total_rows"]:
+                progress["progress"] = min(99, progress["processed"] * 100 // progress["total_rows"])
         
-        added_count = 0
-        duplicate_count = 0
-        participants = []
+        if column_mapping is None:
+            raise HTTPException(status_code=400, detail="Dosyada katılımcı bulunamadı")
         
-        for _, row in df.iterrows():
-            try:
-                id_no = str(row[column_mapping['id_no']]).strip()
-                first_name = str(row[column_mapping['first_name']]).strip()
-                last_name = str(row[column_mapping['last_name']]).strip()
-                contact = str(row[column_mapping['contact']]).strip()
-                
-                if not id_no or id_no == 'nan':
-                    continue
-                
-                if id_no in existing_ids:
-                    duplicate_count += 1
-                    continue
-                
-                participant_dict = {
-                    "id": str(uuid.uuid4()),
-                    "draw_id": draw_id,
-                    "user_id": user_id,
-                    "id_no": id_no,
-                    "first_name": first_name,
-                    "last_name": last_name,
-                    "contact": contact,
-                    "created_at": datetime.now(timezone.utc).isoformat()
-                }
-                
-                participants.append(participant_dict)
-                existing_ids.add(id_no)
-                added_count += 1
-                
-            except Exception:
-                continue
-        
-        if participants:
-            await db.participants.insert_many(participants)
-            await db.draws.update_one({"id": draw_id}, {"$inc": {"participant_count": added_count}})
+        draw = await db.draws.find_one({"id": draw_id}, {"_id": 0, "participant_count": 1})
+        progress.update({
+            "status": "completed",
+            "progress": 100,
+            "message": f"{progress['added']} katılımcı eklendi",
+            "finished_at": time.time()
+        })
         
         return {
             "success": True,
-            "added": added_count,
-            "duplicates": duplicate_count,
-            "total_participants": added_count + len(existing_participants)
+            "added": progress["added"],
+            "duplicates": progress["duplicates"],
+            "skipped": progress["skipped"],
+            "total_participants": draw.get("participant_count", 0)
         }
         
-    except HTTPException:
+    except HTTPException as e:
+        progress.update({"status": "failed", "message": e.detail, "finished_at": time.time()})
         raise
     except Exception as e:
+        progress.update({"status": "failed", "message": str(e), "finished_at": time.time()})
         raise HTTPException(status_code=400, detail=f"Dosya işlenirken hata: {str(e)}")
+    finally:
+        if chunks is not None:
+            chunks.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _participant_query(draw_id: str, q: Optional[str]) -> dict:
+    """
+    Participants of a draw, optionally narrowed by an ID No / name prefix.
+    Names are matched case- and diacritic-insensitively through their folded
+    copies; every $or branch is an anchored, case-sensitive prefix on a
+    (draw_id, field) index, so it is served by an index range scan.
+    """
+    query = {"draw_id": draw_id}
+    q = (q or "").strip()
+    if q:
+        prefix = "^" + re.escape(q)
+        name_prefix = "^" + re.escape(fold(q))
+        query["$or"] = [
+            {"draw_id": draw_id, "id_no": {"$regex": prefix}},
+            {"draw_id": draw_id, "first_name_search": {"$regex": name_prefix}},
+            {"draw_id": draw_id, "last_name_search": {"$regex": name_prefix}}
+        ]
+    return query
 
 
 @router.get("/{draw_id}/participants")
-async def list_participants(draw_id: str, current_user=Depends(get_current_user)):
-    """Çekiliş katılımcılarını listele"""
+async def list_participants(
+    draw_id: str,
+    response: Response,
+    limit: int = Query(PARTICIPANT_PAGE_SIZE, ge=1, le=PARTICIPANT_MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    q: Optional[str] = None,
+    current_user=Depends(get_current_user)
+):
+    """
+    Çekiliş katılımcılarını listele (sayfalı).
+    Keyset pagination on the (draw_id, id_no) index: pass the X-Next-Cursor
+    header of a page as `after` to get the next one. `q` filters by ID No /
+    first name / last name prefix. Only the columns shown in the UI are returned.
+    """
     user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
-    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id})
+    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id, "deleted": {"$ne": True}}, {"_id": 1})
     if not draw:
         raise HTTPException(status_code=404, detail="Çekiliş bulunamadı")
     
-    participants = await db.participants.find({"draw_id": draw_id}, {"_id": 0}).to_list(length=None)
+    query = _participant_query(draw_id, q)
+    if after is not None:
+        query["id_no"] = {"$gt": after}
     
-    for p in participants:
-        if isinstance(p.get('created_at'), str):
-            p['created_at'] = datetime.fromisoformat(p['created_at'])
+    participants = await db.participants.find(query, PARTICIPANT_LIST_PROJECTION).sort(
+        "id_no", 1
+    ).limit(limit).to_list(length=limit)
+    
+    if len(participants) == limit:
+        response.headers["X-Next-Cursor"] = participants[-1]["id_no"]
     
     return participants
 
 
+@router.get("/{draw_id}/participants/count")
+async def count_participants(draw_id: str, q: Optional[str] = None, current_user=Depends(get_current_user)):
+    """Katılımcı sayısı (aramasız istekte çekilişin participant_count sayacı kullanılır)"""
+    user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
+    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id, "deleted": {"$ne": True}}, {"_id": 0, "participant_count": 1})
+    if not draw:
+        raise HTTPException(status_code=404, detail="Çekiliş bulunamadı")
+    
+    if q and q.strip():
+        count = await db.participants.count_documents(_participant_query(draw_id, q))
+    else:
+        count = draw.get("participant_count", 0)
+    
+    return {"count": count}
+
+
 @router.delete("/{draw_id}/participants/{participant_id}")
 async def delete_participant(draw_id: str, participant_id: str, current_user=Depends(get_current_user)):
     """Katılımcıyı sil"""
     user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
-    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id})
+    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id, "deleted": {"$ne": True}})
     if not draw:
         raise HTTPException(status_code=404, detail="Çekiliş bulunamadı")
     
@@ -266,47 +587,264 @@ async def delete_participant(draw_id: str, participant_id: str, current_user=Dep
     return {"success": True, "deleted": result.deleted_count}
 
 
-@router.post("/{draw_id}/execute")
-async def execute_draw(draw_id: str, current_user=Depends(get_current_user)):
-    """Çekilişi gerçekleştir"""
-    user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
-    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id})
-    if not draw:
-        raise HTTPException(status_code=404, detail="Çekiliş bulunamadı")
-    
+def _uniform_below(seed: str, counter: int, n: int) -> int:
+    """Uniform integer in [0, n) from HMAC-SHA256(seed, counter), by rejection sampling"""
+    limit = (1 << 256) - (1 << 256) % n
+    attempt = 0
+    while True:
+        digest = hmac.new(bytes.fromhex(seed), f"{counter}:{attempt}".encode(), hashlib.sha256).digest()
+        value = int.from_bytes(digest, "big")
+        if value < limit:
+            return value % n
+        attempt += 1
+
+
+def _sample_positions(seed: str, total: int, k: int) -> List[int]:
+    """
+    k distinct positions out of range(total): the first k steps of a
+    Fisher-Yates shuffle driven by the seed, tracking only swapped slots
+    so time and memory are O(k).
+    """
+    swapped = {}
+    positions = []
+    for i in range(k):
+        j = i + _uniform_below(seed, i, total - i)
+        positions.append(swapped.get(j, j))
+        swapped[j] = swapped.get(i, i)
+    return positions
+
+
+async def _participants_at(draw_id: str, positions: List[int]) -> List[dict]:
+    """
+    Fetch the participants at the given positions of the draw's id_no order
+    (None for a position past the end), in the order of `positions`.
+    Each position is one find().sort(id_no).skip().limit(1) on the
+    (draw_id, id_no) index, so only the k picked documents cross the network.
+    The positions are visited in ascending order and every query starts after
+    the previous hit's id_no, skipping only the gap between the two: the
+    server walks at most max(positions) index keys for the whole draw (no
+    documents are loaded for skipped keys) at the cost of k sequential round
+    trips. A stored ordinal field would make each fetch a point lookup, but
+    would have to be renumbered on every participant delete.
+    """
+    found = {}
+    previous, last_id_no = -1, None
+    for position in sorted(set(positions)):
+        query = {"draw_id": draw_id}
+        if last_id_no is not None:
+            query["id_no"] = {"$gt": last_id_no}
+        docs = await db.participants.find(query, PARTICIPANT_PROJECTION).sort("id_no", 1).skip(
+            position - previous - 1
+        ).limit(1).to_list(length=1)
+        if not docs:
+            break
+        found[position] = docs[0]
+        previous, last_id_no = position, docs[0]["id_no"]
+    return [found.get(position) for position in positions]
+
+
+async def _draw_result(draw: dict, user_id: str) -> dict:
+    """
+    Select the winners of a pending draw and claim it (status completed).
+    Everything that can fail runs before the claim, so an error leaves the
+    draw pending. Returns the draw_results document; the caller inserts it
+    and must call _release_draw if that insert fails, so the draw can be
+    executed again.
+    """
+    draw_id = draw["id"]
     if draw["status"] == "completed":
         raise HTTPException(status_code=400, detail="Bu çekiliş zaten tamamlanmış")
     
-    participants = await db.participants.find({"draw_id": draw_id}, {"_id": 0}).to_list(length=None)
+    total = await db.participants.count_documents({"draw_id": draw_id})
     
     total_needed = draw["main_count"] + draw["backup_count"]
-    if len(participants) < total_needed:
-        raise HTTPException(status_code=400, detail=f"Yetersiz katılımcı! Gerekli: {total_needed}, Mevcut: {len(participants)}")
+    if total < total_needed:
+        raise HTTPException(status_code=400, detail=f"Yetersiz katılımcı! Gerekli: {total_needed}, Mevcut: {total}")
     
-    random.shuffle(participants)
-    winners = participants[:draw["main_count"]]
-    backups = participants[draw["main_count"]:total_needed]
+    seed = secrets.token_hex(32)
+    positions = _sample_positions(seed, total, total_needed)
+    selected = await _participants_at(draw_id, positions)
+    if any(p is None for p in selected):
+        raise HTTPException(status_code=409, detail="Katılımcı listesi çekiliş sırasında değişti, lütfen tekrar deneyin")
     
-    for p in winners + backups:
+    for p in selected:
         if isinstance(p.get('created_at'), str):
             p['created_at'] = datetime.fromisoformat(p['created_at'])
     
-    result_dict = {
+    # Claim the draw before writing the result, so it can only complete once
+    completed_at = datetime.now(timezone.utc).isoformat()
+    try:
+        claimed = await db.draws.update_one(
+            {"id": draw_id, "status": {"$ne": "completed"}, "deleted": {"$ne": True}},
+            {"$set": {"status": "completed", "completed_at": completed_at}}
+        )
+    except Exception:
+        # The update may have been applied before the error: undo our claim if so
+        await _release_draw(draw_id, completed_at)
+        raise
+    if claimed.matched_count == 0:
+        raise HTTPException(status_code=400, detail="Bu çekiliş zaten tamamlanmış")
+    
+    return {
         "draw_id": draw_id,
         "user_id": user_id,
-        "winners": winners,
-        "backups": backups,
-        "draw_date": datetime.now(timezone.utc).isoformat()
+        "winners": selected[:draw["main_count"]],
+        "backups": selected[draw["main_count"]:],
+        "draw_date": completed_at,
+        "seed": seed,
+        "algorithm": DRAW_ALGORITHM,
+        "participant_total": total,
+        "positions": positions
     }
+
+
+async def _release_draw(draw_id: str, completed_at: str):
+    """Undo the claim of a draw whose result could not be written"""
+    await db.draws.update_one(
+        {"id": draw_id, "status": "completed", "completed_at": completed_at},
+        {"$set": {"status": "pending"}, "$unset": {"completed_at": ""}}
+    )
+
+
+async def _insert_draw_results(results: List[dict]) -> set:
+    """Write the batch's results with one unordered insert_many; returns the draw ids whose result was not written"""
+    if not results:
+        return set()
+    try:
+        await db.draw_results.insert_many(results, ordered=False)
+        return set()
+    except BulkWriteError as e:
+        return {results[err["index"]]["draw_id"] for err in e.details.get("writeErrors", [])}
+    except Exception:
+        # Unknown how far the insert got: keep the results that are in the database
+        draw_ids = [result["draw_id"] for result in results]
+        try:
+            saved = await db.draw_results.find(
+                {"draw_id": {"$in": draw_ids}}, {"_id": 0, "draw_id": 1}
+            ).to_list(length=None)
+        except Exception:
+            saved = []
+        return set(draw_ids) - {result["draw_id"] for result in saved}
+
+
+@router.post("/execute-batch")
+async def execute_draws_batch(request: DrawBatchExecute, current_user=Depends(get_current_user)):
+    """
+    Birden fazla çekilişi tek istekte gerçekleştir.
+    Draws run concurrently, at most BATCH_EXECUTE_CONCURRENCY at a time;
+    all results are written with a single insert_many. Each draw reports
+    its own status, a failing draw does not stop the others; draws whose
+    result could not be written are released and reported as failed.
+    """
+    user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
+    draw_ids = list(dict.fromkeys(request.draw_ids))
+    
+    draws = await db.draws.find(
+        {"id": {"$in": draw_ids}, "user_id": user_id, "deleted": {"$ne": True}}, {"_id": 0}
+    ).to_list(length=None)
+    draws_by_id = {draw["id"]: draw for draw in draws}
+    
+    semaphore = asyncio.Semaphore(BATCH_EXECUTE_CONCURRENCY)
+    
+    async def run(draw_id: str):
+        draw = draws_by_id.get(draw_id)
+        if not draw:
+            return None, {"draw_id": draw_id, "status": "failed", "detail": "Çekiliş bulunamadı"}
+        async with semaphore:
+            try:
+                result = await _draw_result(draw, user_id)
+            except HTTPException as e:
+                return None, {"draw_id": draw_id, "name": draw["name"], "status": "failed", "detail": e.detail}
+            except Exception as e:
+                logger.warning(f"Draw {draw_id} could not be executed: {e}")
+                return None, {"draw_id": draw_id, "name": draw["name"], "status": "failed", "detail": "Çekiliş gerçekleştirilemedi, lütfen tekrar deneyin"}
+        return result, {
+            "draw_id": draw_id,
+            "name": draw["name"],
+            "status": "completed",
+            "winners": len(result["winners"]),
+            "backups": len(result["backups"])
+        }
+    
+    outcomes = await asyncio.gather(*(run(draw_id) for draw_id in draw_ids))
+    
+    results = [result for result, _ in outcomes if result]
+    unsaved = await _insert_draw_results(results)
+    for draw_id in unsaved:
+        await _release_draw(draw_id, next(r["draw_date"] for r in results if r["draw_id"] == draw_id))
+    
+    statuses = [status for _, status in outcomes]
+    for status in statuses:
+        if status["draw_id"] in unsaved:
+            status.pop("winners", None)
+            status.pop("backups", None)
+            status.update({"status": "failed", "detail": "Çekiliş sonucu kaydedilemedi, lütfen tekrar deneyin"})
+    completed = sum(1 for status in statuses if status["status"] == "completed")
+    return {
+        "completed": completed,
+        "failed": len(statuses) - completed,
+        "results": statuses
+    }
+
+
+@router.post("/{draw_id}/execute")
+async def execute_draw(draw_id: str, current_user=Depends(get_current_user)):
+    """
+    Çekilişi gerçekleştir.
+    Picks main_count + backup_count positions in the participants' id_no
+    order with a seeded HMAC-SHA256 sampler and fetches only those documents.
+    The seed, algorithm and participant total are stored on the result, so
+    the draw can be reproduced with /{draw_id}/results/verify.
+    """
+    user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
+    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id, "deleted": {"$ne": True}})
+    if not draw:
+        raise HTTPException(status_code=404, detail="Çekiliş bulunamadı")
     
-    await db.draw_results.insert_one(result_dict)
-    await db.draws.update_one({"id": draw_id}, {"$set": {"status": "completed", "completed_at": datetime.now(timezone.utc).isoformat()}})
+    result_dict = await _draw_result(draw, user_id)
+    try:
+        await db.draw_results.insert_one(result_dict)
+    except Exception:
+        await _release_draw(draw_id, result_dict["draw_date"])
+        raise HTTPException(status_code=500, detail="Çekiliş sonucu kaydedilemedi, lütfen tekrar deneyin")
     
     result_dict.pop('_id', None)
     result_dict['draw_date'] = datetime.fromisoformat(result_dict['draw_date'])
     return result_dict
 
 
+@router.get("/{draw_id}/results/verify")
+async def verify_results(draw_id: str, current_user=Depends(get_current_user)):
+    """Çekiliş sonucunu kayıtlı seed ile yeniden üretip doğrula"""
+    user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
+    result = await db.draw_results.find_one(
+        {"draw_id": draw_id, "user_id": user_id},
+        {"_id": 0, "seed": 1, "algorithm": 1, "participant_total": 1, "winners": 1, "backups": 1}
+    )
+    if not result:
+        raise HTTPException(status_code=404, detail="Sonuç bulunamadı")
+    
+    if result.get("algorithm") != DRAW_ALGORITHM:
+        return {"verified": False, "message": "Bu çekiliş doğrulanabilir yöntemle yapılmamış"}
+    
+    total = await db.participants.count_documents({"draw_id": draw_id})
+    if total != result["participant_total"]:
+        return {"verified": False, "message": "Katılımcı listesi çekilişten sonra değişmiş"}
+    
+    selected_ids = [p["id"] for p in result["winners"] + result["backups"]]
+    positions = _sample_positions(result["seed"], total, len(selected_ids))
+    replayed = await _participants_at(draw_id, positions)
+    verified = [p and p["id"] for p in replayed] == selected_ids
+    
+    return {
+        "verified": verified,
+        "algorithm": result["algorithm"],
+        "seed": result["seed"],
+        "participant_total": total,
+        "message": "Sonuç doğrulandı" if verified else "Sonuç kayıtlı seed ile eşleşmiyor"
+    }
+
+
 @router.get("/{draw_id}/results")
 async def get_results(draw_id: str, current_user=Depends(get_current_user)):
     """Çekiliş sonuçlarını getir"""
@@ -326,11 +864,104 @@ async def get_results(draw_id: str, current_user=Depends(get_current_user)):
     return result
 
 
+def _export_sheet(wb: Workbook, title: str, headers: List[str], widths: List[int]):
+    """Write-only sheet with column widths, frozen header and a bold header row"""
+    ws = wb.create_sheet(title)
+    for col, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+    ws.freeze_panes = 'A2'
+    header_row = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = Font(bold=True)
+        header_row.append(cell)
+    ws.append(header_row)
+    return ws
+
+
+def _append_people(ws, people: List[dict], start: int = 1):
+    for i, p in enumerate(people, start):
+        ws.append([i, p['id_no'], p['first_name'], p['last_name'], p['contact']])
+
+
+def _append_participant_rows(wb: Workbook, sheets: dict, batch: List[dict]):
+    """Write one batch of participants (worker thread), opening a new 'Katılımcılar' sheet at the Excel row limit"""
+    for p in batch:
+        if sheets["rows"] >= EXCEL_MAX_ROWS:
+            sheets["count"] += 1
+            title = 'Katılımcılar' if sheets["count"] == 1 else f'Katılımcılar {sheets["count"]}'
+            sheets["ws"] = _export_sheet(wb, title, EXPORT_PERSON_HEADERS, EXPORT_PERSON_WIDTHS)
+            sheets["rows"] = 1
+        sheets["number"] += 1
+        sheets["ws"].append([sheets["number"], p['id_no'], p['first_name'], p['last_name'], p['contact']])
+        sheets["rows"] += 1
+
+
+async def _write_results_xlsx(draw: dict, result: dict, path: str, include_participants: bool):
+    """
+    Write the result workbook in openpyxl write-only mode. With
+    include_participants the draw's participants are streamed from the
+    database in id_no order, EXPORT_BATCH_SIZE at a time, into extra
+    'Katılımcılar' sheet(s) split at the Excel row limit; each batch is
+    written in a worker thread, one at a time, so row serialization does
+    not block the event loop.
+    """
+    wb = Workbook(write_only=True)
+    
+    if result['winners']:
+        ws = _export_sheet(wb, 'Asıl Talihliler', EXPORT_PERSON_HEADERS, EXPORT_PERSON_WIDTHS)
+        _append_people(ws, result['winners'])
+    
+    if result['backups']:
+        ws = _export_sheet(wb, 'Yedek Talihliler', EXPORT_PERSON_HEADERS, EXPORT_PERSON_WIDTHS)
+        _append_people(ws, result['backups'])
+    
+    draw_date = result['draw_date']
+    if isinstance(draw_date, str):
+        draw_date = datetime.fromisoformat(draw_date)
+    
+    ws = _export_sheet(wb, 'Özet', ['Bilgi', 'Değer'], [25, 70])
+    ws.append(['Çekiliş Adı', draw['name']])
+    ws.append(['Çekiliş Tarihi', draw_date.strftime('%Y-%m-%d %H:%M:%S')])
+    ws.append(['Asıl Talihli Sayısı', draw['main_count']])
+    ws.append(['Yedek Talihli Sayısı', draw['backup_count']])
+    ws.append(['Toplam Katılımcı', draw['participant_count']])
+    if result.get('seed'):
+        ws.append(['Algoritma', result['algorithm']])
+        ws.append(['Seed', result['seed']])
+    
+    if include_participants:
+        cursor = db.participants.find(
+            {"draw_id": draw['id']}, PARTICIPANT_LIST_PROJECTION
+        ).sort("id_no", 1).batch_size(EXPORT_BATCH_SIZE)
+        
+        sheets = {"ws": None, "count": 0, "rows": EXCEL_MAX_ROWS, "number": 0}
+        batch = []
+        async for p in cursor:
+            batch.append(p)
+            if len(batch) == EXPORT_BATCH_SIZE:
+                await asyncio.to_thread(_append_participant_rows, wb, sheets, batch)
+                batch = []
+        if batch:
+            await asyncio.to_thread(_append_participant_rows, wb, sheets, batch)
+    
+    await asyncio.to_thread(wb.save, path)
+
+
 @router.get("/{draw_id}/export")
-async def export_results(draw_id: str, current_user=Depends(get_current_user)):
-    """Çekiliş sonuçlarını Excel'e aktar"""
+async def export_results(
+    draw_id: str,
+    include_participants: bool = False,
+    current_user=Depends(get_current_user)
+):
+    """
+    Çekiliş sonuçlarını Excel'e aktar.
+    The workbook is built in write-only mode in a temporary file and streamed
+    to the response in 1MB chunks; include_participants=true adds the full
+    participant list without holding it in memory.
+    """
     user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
-    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id})
+    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id, "deleted": {"$ne": True}})
     if not draw:
         raise HTTPException(status_code=404, detail="Çekiliş bulunamadı")
     
@@ -338,74 +969,135 @@ async def export_results(draw_id: str, current_user=Depends(get_current_user)):
     if not result:
         raise HTTPException(status_code=404, detail="Çekiliş henüz yapılmamış")
     
-    winners_data = []
-    for i, winner in enumerate(result['winners'], 1):
-        winners_data.append({
-            'Sıra': i,
-            'ID No': winner['id_no'],
-            'Ad': winner['first_name'],
-            'Soyad': winner['last_name'],
-            'İletişim': winner['contact']
-        })
-    
-    backups_data = []
-    for i, backup in enumerate(result['backups'], 1):
-        backups_data.append({
-            'Sıra': i,
-            'ID No': backup['id_no'],
-            'Ad': backup['first_name'],
-            'Soyad': backup['last_name'],
-            'İletişim': backup['contact']
-        })
-    
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        if winners_data:
-            df_winners = pd.DataFrame(winners_data)
-            df_winners.to_excel(writer, sheet_name='Asıl Talihliler', index=False)
-        
-        if backups_data:
-            df_backups = pd.DataFrame(backups_data)
-            df_backups.to_excel(writer, sheet_name='Yedek Talihliler', index=False)
-        
-        draw_date = result['draw_date']
-        if isinstance(draw_date, str):
-            draw_date = datetime.fromisoformat(draw_date)
-        
-        summary_data = {
-            'Bilgi': ['Çekiliş Adı', 'Çekiliş Tarihi', 'Asıl Talihli Sayısı', 'Yedek Talihli Sayısı', 'Toplam Katılımcı'],
-            'Değer': [
-                draw['name'],
-                draw_date.strftime('%Y-%m-%d %H:%M:%S'),
-                draw['main_count'],
-                draw['backup_count'],
-                draw['participant_count']
-            ]
-        }
-        df_summary = pd.DataFrame(summary_data)
-        df_summary.to_excel(writer, sheet_name='Özet', index=False)
-    
-    output.seek(0)
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        await _write_results_xlsx(draw, result, path, include_participants)
+    except Exception:
+        os.remove(path)
+        raise
     
     filename = f"cekilis_{draw['name'].replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
     
     return StreamingResponse(
-        output,
+        iter_file_and_remove(path),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 
+async def _soft_delete_draws(user_id: str, draw_ids: List[str]) -> List[dict]:
+    """Mark draws deleted (hidden from every endpoint at once) and drop their results"""
+    draws = await db.draws.find(
+        {"id": {"$in": draw_ids}, "user_id": user_id, "deleted": {"$ne": True}},
+        {"_id": 0, "id": 1, "participant_count": 1}
+    ).to_list(length=None)
+    if not draws:
+        return []
+    
+    ids = [draw["id"] for draw in draws]
+    await db.draws.update_many(
+        {"id": {"$in": ids}},
+        {"$set": {"deleted": True, "deleted_at": datetime.now(timezone.utc).isoformat()}}
+    )
+    await db.draw_results.delete_many({"draw_id": {"$in": ids}})
+    return draws
+
+
+async def _start_reclaim_job(user_id: str, draws: List[dict], background_tasks: BackgroundTasks) -> str:
+    """
+    Queue participant reclamation for soft-deleted draws. Draws of the user
+    left deleted by an interrupted earlier job are picked up as well.
+    """
+    known = {draw["id"] for draw in draws} | reclaiming_draws
+    leftovers = await db.draws.find(
+        {"user_id": user_id, "deleted": True, "id": {"$nin": list(known)}},
+        {"_id": 0, "id": 1, "participant_count": 1}
+    ).to_list(length=None)
+    draws = draws + leftovers
+    reclaiming_draws.update(draw["id"] for draw in draws)
+    
+    job_id = f"del_{uuid.uuid4().hex[:12]}"
+    delete_jobs[job_id] = {
+        "user_id": user_id,
+        "status": "starting",
+        "progress": 0,
+        "message": "Silme işlemi sıraya alındı",
+        "total_draws": len(draws),
+        "deleted_draws": 0,
+        "total_participants": sum(draw.get("participant_count", 0) for draw in draws),
+        "deleted_participants": 0
+    }
+    background_tasks.add_task(_reclaim_draws_task, job_id, [draw["id"] for draw in draws])
+    return job_id
+
+
+async def _reclaim_draws_task(job_id: str, draw_ids: List[str]):
+    """Delete the participants of soft-deleted draws in batches, then the draws themselves"""
+    job = delete_jobs[job_id]
+    job["status"] = "processing"
+    job["message"] = "Katılımcılar siliniyor..."
+    try:
+        for draw_id in draw_ids:
+            while True:
+                batch = await db.participants.find(
+                    {"draw_id": draw_id}, {"_id": 1}
+                ).limit(RECLAIM_BATCH_SIZE).to_list(length=RECLAIM_BATCH_SIZE)
+                if not batch:
+                    break
+                result = await db.participants.delete_many({"_id": {"$in": [p["_id"] for p in batch]}})
+                job["deleted_participants"] += result.deleted_count
+                if job["total_participants"]:
+                    job["progress"] = min(99, job["deleted_participants"] * 100 // job["total_participants"])
+            
+            await db.draws.delete_one({"id": draw_id, "deleted": True})
+            reclaiming_draws.discard(draw_id)
+            job["deleted_draws"] += 1
+        
+        job.update({"status": "completed", "progress": 100, "message": f"{job['deleted_draws']} çekiliş silindi"})
+    except Exception as e:
+        job.update({"status": "failed", "message": f"Silme hatası: {str(e)}"})
+        reclaiming_draws.difference_update(draw_ids)
+    finally:
+        finished = [key for key, value in delete_jobs.items() if value["status"] in ("completed", "failed")]
+        for key in finished[:-MAX_FINISHED_DELETE_JOBS]:
+            delete_jobs.pop(key, None)
+
+
+@router.post("/bulk-delete")
+async def bulk_delete_draws(draw_ids: List[str], background_tasks: BackgroundTasks, current_user=Depends(get_current_user)):
+    """Birden fazla çekilişi sil (katılımcılar arka planda temizlenir)"""
+    user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
+    draws = await _soft_delete_draws(user_id, list(dict.fromkeys(draw_ids)))
+    if not draws:
+        raise HTTPException(status_code=404, detail="Silinecek çekiliş bulunamadı")
+    
+    job_id = await _start_reclaim_job(user_id, draws, background_tasks)
+    return {"message": f"{len(draws)} çekiliş silindi", "deleted_count": len(draws), "job_id": job_id}
+
+
+@router.get("/delete-jobs/{job_id}")
+async def get_delete_job(job_id: str, current_user=Depends(get_current_user)):
+    """Arka plan silme işleminin ilerlemesi"""
+    user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
+    job = delete_jobs.get(job_id)
+    if not job or job["user_id"] != user_id:
+        return {"status": "not_found", "progress": 0, "message": "Silme işlemi bulunamadı"}
+    return job
+
+
 @router.delete("/{draw_id}")
-async def delete_draw(draw_id: str, current_user=Depends(get_current_user)):
-    """Çekilişi sil"""
+async def delete_draw(draw_id: str, background_tasks: BackgroundTasks, current_user=Depends(get_current_user)):
+    """
+    Çekilişi sil.
+    The draw is marked deleted and its result removed immediately; its
+    participants are reclaimed in RECLAIM_BATCH_SIZE batches by a background
+    job whose progress is at /delete-jobs/{job_id}.
+    """
     user_id = current_user.get("username") or current_user.get("email", "").split("@")[0]
-    draw = await db.draws.find_one({"id": draw_id, "user_id": user_id})
-    if not draw:
+    draws = await _soft_delete_draws(user_id, [draw_id])
+    if not draws:
         raise HTTPException(status_code=404, detail="Çekiliş bulunamadı")
     
-    await db.participants.delete_many({"draw_id": draw_id})
-    await db.draw_results.delete_many({"draw_id": draw_id})
-    await db.draws.delete_one({"id": draw_id})
-    
-    return {"success": True, "message": "Çekiliş silindi"}
+    job_id = await _start_reclaim_job(user_id, draws, background_tasks)
+    return {"success": True, "message": "Çekiliş silindi", "job_id": job_id}
@@ -1,13 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Query
 from fastapi.responses import StreamingResponse
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timezone
 from pathlib import Path
+from collections import Counter
 from pydantic import BaseModel
 import io
 import uuid
 
-from openpyxl import Workbook, load_workbook
+from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 from openpyxl.chart import PieChart, Reference
@@ -16,11 +17,24 @@ from openpyxl.chart.label import DataLabelList
 from models import Rapor
 from routers.auth import get_current_user
 from database import db
-from utils import generate_rapor_no
+from utils import reserve_rapor_nos
+from rapor_search import fold, search_fields
 from constants import SEHIRLER
+from excel_import import (
+    ExcelImporter, register_importer, run_import, commit_preview, discard_preview,
+    cell_text, row_error, insert_rows
+)
 
 router = APIRouter(prefix="/excel", tags=["Excel"])
 
+# Template column order (see /template)
+RAPOR_IMPORT_COLUMNS = [
+    "sehir", "ekipman_adi", "kategori", "firma", "lokasyon", "marka_model",
+    "seri_no", "alt_kategori", "periyot", "gecerlilik_tarihi", "uygunluk", "aciklama"
+]
+# Turkish-folded city name -> city ("istanbul", "İSTANBUL" and "Istanbul" all match)
+SEHIR_MAP = {fold(sehir["isim"]): sehir for sehir in SEHIRLER}
+
 # Request model for selective export
 class ExcelExportRequest(BaseModel):
     rapor_ids: List[str]
@@ -583,123 +597,107 @@ async def download_template():
         headers={"Content-Disposition": "attachment; filename=rapor_sablonu.xlsx"}
     )
 
+async def _validate_rapor_rows(batch: List[tuple], context: dict, state: dict) -> Tuple[List[Tuple[int, dict]], List[dict], int]:
+    """Validated report fields and per-row errors ({row, field, message}) for one batch"""
+    valid, errors = [], []
+    for row_idx, row in batch:
+        fields = {name: cell_text(row, index) for index, name in enumerate(RAPOR_IMPORT_COLUMNS)}
+        
+        missing = [name for name in ("ekipman_adi", "kategori", "firma") if not fields[name]]
+        if missing:
+            errors.append(row_error(row_idx, missing[0], "Zorunlu alanlar eksik (Ekipman Adı, Kategori, Firma)"))
+            continue
+        
+        if not fields["sehir"]:
+            errors.append(row_error(row_idx, "sehir", "Şehir alanı zorunludur"))
+            continue
+        
+        sehir_obj = SEHIR_MAP.get(fold(fields["sehir"].strip()))
+        if not sehir_obj:
+            errors.append(row_error(row_idx, "sehir", f"Geçersiz şehir - '{fields['sehir']}'"))
+            continue
+        
+        fields["sehir"] = sehir_obj["isim"]
+        fields["sehir_kodu"] = sehir_obj["kod"]
+        valid.append((row_idx, fields))
+    return valid, errors, 0
+
+
+async def _commit_raporlar(valid: List[Tuple[int, dict]], context: dict, errors: List[dict]) -> int:
+    """Reserve report numbers with one counter update per city, then insert in chunks"""
+    city_counts = Counter(fields["sehir"] for _, fields in valid)
+    numbers = {}
+    for sehir, count in city_counts.items():
+        numbers[sehir] = iter(await reserve_rapor_nos(sehir, count))
+    
+    now = datetime.now(timezone.utc).isoformat()
+    docs = []
+    for _, fields in valid:
+        rapor_data = {
+            "id": str(uuid.uuid4()),
+            "rapor_no": next(numbers[fields["sehir"]]),
+            "proje_id": context["proje_id"],
+            "proje_adi": context["proje_adi"],
+            **fields,
+            "durum": "Aktif",
+            "created_by": context["created_by"],
+            "created_by_username": context["created_by_username"],
+            "created_at": now,
+            "updated_at": now
+        }
+        rapor_data.update(search_fields(rapor_data))
+        docs.append(rapor_data)
+    return await insert_rows(db.raporlar, docs, [row_idx for row_idx, _ in valid], errors)
+
+
+register_importer("raporlar", ExcelImporter(
+    label="rapor",
+    roles=("admin", "inspector"),
+    validate=_validate_rapor_rows,
+    commit=_commit_raporlar
+))
+
+
 @router.post("/import")
 async def import_excel(
     file: UploadFile = File(...),
     proje_id: str = Form(...),
+    dry_run: bool = Form(False),
     current_user: dict = Depends(get_current_user)
 ):
+    """
+    Excel'den toplu rapor içe aktar.
+    The sheet is streamed and validated in batches against a precomputed city
+    map; report numbers are then reserved with one counter update per city
+    and the reports written with unordered insert_many in chunks. With
+    dry_run nothing is written: the response previews the result and carries
+    a token for POST /excel/import/{token}/commit. `error_rows` lists every
+    rejected row as {row, field, message}.
+    """
     if current_user["role"] not in ["admin", "inspector"]:
         raise HTTPException(status_code=403, detail="Excel içe aktarma yetkiniz yok")
     
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Sadece Excel dosyaları yüklenebilir")
-    
     proje = await db.projeler.find_one({"id": proje_id}, {"_id": 0})
     if not proje:
         raise HTTPException(status_code=404, detail="Proje bulunamadı")
     
-    proje_adi = proje.get("proje_adi", "")
-    
-    content = await file.read()
-    excel_file = io.BytesIO(content)
-    
-    try:
-        wb = load_workbook(excel_file)
-        ws = wb.active
-        
-        imported_count = 0
-        errors = []
-        
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
-            if not any(row):
-                continue
-            
-            try:
-                def get_cell(index):
-                    return row[index] if index < len(row) and row[index] is not None else None
-                
-                sehir = str(get_cell(0)) if get_cell(0) else None
-                ekipman_adi = str(get_cell(1)) if get_cell(1) else ""
-                kategori = str(get_cell(2)) if get_cell(2) else ""
-                firma = str(get_cell(3)) if get_cell(3) else ""
-                lokasyon = str(get_cell(4)) if get_cell(4) else None
-                marka_model = str(get_cell(5)) if get_cell(5) else None
-                seri_no = str(get_cell(6)) if get_cell(6) else None
-                alt_kategori = str(get_cell(7)) if get_cell(7) else None
-                periyot = str(get_cell(8)) if get_cell(8) else None
-                gecerlilik_tarihi = str(get_cell(9)) if get_cell(9) else None
-                uygunluk = str(get_cell(10)) if get_cell(10) else None
-                aciklama = str(get_cell(11)) if get_cell(11) else None
-                
-                if not ekipman_adi or not kategori or not firma:
-                    errors.append(f"Satır {row_idx}: Zorunlu alanlar eksik (Ekipman Adı, Kategori, Firma)")
-                    continue
-                
-                if not sehir:
-                    errors.append(f"Satır {row_idx}: Şehir alanı zorunludur")
-                    continue
-                
-                def turkish_lower(text):
-                    text = text.strip()
-                    text = text.replace('İ', 'i').replace('I', 'ı')
-                    return text.lower()
-                
-                def normalize_turkish(text):
-                    turkish_map = str.maketrans('ıİiIğĞüÜşŞöÖçÇ', 'iiiigguussoocc')
-                    return turkish_lower(text).translate(turkish_map)
-                
-                sehir_normalized = normalize_turkish(sehir)
-                
-                sehir_obj = None
-                for s in SEHIRLER:
-                    if normalize_turkish(s["isim"]) == sehir_normalized:
-                        sehir_obj = s
-                        sehir = s["isim"]
-                        break
-                
-                if not sehir_obj:
-                    errors.append(f"Satır {row_idx}: Geçersiz şehir - '{sehir}'")
-                    continue
-                
-                rapor_no = await generate_rapor_no(sehir)
-                
-                rapor_data = {
-                    "id": str(uuid.uuid4()),
-                    "rapor_no": rapor_no,
-                    "proje_id": proje_id,
-                    "proje_adi": proje_adi,
-                    "sehir": sehir,
-                    "sehir_kodu": sehir_obj["kod"],
-                    "ekipman_adi": ekipman_adi,
-                    "kategori": kategori,
-                    "alt_kategori": alt_kategori,
-                    "firma": firma,
-                    "lokasyon": lokasyon,
-                    "marka_model": marka_model,
-                    "seri_no": seri_no,
-                    "periyot": periyot,
-                    "gecerlilik_tarihi": gecerlilik_tarihi,
-                    "uygunluk": uygunluk,
-                    "aciklama": aciklama,
-                    "durum": "Aktif",
-                    "created_by": current_user["id"],
-                    "created_by_username": current_user.get("username", current_user.get("email", "")),
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
-                
-                await db.raporlar.insert_one(rapor_data)
-                imported_count += 1
-                
-            except Exception as e:
-                errors.append(f"Satır {row_idx}: {str(e)}")
-        
-        return {
-            "message": f"{imported_count} rapor başarıyla içe aktarıldı",
-            "imported_count": imported_count,
-            "errors": errors
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Excel işleme hatası: {str(e)}")
+    context = {
+        "proje_id": proje_id,
+        "proje_adi": proje.get("proje_adi", ""),
+        "created_by": current_user["id"],
+        "created_by_username": current_user.get("username", current_user.get("email", ""))
+    }
+    return await run_import("raporlar", file, context, current_user, dry_run)
+
+
+@router.post("/import/{token}/commit")
+async def commit_import(token: str, current_user: dict = Depends(get_current_user)):
+    """Önizlemesi yapılmış içe aktarmayı uygula (rapor, iskele bileşeni, makine, kategori)"""
+    return await commit_preview(token, current_user)
+
+
+@router.delete("/import/{token}")
+async def discard_import(token: str, current_user: dict = Depends(get_current_user)):
+    """Önizlemesi yapılmış içe aktarmayı iptal et"""
+    discard_preview(token, current_user)
+    return {"message": "Önizleme iptal edildi"}
@@ -6,7 +6,7 @@ from pydantic import BaseModel
 import io
 import uuid
 
-from openpyxl import Workbook, load_workbook
+from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 from openpyxl.chart import PieChart, Reference
@@ -15,6 +15,7 @@ from openpyxl.chart.label import DataLabelList
 from models import IskeleBileseni, IskeleBileseniCreate
 from routers.auth import get_current_user
 from database import db
+from excel_import import ExcelImporter, register_importer, run_import, cell_text, row_error, insert_rows
 
 router = APIRouter(tags=["Iskele"])
 
@@ -295,98 +296,87 @@ async def download_iskele_template():
         headers={"Content-Disposition": "attachment; filename=iskele_bilesenleri_sablonu.xlsx"}
     )
 
+ISKELE_IMPORT_COLUMNS = ["bilesen_adi", "malzeme_kodu", "adet", "firma_adi", "gecerlilik_tarihi", "uygunluk", "aciklama"]
+
+
+async def _validate_iskele_rows(batch: List[tuple], context: dict, state: dict):
+    valid, errors = [], []
+    for row_idx, row in batch:
+        fields = {name: cell_text(row, index) for index, name in enumerate(ISKELE_IMPORT_COLUMNS)}
+        
+        if not fields["bilesen_adi"] or not fields["malzeme_kodu"] or not fields["firma_adi"]:
+            errors.append(row_error(row_idx, "bilesen_adi", "Zorunlu alanlar eksik"))
+            continue
+        
+        bilesen_adedi_raw = row[2] if len(row) > 2 else None
+        try:
+            bilesen_adedi = int(bilesen_adedi_raw) if bilesen_adedi_raw else 1
+        except (ValueError, TypeError):
+            errors.append(row_error(row_idx, "adet", "Bileşen adedi geçersiz"))
+            continue
+        if bilesen_adedi < 1:
+            errors.append(row_error(row_idx, "adet", "Bileşen adedi en az 1 olmalıdır"))
+            continue
+        
+        fields["adet"] = bilesen_adedi
+        fields["uygunluk"] = fields["uygunluk"] or "Uygun"
+        valid.append((row_idx, fields))
+    return valid, errors, 0
+
+
+async def _commit_iskele_bilesenleri(valid: List[tuple], context: dict, errors: List[dict]) -> int:
+    now = datetime.now(timezone.utc).isoformat()
+    docs = [{
+        "id": str(uuid.uuid4()),
+        "proje_id": context["proje_id"],
+        "proje_adi": context["proje_adi"],
+        "bileşen_adi": fields["bilesen_adi"],
+        "malzeme_kodu": fields["malzeme_kodu"],
+        "bileşen_adedi": fields["adet"],
+        "firma_adi": fields["firma_adi"],
+        "iskele_periyodu": "6 Aylık",
+        "gecerlilik_tarihi": fields["gecerlilik_tarihi"],
+        "uygunluk": fields["uygunluk"],
+        "aciklama": fields["aciklama"],
+        "gorseller": [],
+        "created_by": context["created_by"],
+        "created_by_username": context["created_by_username"],
+        "created_at": now,
+        "updated_at": now
+    } for _, fields in valid]
+    return await insert_rows(db.iskele_bilesenleri, docs, [row_idx for row_idx, _ in valid], errors)
+
+
+register_importer("iskele_bilesenleri", ExcelImporter(
+    label="iskele bileşeni",
+    roles=("admin", "inspector"),
+    validate=_validate_iskele_rows,
+    commit=_commit_iskele_bilesenleri
+))
+
+
 @router.post("/iskele-bilesenleri/excel/import")
 async def import_iskele_excel(
     file: UploadFile = File(...),
     proje_id: str = Form(...),
+    dry_run: bool = Form(False),
     current_user: dict = Depends(get_current_user)
 ):
+    """İskele bileşenlerini Excel'den içe aktar (dry_run ile önce önizleme, sonra /excel/import/{token}/commit)"""
     if current_user["role"] not in ["admin", "inspector"]:
         raise HTTPException(status_code=403, detail="İskele bileşeni içe aktarma yetkiniz yok")
     
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Sadece Excel dosyaları yüklenebilir")
-    
     proje = await db.projeler.find_one({"id": proje_id}, {"_id": 0})
     if not proje:
         raise HTTPException(status_code=404, detail="Proje bulunamadı")
     
-    proje_adi = proje.get("proje_adi", "")
-    
-    content = await file.read()
-    excel_file = io.BytesIO(content)
-    
-    try:
-        wb = load_workbook(excel_file)
-        ws = wb.active
-        
-        imported_count = 0
-        errors = []
-        
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
-            if not any(row):
-                continue
-            
-            try:
-                def get_cell(index):
-                    return row[index] if index < len(row) and row[index] is not None else None
-                
-                bilesen_adi = str(get_cell(0)) if get_cell(0) else ""
-                malzeme_kodu = str(get_cell(1)) if get_cell(1) else ""
-                bilesen_adedi_raw = get_cell(2)
-                firma_adi = str(get_cell(3)) if get_cell(3) else ""
-                gecerlilik_tarihi = str(get_cell(4)) if get_cell(4) else None
-                uygunluk = str(get_cell(5)) if get_cell(5) else "Uygun"
-                aciklama = str(get_cell(6)) if get_cell(6) else None
-                
-                if not bilesen_adi or not malzeme_kodu or not firma_adi:
-                    errors.append(f"Satır {row_idx}: Zorunlu alanlar eksik")
-                    continue
-                
-                try:
-                    bilesen_adedi = int(bilesen_adedi_raw) if bilesen_adedi_raw else 1
-                    if bilesen_adedi < 1:
-                        errors.append(f"Satır {row_idx}: Bileşen adedi en az 1 olmalıdır")
-                        continue
-                except (ValueError, TypeError):
-                    errors.append(f"Satır {row_idx}: Bileşen adedi geçersiz")
-                    continue
-                
-                bilesen_id = str(uuid.uuid4())
-                bilesen_data = {
-                    "id": bilesen_id,
-                    "proje_id": proje_id,
-                    "proje_adi": proje_adi,
-                    "bileşen_adi": bilesen_adi,
-                    "malzeme_kodu": malzeme_kodu,
-                    "bileşen_adedi": bilesen_adedi,
-                    "firma_adi": firma_adi,
-                    "iskele_periyodu": "6 Aylık",
-                    "gecerlilik_tarihi": gecerlilik_tarihi,
-                    "uygunluk": uygunluk,
-                    "aciklama": aciklama,
-                    "gorseller": [],
-                    "created_by": current_user["id"],
-                    "created_by_username": current_user.get("username", current_user.get("email", "")),
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
-                
-                await db.iskele_bilesenleri.insert_one(bilesen_data)
-                imported_count += 1
-                
-            except Exception as e:
-                errors.append(f"Satır {row_idx}: {str(e)}")
-                continue
-        
-        return {
-            "message": f"{imported_count} iskele bileşeni başarıyla içe aktarıldı",
-            "imported_count": imported_count,
-            "errors": errors
-        }
-    
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Excel dosyası işlenemedi: {str(e)}")
+    context = {
+        "proje_id": proje_id,
+        "proje_adi": proje.get("proje_adi", ""),
+        "created_by": current_user["id"],
+        "created_by_username": current_user.get("username", current_user.get("email", ""))
+    }
+    return await run_import("iskele_bilesenleri", file, context, current_user, dry_run)
 
 
 # ==================== FİLTRELENMİŞ İSTATİSTİKLER VE EXCEL EXPORT ====================
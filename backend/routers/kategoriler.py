@@ -1,18 +1,22 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
 from typing import List
 from datetime import datetime, timezone
 import io
 
-from openpyxl import Workbook, load_workbook
+from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 
 from models import Kategori, KategoriCreate
 from routers.auth import get_current_user
 from database import db
+from indexes import register_index
+from excel_import import ExcelImporter, register_importer, run_import, row_error, insert_rows
 
 router = APIRouter(prefix="/kategoriler", tags=["Kategoriler"])
 
+register_index("kategoriler", "isim", unique=True)
+
 @router.get("", response_model=List[Kategori])
 async def get_kategoriler(current_user: dict = Depends(get_current_user)):
     kategoriler = await db.kategoriler.find({}, {"_id": 0}).to_list(1000)
@@ -77,80 +81,84 @@ async def download_kategori_template(current_user: dict = Depends(get_current_us
         headers={"Content-Disposition": "attachment; filename=kategori_sablonu.xlsx"}
     )
 
-@router.post("/excel/import")
-async def import_kategoriler_excel(file: UploadFile = File(...), current_user: dict = Depends(get_current_user)):
-    """Excel dosyasından kategorileri toplu import et"""
-    if current_user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Bu işlem için yetkiniz yok")
-    
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Sadece Excel dosyaları (.xlsx, .xls) kabul edilir")
-    
-    try:
-        contents = await file.read()
-        wb = load_workbook(io.BytesIO(contents))
-        ws = wb.active
-        
-        # Get existing categories to avoid duplicates
-        existing_kategoriler = await db.kategoriler.find({}, {"_id": 0, "isim": 1}).to_list(1000)
-        existing_names = {k['isim'].lower().strip() for k in existing_kategoriler}
-        
-        imported_count = 0
-        skipped_count = 0
-        errors = []
+async def _existing_kategori_names() -> set:
+    return {k['isim'].lower().strip() async for k in db.kategoriler.find({}, {"_id": 0, "isim": 1})}
+
+
+async def _validate_kategori_rows(batch: List[tuple], context: dict, state: dict):
+    """Rows whose name already exists (in the database or earlier in the file) are skipped"""
+    if "existing_names" not in state:
+        state["existing_names"] = await _existing_kategori_names()
+    existing_names = state["existing_names"]
+    valid, skipped_count = [], 0
+    for row_idx, row in batch:
+        isim = str(row[0]).strip() if row[0] else None
+        if not isim:
+            continue
         
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-            if not row or not row[0]:  # Skip empty rows
-                continue
-                
-            isim = str(row[0]).strip() if row[0] else None
-            
-            if not isim:
-                continue
-            
-            # Check for duplicate
-            if isim.lower() in existing_names:
-                skipped_count += 1
-                continue
-            
-            # Parse alt kategoriler
-            alt_kategoriler = []
-            if len(row) > 1 and row[1]:
-                alt_kat_str = str(row[1]).strip()
-                alt_kategoriler = [ak.strip() for ak in alt_kat_str.split(',') if ak.strip()]
-            
-            # Parse açıklama
-            aciklama = str(row[2]).strip() if len(row) > 2 and row[2] else None
-            
-            try:
-                kategori = Kategori(
-                    isim=isim,
-                    alt_kategoriler=alt_kategoriler,
-                    aciklama=aciklama
-                )
-                doc = kategori.model_dump()
-                doc['created_at'] = doc['created_at'].isoformat()
-                await db.kategoriler.insert_one(doc)
-                existing_names.add(isim.lower())
-                imported_count += 1
-            except Exception as e:
-                errors.append(f"Satır {row_idx}: {str(e)}")
+        # Check for duplicate
+        if isim.lower() in existing_names:
+            skipped_count += 1
+            continue
+        existing_names.add(isim.lower())
         
-        result_message = f"{imported_count} kategori başarıyla eklendi"
-        if skipped_count > 0:
-            result_message += f", {skipped_count} kategori zaten mevcut (atlandı)"
-        if errors:
-            result_message += f", {len(errors)} hata oluştu"
+        # Parse alt kategoriler
+        alt_kategoriler = []
+        if len(row) > 1 and row[1]:
+            alt_kat_str = str(row[1]).strip()
+            alt_kategoriler = [ak.strip() for ak in alt_kat_str.split(',') if ak.strip()]
         
-        return {
-            "message": result_message,
-            "imported_count": imported_count,
-            "skipped_count": skipped_count,
-            "errors": errors[:10]  # İlk 10 hatayı döndür
-        }
+        # Parse açıklama
+        aciklama = str(row[2]).strip() if len(row) > 2 and row[2] else None
         
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Excel dosyası işlenirken hata: {str(e)}")
+        valid.append((row_idx, {"isim": isim, "alt_kategoriler": alt_kategoriler, "aciklama": aciklama}))
+    return valid, [], skipped_count
+
+
+async def _commit_kategoriler(valid: List[tuple], context: dict, errors: List[dict]) -> int:
+    # Names added since a preview are rejected (the unique isim index only catches exact matches)
+    existing_names = await _existing_kategori_names()
+    docs, rows = [], []
+    for row_idx, fields in valid:
+        if fields["isim"].lower() in existing_names:
+            errors.append(row_error(row_idx, "isim", f"Kategori zaten mevcut - '{fields['isim']}'"))
+            continue
+        doc = Kategori(**fields).model_dump()
+        doc['created_at'] = doc['created_at'].isoformat()
+        docs.append(doc)
+        rows.append(row_idx)
+    return await insert_rows(db.kategoriler, docs, rows, errors)
+
+
+def _kategori_import_message(imported_count: int, skipped_count: int, error_count: int) -> str:
+    result_message = f"{imported_count} kategori başarıyla eklendi"
+    if skipped_count > 0:
+        result_message += f", {skipped_count} kategori zaten mevcut (atlandı)"
+    if error_count:
+        result_message += f", {error_count} hata oluştu"
+    return result_message
+
+
+register_importer("kategoriler", ExcelImporter(
+    label="kategori",
+    roles=("admin",),
+    validate=_validate_kategori_rows,
+    commit=_commit_kategoriler,
+    message=_kategori_import_message
+))
+
+
+@router.post("/excel/import")
+async def import_kategoriler_excel(
+    file: UploadFile = File(...),
+    dry_run: bool = Form(False),
+    current_user: dict = Depends(get_current_user)
+):
+    """Excel dosyasından kategorileri toplu import et (dry_run ile önce önizleme)"""
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Bu işlem için yetkiniz yok")
+    
+    return await run_import("kategoriler", file, {}, current_user, dry_run)
 
 @router.post("", response_model=Kategori)
 async def create_kategori(kategori_create: KategoriCreate, current_user: dict = Depends(get_current_user)):
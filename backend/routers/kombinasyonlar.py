@@ -9,31 +9,71 @@ Rastgele kombinasyon üretme, arama ve Excel'e kaydetme işlemleri
 - Her beşli kombinasyona rastgele bonus ile: ~1.030.144 kombinasyon
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any, Set, Tuple
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
 import random
-from itertools import combinations
-import io
+import os
+import time
+import tempfile
+import uuid
+import asyncio
+import base64
 from fastapi.responses import StreamingResponse
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 
+from kombinasyon_store import (
+    CombinationStore, MAX_COMBINATIONS, TOTAL_FIVES, SNAPSHOT_NAME_PATTERN,
+    generate_rows, iter_generate_rows, format_combination,
+    save_snapshot, load_snapshot, list_snapshots, delete_snapshot,
+    set_active_snapshot, get_active_snapshot, active_snapshot_stamp, prune_snapshots, SNAPSHOT_CACHE
+)
+from routers.auth import get_current_user
+from zip_stream import iter_file_and_remove
+
 router = APIRouter(prefix="/kombinasyonlar", tags=["Kombinasyonlar"])
 
-# Global cache for combinations
-COMBINATIONS_CACHE: Dict[int, List[int]] = {}
-# Track unique 5-number combinations
-UNIQUE_FIVES: Set[Tuple[int, ...]] = set()
+# Every user has an isolated workspace (keyed by user id) under
+# uploads/kombinasyonlar. The active set of a workspace is a pointer file there;
+# opened sets live in SNAPSHOT_CACHE (LRU with a memory budget).
+# workspace -> (pointer stamp, active snapshot ref) as last seen by this process
+_active_refs = {}
+EMPTY_STORE = CombinationStore()
+DEFAULT_SNAPSHOT_NAME = "varsayilan"
+
+# Background generation job progress (same polling pattern as arsiv.archive_progress)
+generation_jobs = {}
+# Finished jobs kept for polling before the oldest are dropped
+MAX_FINISHED_JOBS = 20
 
 # Default target: 1,030,144 unique combinations
 DEFAULT_COMBINATION_COUNT = 1030144
 
+# Export settings
+EXPORT_HEADERS = ["Sıra", "Sayı 1", "Sayı 2", "Sayı 3", "Sayı 4", "Sayı 5", "Bonus", "Format"]
+EXPORT_CHUNK_SIZE = 50000
+EXCEL_MAX_ROWS = 1048576  # Excel sheet row limit (header included)
+
+# Range / stream settings (virtual scrolling in the UI)
+RANGE_DEFAULT_LIMIT = 100
+RANGE_MAX_LIMIT = 5000
+STREAM_CHUNK_SIZE = 10000
+
 
 class GenerateRequest(BaseModel):
     num_combinations: int = DEFAULT_COMBINATION_COUNT
     seed: Optional[int] = None
+    background: bool = False
+    name: str = DEFAULT_SNAPSHOT_NAME
+
+
+class SnapshotActivateRequest(BaseModel):
+    name: str
+    version: Optional[int] = None
 
 
 class SearchRequest(BaseModel):
@@ -49,6 +89,8 @@ class GenerateResponse(BaseModel):
     generated_count: int
     total_count: int
     message: str
+    job_id: Optional[str] = None
+    snapshot: Optional[dict] = None
 
 
 class SearchResult(BaseModel):
@@ -69,86 +111,304 @@ class StatsResponse(BaseModel):
     total_combinations: int
     unique_five_combos: Optional[int] = 0
     default_target: Optional[int] = DEFAULT_COMBINATION_COUNT
+    active_job: Optional[dict] = None
+    snapshot: Optional[dict] = None
+
+
+def _workspace(current_user: dict) -> str:
+    """Combination workspace of the calling user"""
+    return current_user["id"]
+
+
+def _active_ref(workspace: str) -> Optional[dict]:
+    """Active snapshot ref of a workspace; the pointer is re-read only when it changed"""
+    stamp = active_snapshot_stamp(workspace)
+    cached = _active_refs.get(workspace)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, get_active_snapshot(workspace))
+        _active_refs[workspace] = cached
+    return cached[1]
+
+
+def _current_store(workspace: str) -> CombinationStore:
+    """Return the workspace's active set, re-mapping it if it was evicted or replaced"""
+    ref = _active_ref(workspace)
+    if not ref:
+        return EMPTY_STORE
+    try:
+        return load_snapshot(workspace, ref["name"], ref["version"])[0]
+    except FileNotFoundError:
+        return EMPTY_STORE
+
+
+def _publish_store(store: CombinationStore, workspace: str, name: str, seed: Optional[int]) -> dict:
+    """Save a generated store as a new snapshot version, make it active and drop old versions"""
+    meta = save_snapshot(store, workspace, name, {"seed": seed})
+    set_active_snapshot(workspace, meta)
+    prune_snapshots(workspace, name, protect=meta)
+    return meta
+
+
+def _generate_and_publish(workspace: str, num: int, seed: Optional[int], name: str) -> Tuple[int, dict]:
+    """
+    Generate, index and publish a set in one go (worker thread body of the
+    synchronous generate path); every worker switches to the new snapshot
+    version on its next request. Returns (rows generated, snapshot meta).
+    """
+    store = CombinationStore()
+    store.append(generate_rows(num, seed))
+    return len(store), _publish_store(store, workspace, name, seed)
+
+
+def _combination_item(index: int, comb: List[int]) -> dict:
+    """Build a CombinationItem dict from a stored row"""
+    return {
+        "index": index,
+        "main_numbers": comb[:5],
+        "bonus_number": comb[5],
+        "formatted": format_combination(comb)
+    }
 
 
 @router.get("/stats", response_model=StatsResponse)
-async def get_stats():
+async def get_stats(current_user: dict = Depends(get_current_user)):
     """Get current combination statistics"""
+    workspace = _workspace(current_user)
+    store = _current_store(workspace)
     return {
-        "total_combinations": len(COMBINATIONS_CACHE),
-        "unique_five_combos": len(UNIQUE_FIVES),
-        "default_target": DEFAULT_COMBINATION_COUNT
+        "total_combinations": len(store),
+        "unique_five_combos": store.unique_fives,
+        "default_target": DEFAULT_COMBINATION_COUNT,
+        "active_job": _active_job(workspace),
+        "snapshot": _active_ref(workspace)
+    }
+
+
+@router.get("/analytics")
+async def get_analytics(current_user: dict = Depends(get_current_user)):
+    """
+    Number frequency, bonus distribution, 34x34 pair co-occurrence matrix and
+    sum / odd-even / high-low histograms over the active set.
+    Memoized per set, so it is recomputed only after generate/clear.
+    """
+    store = _current_store(_workspace(current_user))
+    if not store:
+        raise HTTPException(status_code=400, detail="Önce kombinasyon oluşturmanız gerekiyor!")
+    
+    analytics = await asyncio.to_thread(store.analytics)
+    return {
+        "numbers": list(range(1, 35)),
+        "bonus_numbers": list(range(1, 15)),
+        **analytics
     }
 
 
 @router.post("/generate", response_model=GenerateResponse)
-async def generate_combinations(request: GenerateRequest):
+async def generate_combinations(
+    request: GenerateRequest,
+    background_tasks: BackgroundTasks,
+    current_user: dict = Depends(get_current_user)
+):
     """
     Generate new combinations with UNIQUE 5-number sets.
     Each 5-number combination appears only once, bonus is random.
+    Beyond 278,256 rows, unused (five, bonus) pairs are drawn, so no row repeats.
     Target: 1,030,144 unique combinations.
-    """
-    global COMBINATIONS_CACHE, UNIQUE_FIVES
-    
-    if request.seed:
-        random.seed(request.seed)
     
+    With background=true a job is started instead; poll /jobs/{job_id}.
+    The result is saved as the next version of snapshot `name` in the
+    caller's workspace and activated.
+    """
+    workspace = _workspace(current_user)
     num = request.num_combinations
     if num <= 0:
         raise HTTPException(status_code=400, detail="Kombinasyon sayısı pozitif olmalıdır")
     
-    # C(34,5) = 278,256 unique 5-number combinations possible
-    max_unique_fives = 278256
-    
-    if num > max_unique_fives * 14:  # Each five can have 14 different bonuses
+    if num > MAX_COMBINATIONS:  # Each five can have 14 different bonuses
         raise HTTPException(
             status_code=400, 
-            detail=f"Maksimum {max_unique_fives * 14:,} kombinasyon üretilebilir (278.256 beşli × 14 bonus)"
+            detail=f"Maksimum {MAX_COMBINATIONS:,} kombinasyon üretilebilir (278.256 beşli × 14 bonus)"
         )
     
-    # Clear existing if regenerating
-    COMBINATIONS_CACHE.clear()
-    UNIQUE_FIVES.clear()
-    
-    generated = 0
-    attempts = 0
-    max_attempts = num * 3  # Prevent infinite loop
+    if not SNAPSHOT_NAME_PATTERN.match(request.name):
+        raise HTTPException(status_code=400, detail="Geçersiz set adı (harf, rakam, _ ve - kullanılabilir)")
     
-    while generated < num and attempts < max_attempts:
-        attempts += 1
-        
-        # Generate unique 5-number combination
-        main_numbers = tuple(sorted(random.sample(range(1, 35), 5)))
-        
-        # Check if this 5-number combo already exists
-        if main_numbers in UNIQUE_FIVES:
-            continue
+    if request.background:
+        if _active_job(workspace):
+            raise HTTPException(status_code=409, detail="Devam eden bir üretim işi var. Bitmesini bekleyin veya iptal edin.")
         
-        # Add to unique set
-        UNIQUE_FIVES.add(main_numbers)
-        
-        # Random bonus (1-14)
-        bonus_number = random.randint(1, 14)
+        _prune_finished_jobs()
+        job_id = f"gen_{uuid.uuid4().hex[:12]}"
+        generation_jobs[job_id] = {
+            "job_id": job_id,
+            "workspace": workspace,
+            "status": "starting",
+            "progress": 0,
+            "generated": 0,
+            "total": num,
+            "rate": 0,
+            "elapsed": 0.0,
+            "cancel_requested": False,
+            "message": "Kombinasyon üretimi hazırlanıyor...",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "finished_at": None
+        }
+        background_tasks.add_task(generate_combinations_task, job_id, num, request.seed, request.name)
         
-        # Store combination
-        generated += 1
-        combination = list(main_numbers) + [bonus_number]
-        COMBINATIONS_CACHE[generated] = combination
+        return {
+            "generated_count": 0,
+            "total_count": len(_current_store(workspace)),
+            "message": f"{num:,} kombinasyon için üretim işi başlatıldı",
+            "job_id": job_id
+        }
+    
+    # Generation, indexing and saving all run in a worker thread so the event loop stays free
+    generated, meta = await asyncio.to_thread(_generate_and_publish, workspace, num, request.seed, request.name)
+    
+    if generated > TOTAL_FIVES:
+        message = f"{generated:,} benzersiz kombinasyon oluşturuldu. Tüm beşliler kullanıldı, hiçbir satır tekrar etmiyor!"
+    else:
+        message = f"{generated:,} benzersiz kombinasyon oluşturuldu. Her beşli farklı!"
     
     return {
         "generated_count": generated,
-        "total_count": len(COMBINATIONS_CACHE),
-        "message": f"{generated:,} benzersiz kombinasyon oluşturuldu. Her beşli farklı!"
+        "total_count": len(_current_store(workspace)),
+        "message": message,
+        "snapshot": meta
     }
 
 
+def _active_job(workspace: str) -> Optional[dict]:
+    """Return the workspace's running generation job, if any"""
+    for job in generation_jobs.values():
+        if job["workspace"] == workspace and job["status"] in ("starting", "processing"):
+            return job
+    return None
+
+
+def _prune_finished_jobs():
+    """Drop the oldest finished jobs beyond MAX_FINISHED_JOBS"""
+    finished = [
+        job_id for job_id, job in generation_jobs.items()
+        if job["status"] not in ("starting", "processing")
+    ]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS + 1)]:
+        del generation_jobs[job_id]
+
+
+def _run_generation_job(job_id: str, num: int, seed: Optional[int], name: str):
+    """Worker thread body: fill a fresh store chunk by chunk, then publish it"""
+    job = generation_jobs[job_id]
+    job["status"] = "processing"
+    job["message"] = "Kombinasyonlar üretiliyor..."
+    
+    store = CombinationStore()
+    store.reserve(num)
+    started = time.monotonic()
+    
+    for rows in iter_generate_rows(num, seed):
+        if job["cancel_requested"]:
+            job["status"] = "cancelled"
+            job["message"] = f"İptal edildi ({len(store):,} / {num:,} kombinasyon üretilmişti)"
+            return
+        
+        store.append(rows)
+        elapsed = time.monotonic() - started
+        job["generated"] = len(store)
+        job["progress"] = int(len(store) * 100 / num)
+        job["elapsed"] = round(elapsed, 3)
+        job["rate"] = int(len(store) / elapsed) if elapsed > 0 else 0
+    
+    job["message"] = "Kombinasyon seti kaydediliyor..."
+    job["snapshot"] = _publish_store(store, job["workspace"], name, seed)
+    job["status"] = "completed"
+    job["progress"] = 100
+    job["message"] = f"{num:,} benzersiz kombinasyon oluşturuldu"
+
+
+async def generate_combinations_task(job_id: str, num: int, seed: Optional[int], name: str):
+    """Background task for combination generation"""
+    try:
+        await asyncio.to_thread(_run_generation_job, job_id, num, seed, name)
+    except Exception as e:
+        generation_jobs[job_id]["status"] = "error"
+        generation_jobs[job_id]["message"] = f"Hata: {str(e)}"
+    finally:
+        generation_jobs[job_id]["finished_at"] = datetime.now(timezone.utc).isoformat()
+
+
+@router.get("/jobs/{job_id}")
+async def get_generation_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Get background generation job progress"""
+    job = generation_jobs.get(job_id)
+    if not job or job["workspace"] != _workspace(current_user):
+        return {"status": "not_found", "progress": 0, "message": "Görev bulunamadı"}
+    
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_generation_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Request cancellation of a running generation job"""
+    job = generation_jobs.get(job_id)
+    if not job or job["workspace"] != _workspace(current_user):
+        raise HTTPException(status_code=404, detail="Görev bulunamadı")
+    
+    if job["status"] not in ("starting", "processing"):
+        raise HTTPException(status_code=400, detail="Görev zaten tamamlanmış")
+    
+    job["cancel_requested"] = True
+    return {"job_id": job_id, "message": "İptal isteği alındı"}
+
+
+@router.get("/snapshots")
+async def get_snapshots(name: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+    """List the caller's saved combination sets (newest version first)"""
+    workspace = _workspace(current_user)
+    return {
+        "active": _active_ref(workspace),
+        "snapshots": await asyncio.to_thread(list_snapshots, workspace, name),
+        "cache": {
+            "open_sets": len(SNAPSHOT_CACHE),
+            "nbytes": SNAPSHOT_CACHE.nbytes,
+            "budget_bytes": SNAPSHOT_CACHE.budget_bytes
+        }
+    }
+
+
+@router.post("/snapshots/activate")
+async def activate_snapshot(request: SnapshotActivateRequest, current_user: dict = Depends(get_current_user)):
+    """Make a saved set (latest version if none given) the active one for all workers"""
+    workspace = _workspace(current_user)
+    try:
+        _, meta = await asyncio.to_thread(load_snapshot, workspace, request.name, request.version)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Kombinasyon seti bulunamadı")
+    
+    set_active_snapshot(workspace, meta)
+    return {"snapshot": meta, "message": f"{meta['name']} v{meta['version']} yüklendi ({meta['count']:,} kombinasyon)"}
+
+
+@router.delete("/snapshots/{name}/{version}")
+async def remove_snapshot(name: str, version: int, current_user: dict = Depends(get_current_user)):
+    """Delete a saved set version (the active one cannot be deleted)"""
+    workspace = _workspace(current_user)
+    active = _active_ref(workspace)
+    if active and active["name"] == name and active["version"] == version:
+        raise HTTPException(status_code=400, detail="Aktif kombinasyon seti silinemez. Önce temizleyin.")
+    
+    if not delete_snapshot(workspace, name, version):
+        raise HTTPException(status_code=404, detail="Kombinasyon seti bulunamadı")
+    
+    return {"message": f"{name} v{version} silindi"}
+
+
 @router.post("/clear")
-async def clear_cache():
-    """Clear all combinations from cache"""
-    global COMBINATIONS_CACHE, UNIQUE_FIVES
-    count = len(COMBINATIONS_CACHE)
-    COMBINATIONS_CACHE.clear()
-    UNIQUE_FIVES.clear()
+async def clear_cache(current_user: dict = Depends(get_current_user)):
+    """Clear the caller's active combination set (saved snapshots are kept)"""
+    workspace = _workspace(current_user)
+    count = len(_current_store(workspace))
+    set_active_snapshot(workspace, None)
     return {
         "cleared_count": count,
         "message": f"{count:,} kombinasyon silindi. Önbellek temizlendi."
@@ -156,11 +416,11 @@ async def clear_cache():
 
 
 @router.post("/search", response_model=SearchResult)
-async def search_combination(request: SearchRequest):
+async def search_combination(request: SearchRequest, current_user: dict = Depends(get_current_user)):
     """Search for a combination in cache"""
-    global COMBINATIONS_CACHE
+    store = _current_store(_workspace(current_user))
     
-    if not COMBINATIONS_CACHE:
+    if not store:
         return {
             "found": False,
             "indices": [],
@@ -232,16 +492,13 @@ async def search_combination(request: SearchRequest):
         main_numbers.sort()
         target_combination = main_numbers + [bonus_number]
         
-        # Search in cache
-        found_indices = []
-        for idx, comb in COMBINATIONS_CACHE.items():
-            if comb == target_combination:
-                found_indices.append(idx)
+        # O(1) lookup through the rank index
+        found_indices = store.find(main_numbers, bonus_number)
         
-        if found_indices:
+        if found_indices.size:
             return {
                 "found": True,
-                "indices": found_indices[:100],  # Return max 100 results
+                "indices": found_indices[:100].tolist(),  # Return max 100 results
                 "combination": target_combination,
                 "message": f"Kombinasyon {len(found_indices)} kez bulundu!"
             }
@@ -274,14 +531,19 @@ class FilterResult(BaseModel):
     total_found: int
     results: List[CombinationItem]
     message: str
+    mode: Optional[str] = None
 
 
 @router.post("/filter", response_model=FilterResult)
-async def filter_combinations(request: FilterRequest):
-    """Filter combinations by main numbers and optional bonus"""
-    global COMBINATIONS_CACHE
+async def filter_combinations(request: FilterRequest, current_user: dict = Depends(get_current_user)):
+    """
+    Filter combinations by main numbers and optional bonus.
+    5 numbers: exact match through the rank index.
+    1-4 numbers: all rows containing every selected number (bitmap intersection).
+    """
+    store = _current_store(_workspace(current_user))
     
-    if not COMBINATIONS_CACHE:
+    if not store:
         return {
             "found": False,
             "total_found": 0,
@@ -293,12 +555,12 @@ async def filter_combinations(request: FilterRequest):
     bonus_number = request.bonus_number
     
     # Validate main numbers
-    if len(main_numbers) != 5:
+    if not 1 <= len(main_numbers) <= 5:
         return {
             "found": False,
             "total_found": 0,
             "results": [],
-            "message": "Tam olarak 5 ana sayı seçmelisiniz."
+            "message": "1 ile 5 arasında ana sayı seçmelisiniz."
         }
     
     if any(num < 1 or num > 34 for num in main_numbers):
@@ -309,7 +571,7 @@ async def filter_combinations(request: FilterRequest):
             "message": "Ana sayılar 1-34 arasında olmalıdır."
         }
     
-    if len(set(main_numbers)) != 5:
+    if len(set(main_numbers)) != len(main_numbers):
         return {
             "found": False,
             "total_found": 0,
@@ -326,43 +588,39 @@ async def filter_combinations(request: FilterRequest):
             "message": "Bonus sayı 1-14 arasında olmalıdır."
         }
     
-    # Sort main numbers for comparison
-    sorted_main = sorted(main_numbers)
-    
-    # Search in cache
-    found_results = []
-    for idx, comb in COMBINATIONS_CACHE.items():
-        comb_main = comb[:5]
-        comb_bonus = comb[5]
-        
-        # Check if main numbers match
-        if comb_main == sorted_main:
-            # If bonus specified, check it too
-            if bonus_number is None or comb_bonus == bonus_number:
-                found_results.append({
-                    "index": idx,
-                    "main_numbers": comb_main,
-                    "bonus_number": comb_bonus,
-                    "formatted": f"{comb_main[0]},{comb_main[1]},{comb_main[2]},{comb_main[3]},{comb_main[4]}+{comb_bonus}"
-                })
+    partial = len(main_numbers) < 5
+    if partial:
+        found_indices = store.find_containing(sorted(main_numbers), bonus_number)
+    else:
+        found_indices = store.find(main_numbers, bonus_number)
     
     # Limit results to 100
-    limited_results = found_results[:100]
-    
-    if found_results:
-        if bonus_number is None:
-            message = f"Seçilen 5 ana sayı ile {len(found_results)} kombinasyon bulundu (tüm bonus değerleri)"
+    limited_indices = found_indices[:100].tolist()
+    limited_results = [
+        _combination_item(idx, comb)
+        for idx, comb in zip(limited_indices, store.take(limited_indices))
+    ]
+    
+    if found_indices.size:
+        if partial:
+            numbers_str = ", ".join(str(num) for num in sorted(main_numbers))
+            message = f"{numbers_str} sayılarını içeren {found_indices.size:,} kombinasyon bulundu"
+        elif bonus_number is None:
+            message = f"Seçilen 5 ana sayı ile {found_indices.size} kombinasyon bulundu (tüm bonus değerleri)"
         else:
-            message = f"Kombinasyon {len(found_results)} kez bulundu!"
+            message = f"Kombinasyon {found_indices.size} kez bulundu!"
         
         return {
             "found": True,
-            "total_found": len(found_results),
+            "total_found": int(found_indices.size),
             "results": limited_results,
-            "message": message
+            "message": message,
+            "mode": "partial" if partial else "exact"
         }
     else:
-        if bonus_number is None:
+        if partial:
+            message = "Seçilen sayıların hepsini içeren kombinasyon bulunamadı."
+        elif bonus_number is None:
             message = "Bu ana sayılarla kombinasyon bulunamadı."
         else:
             message = "Bu kombinasyon bulunamadı."
@@ -371,123 +629,255 @@ async def filter_combinations(request: FilterRequest):
             "found": False,
             "total_found": 0,
             "results": [],
-            "message": message
+            "message": message,
+            "mode": "partial" if partial else "exact"
         }
 
 
 @router.get("/sample", response_model=List[CombinationItem])
-async def get_sample_combinations(count: int = 5):
+async def get_sample_combinations(count: int = 5, current_user: dict = Depends(get_current_user)):
     """Get random sample of combinations"""
-    global COMBINATIONS_CACHE
+    store = _current_store(_workspace(current_user))
     
-    if not COMBINATIONS_CACHE:
+    if not store:
         return []
     
-    sample_count = min(count, len(COMBINATIONS_CACHE))
-    sample_indices = random.sample(list(COMBINATIONS_CACHE.keys()), sample_count)
+    sample_count = min(count, len(store))
+    sample_indices = sorted(random.sample(range(1, len(store) + 1), sample_count))
     
-    results = []
-    for idx in sorted(sample_indices):
-        comb = COMBINATIONS_CACHE[idx]
-        results.append({
-            "index": idx,
-            "main_numbers": comb[:5],
-            "bonus_number": comb[5],
-            "formatted": f"{comb[0]},{comb[1]},{comb[2]},{comb[3]},{comb[4]}+{comb[5]}"
-        })
-    
-    return results
+    return [
+        _combination_item(idx, comb)
+        for idx, comb in zip(sample_indices, store.take(sample_indices))
+    ]
 
 
 @router.get("/combination/{index}", response_model=CombinationItem)
-async def get_combination(index: int):
+async def get_combination(index: int, current_user: dict = Depends(get_current_user)):
     """Get a specific combination by index"""
-    global COMBINATIONS_CACHE
+    store = _current_store(_workspace(current_user))
     
-    if index not in COMBINATIONS_CACHE:
+    if not store.has_index(index):
         raise HTTPException(
             status_code=404, 
-            detail=f"{index}. kombinasyon bulunamadı! Lütfen 1-{len(COMBINATIONS_CACHE)} arasında bir sayı girin."
+            detail=f"{index}. kombinasyon bulunamadı! Lütfen 1-{len(store)} arasında bir sayı girin."
         )
     
-    comb = COMBINATIONS_CACHE[index]
+    return _combination_item(index, store.get(index))
+
+
+@router.get("/range")
+async def get_combination_range(
+    start: int = 1,
+    limit: int = RANGE_DEFAULT_LIMIT,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    A window of the active set for virtual scrolling.
+    Rows are returned as compact [n1, n2, n3, n4, n5, bonus] arrays, the
+    first one being combination number `start` (1-based).
+    """
+    workspace = _workspace(current_user)
+    store = _current_store(workspace)
+    total = len(store)
+    
+    if start < 1:
+        raise HTTPException(status_code=400, detail="Başlangıç sırası 1 veya daha büyük olmalıdır!")
+    if limit < 1 or limit > RANGE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"Limit 1-{RANGE_MAX_LIMIT} arasında olmalıdır!")
+    
+    rows = store.rows[start - 1:start - 1 + limit].tolist()
+    end = start + len(rows)
     return {
-        "index": index,
-        "main_numbers": comb[:5],
-        "bonus_number": comb[5],
-        "formatted": f"{comb[0]},{comb[1]},{comb[2]},{comb[3]},{comb[4]}+{comb[5]}"
+        "start": start,
+        "count": len(rows),
+        "total": total,
+        "next_start": end if end <= total else None,
+        "snapshot": _active_ref(workspace),
+        "rows": rows
     }
 
 
-@router.get("/export-excel")
-async def export_to_excel():
-    """Export all combinations to Excel file"""
-    global COMBINATIONS_CACHE
+def _encode_cursor(name: str, version: int, offset: int) -> str:
+    """Opaque stream cursor pinned to one snapshot version"""
+    return base64.urlsafe_b64encode(f"{name}:{version}:{offset}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, version, offset = base64.urlsafe_b64decode(padded).decode().rsplit(":", 2)
+        version, offset = int(version), int(offset)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Geçersiz imleç (cursor)!")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Geçersiz imleç (cursor)!")
+    return name, version, offset
+
+
+def _iter_combinations_ndjson(store: CombinationStore, start: int, end: int):
+    """Yield [index, n1..n5, bonus] lines for rows start..end-1 (0-based), chunk by chunk"""
+    for chunk_start in range(start, end, STREAM_CHUNK_SIZE):
+        chunk = store.rows[chunk_start:min(chunk_start + STREAM_CHUNK_SIZE, end)].tolist()
+        yield "".join(
+            f"[{index},{c[0]},{c[1]},{c[2]},{c[3]},{c[4]},{c[5]}]\n"
+            for index, c in enumerate(chunk, chunk_start + 1)
+        ).encode("utf-8")
+
+
+@router.get("/stream")
+async def stream_combinations(
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream the active set as NDJSON, one [index, n1..n5, bonus] array per line.
+    Without a cursor the stream starts at the first row of the active set;
+    the X-Next-Cursor header continues where this response stops. A cursor
+    stays bound to its snapshot version, so paging is stable even if a new
+    set is generated meanwhile.
+    """
+    workspace = _workspace(current_user)
     
-    if not COMBINATIONS_CACHE:
-        raise HTTPException(status_code=400, detail="Önce kombinasyon oluşturmanız gerekiyor!")
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="Limit 1 veya daha büyük olmalıdır!")
+    
+    if cursor:
+        name, version, offset = _decode_cursor(cursor)
+        try:
+            store = load_snapshot(workspace, name, version)[0]
+        except FileNotFoundError:
+            raise HTTPException(status_code=410, detail="İmlecin ait olduğu kombinasyon seti artık mevcut değil!")
+    else:
+        ref = _active_ref(workspace)
+        if not ref:
+            raise HTTPException(status_code=400, detail="Önce kombinasyon oluşturmanız gerekiyor!")
+        name, version, offset = ref["name"], ref["version"], 0
+        store = _current_store(workspace)
+    
+    total = len(store)
+    start = min(offset, total)
+    end = total if limit is None else min(start + limit, total)
+    
+    headers = {
+        "X-Total-Count": str(total),
+        "X-Snapshot": f"{name}:{version}"
+    }
+    if end < total:
+        headers["X-Next-Cursor"] = _encode_cursor(name, version, end)
     
-    # Create workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Kombinasyonlar"
-    
-    # Styles
-    header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
-    header_font = Font(name="Arial", size=11, bold=True, color="FFFFFF")
-    cell_font = Font(name="Arial", size=10)
-    center_align = Alignment(horizontal="center", vertical="center")
-    thin_border = Border(
+    return StreamingResponse(
+        _iter_combinations_ndjson(store, start, end),
+        media_type="application/x-ndjson",
+        headers=headers
+    )
+
+
+def _write_combinations_xlsx(store: CombinationStore, path: str):
+    """
+    Write every combination to an .xlsx file in openpyxl write-only mode.
+    Rows are streamed to disk in chunks, so memory stays flat; a new sheet
+    is started each time the 1,048,576-row Excel limit is reached.
+    """
+    wb = Workbook(write_only=True)
+    
+    header_style = NamedStyle(name="kombinasyon_baslik")
+    header_style.fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
+    header_style.font = Font(name="Arial", size=11, bold=True, color="FFFFFF")
+    header_style.alignment = Alignment(horizontal="center", vertical="center")
+    header_style.border = Border(
         left=Side(style='thin'),
         right=Side(style='thin'),
         top=Side(style='thin'),
         bottom=Side(style='thin')
     )
-    
-    # Headers
-    headers = ["Sıra", "Sayı 1", "Sayı 2", "Sayı 3", "Sayı 4", "Sayı 5", "Bonus", "Format"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_align
-        cell.border = thin_border
-    
-    # Data - limit to first 100000 for performance
-    max_rows = min(100000, len(COMBINATIONS_CACHE))
-    sorted_keys = sorted(COMBINATIONS_CACHE.keys())[:max_rows]
-    
-    for row_idx, key in enumerate(sorted_keys, 2):
-        comb = COMBINATIONS_CACHE[key]
-        row_data = [
-            key,
-            comb[0], comb[1], comb[2], comb[3], comb[4],
-            comb[5],
-            f"{comb[0]},{comb[1]},{comb[2]},{comb[3]},{comb[4]}+{comb[5]}"
-        ]
-        for col, value in enumerate(row_data, 1):
-            cell = ws.cell(row=row_idx, column=col, value=value)
-            cell.font = cell_font
-            cell.alignment = center_align
-            cell.border = thin_border
-    
-    # Auto-width columns
-    for col in range(1, len(headers) + 1):
+    wb.add_named_style(header_style)
+    
+    ws = None
+    sheet_rows = EXCEL_MAX_ROWS
+    for start in range(0, len(store), EXPORT_CHUNK_SIZE):
+        chunk = store.rows[start:start + EXPORT_CHUNK_SIZE].tolist()
+        for index, comb in enumerate(chunk, start + 1):
+            if sheet_rows >= EXCEL_MAX_ROWS:
+                ws = _new_export_sheet(wb, len(wb.worksheets) + 1)
+                sheet_rows = 1
+            ws.append([index, *comb, format_combination(comb)])
+            sheet_rows += 1
+    
+    wb.save(path)
+
+
+def _new_export_sheet(wb: Workbook, number: int):
+    """Create an export sheet with widths, frozen header and styled header row"""
+    ws = wb.create_sheet("Kombinasyonlar" if number == 1 else f"Kombinasyonlar {number}")
+    for col in range(1, len(EXPORT_HEADERS) + 1):
         ws.column_dimensions[get_column_letter(col)].width = 12
     ws.column_dimensions['H'].width = 20  # Format column wider
-    
-    # Freeze header row
     ws.freeze_panes = 'A2'
     
-    # Save to bytes
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
+    header_row = []
+    for header in EXPORT_HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.style = "kombinasyon_baslik"
+        header_row.append(cell)
+    ws.append(header_row)
+    return ws
+
+
+def _iter_combinations_csv(store: CombinationStore):
+    """Yield the combinations as CSV text, one chunk of rows at a time"""
+    yield ";".join(EXPORT_HEADERS) + "\n"
+    for start in range(0, len(store), EXPORT_CHUNK_SIZE):
+        chunk = store.rows[start:start + EXPORT_CHUNK_SIZE].tolist()
+        yield "".join(
+            f"{index};{c[0]};{c[1]};{c[2]};{c[3]};{c[4]};{c[5]};{format_combination(c)}\n"
+            for index, c in enumerate(chunk, start + 1)
+        )
+
+
+@router.get("/export-excel")
+async def export_to_excel(format: str = "xlsx", current_user: dict = Depends(get_current_user)):
+    """
+    Export all combinations (no row cap).
+    format=xlsx: write-only workbook, split into sheets at the Excel row limit
+    format=csv: streamed CSV (';' separated, UTF-8 with BOM for Excel)
+    """
+    store = _current_store(_workspace(current_user))
+    
+    if not store:
+        raise HTTPException(status_code=400, detail="Önce kombinasyon oluşturmanız gerekiyor!")
+    
+    if format not in ("xlsx", "csv"):
+        raise HTTPException(status_code=400, detail="Geçersiz format! xlsx veya csv seçilmelidir.")
+    
+    filename = f"sans_topu_kombinasyonlari_{len(store)}.{format}"
+    
+    if format == "csv":
+        def iter_csv():
+            yield "\ufeff".encode("utf-8")
+            for text in _iter_combinations_csv(store):
+                yield text.encode("utf-8")
+        
+        return StreamingResponse(
+            iter_csv(),
+            media_type="text/csv; charset=utf-8",
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}"
+            }
+        )
     
-    filename = f"sans_topu_kombinasyonlari_{len(COMBINATIONS_CACHE)}.xlsx"
+    # The zip container needs a seekable target, so the workbook is spooled
+    # to a temp file in a worker thread and then streamed from disk
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        await asyncio.to_thread(_write_combinations_xlsx, store, path)
+    except Exception:
+        os.remove(path)
+        raise
     
     return StreamingResponse(
-        output,
+        iter_file_and_remove(path),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={
             "Content-Disposition": f"attachment; filename={filename}"
@@ -5,15 +5,19 @@ from datetime import datetime, timezone
 import io
 import uuid
 
-from openpyxl import Workbook, load_workbook
+from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 
 from models.makine import Makine, MakineCreate, MakineUpdate
 from routers.auth import get_current_user
 from database import db
+from indexes import register_index
+from excel_import import ExcelImporter, register_importer, run_import, cell_text, row_error, insert_rows
 
 router = APIRouter(prefix="/makineler", tags=["Makineler"])
 
+register_index("makineler", "plaka_seri_no")
+
 @router.get("", response_model=List[Makine])
 async def get_makineler(current_user: dict = Depends(get_current_user)):
     """Tüm makineleri listele"""
@@ -218,104 +222,90 @@ async def download_makine_template():
         headers={"Content-Disposition": "attachment; filename=makine_sablonu.xlsx"}
     )
 
+MAKINE_IMPORT_COLUMNS = [
+    "makine_turu", "firma", "plaka_seri_no", "sasi_motor_no", "imalat_yili",
+    "servis_bakim_tarihi", "sigorta_tarihi", "periyodik_kontrol_tarihi", "ruhsat_muayene_tarihi",
+    "operator_adi", "operator_belge_tarihi", "belge_kurumu", "telefon", "durum", "aciklama"
+]
+
+
+async def _registered_plakalar(plakalar: List[str]) -> set:
+    """The given plaka/seri numbers that are already registered (one $in query)"""
+    if not plakalar:
+        return set()
+    cursor = db.makineler.find({"plaka_seri_no": {"$in": plakalar}}, {"_id": 0, "plaka_seri_no": 1})
+    return {makine["plaka_seri_no"] async for makine in cursor}
+
+
+async def _validate_makine_rows(batch: List[tuple], context: dict, state: dict):
+    """Required fields, then plaka/seri no checked against the database (per batch) and earlier rows of the file"""
+    seen = state.setdefault("plakalar", set())
+    rows, errors = [], []
+    for row_idx, row in batch:
+        fields = {name: cell_text(row, index) for index, name in enumerate(MAKINE_IMPORT_COLUMNS)}
+        if not fields["makine_turu"] or not fields["firma"]:
+            errors.append(row_error(row_idx, "makine_turu", "Zorunlu alanlar eksik (Makine Türü, Firma)"))
+            continue
+        fields["plaka_seri_no"] = fields["plaka_seri_no"] or ""
+        fields["durum"] = fields["durum"] or "Aktif"
+        rows.append((row_idx, fields))
+    
+    registered = await _registered_plakalar([fields["plaka_seri_no"] for _, fields in rows if fields["plaka_seri_no"]])
+    valid = []
+    for row_idx, fields in rows:
+        plaka_seri_no = fields["plaka_seri_no"]
+        if plaka_seri_no:
+            if plaka_seri_no in registered or plaka_seri_no in seen:
+                errors.append(row_error(row_idx, "plaka_seri_no", f"Bu plaka/seri numarası zaten kayıtlı - '{plaka_seri_no}'"))
+                continue
+            seen.add(plaka_seri_no)
+        valid.append((row_idx, fields))
+    return valid, errors, 0
+
+
+async def _commit_makineler(valid: List[tuple], context: dict, errors: List[dict]) -> int:
+    # A previewed file may be committed later: plakas registered in the meantime are rejected
+    registered = await _registered_plakalar([fields["plaka_seri_no"] for _, fields in valid if fields["plaka_seri_no"]])
+    now = datetime.now(timezone.utc).isoformat()
+    docs, rows = [], []
+    for row_idx, fields in valid:
+        if fields["plaka_seri_no"] in registered:
+            errors.append(row_error(row_idx, "plaka_seri_no", f"Bu plaka/seri numarası zaten kayıtlı - '{fields['plaka_seri_no']}'"))
+            continue
+        docs.append({
+            "id": str(uuid.uuid4()),
+            "proje_id": context["proje_id"],
+            "proje_adi": context["proje_adi"],
+            **fields,
+            "created_at": now,
+            "updated_at": now
+        })
+        rows.append(row_idx)
+    return await insert_rows(db.makineler, docs, rows, errors)
+
+
+register_importer("makineler", ExcelImporter(
+    label="makine",
+    roles=("admin", "inspector"),
+    validate=_validate_makine_rows,
+    commit=_commit_makineler
+))
+
+
 @router.post("/excel/import")
 async def import_makineler_excel(
     file: UploadFile = File(...),
     proje_id: str = Form(...),
+    dry_run: bool = Form(False),
     current_user: dict = Depends(get_current_user)
 ):
-    """Excel'den toplu makine içe aktar"""
+    """Excel'den toplu makine içe aktar (dry_run ile önce önizleme, sonra /excel/import/{token}/commit)"""
     if current_user["role"] not in ["admin", "inspector"]:
         raise HTTPException(status_code=403, detail="Excel içe aktarma yetkiniz yok")
     
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Sadece Excel dosyaları yüklenebilir")
-    
     proje = await db.projeler.find_one({"id": proje_id}, {"_id": 0})
     if not proje:
         raise HTTPException(status_code=404, detail="Proje bulunamadı")
     
-    proje_adi = proje.get("proje_adi", "")
-    
-    content = await file.read()
-    excel_file = io.BytesIO(content)
-    
-    try:
-        wb = load_workbook(excel_file)
-        ws = wb.active
-        
-        imported_count = 0
-        errors = []
-        
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
-            if not any(row):
-                continue
-            
-            try:
-                def get_cell(index):
-                    return row[index] if index < len(row) and row[index] is not None else None
-                
-                makine_turu = str(get_cell(0)) if get_cell(0) else ""
-                firma = str(get_cell(1)) if get_cell(1) else ""
-                plaka_seri_no = str(get_cell(2)) if get_cell(2) else ""
-                sasi_motor_no = str(get_cell(3)) if get_cell(3) else None
-                imalat_yili = str(get_cell(4)) if get_cell(4) else None
-                servis_bakim_tarihi = str(get_cell(5)) if get_cell(5) else None
-                sigorta_tarihi = str(get_cell(6)) if get_cell(6) else None
-                periyodik_kontrol_tarihi = str(get_cell(7)) if get_cell(7) else None
-                ruhsat_muayene_tarihi = str(get_cell(8)) if get_cell(8) else None
-                operator_adi = str(get_cell(9)) if get_cell(9) else None
-                operator_belge_tarihi = str(get_cell(10)) if get_cell(10) else None
-                belge_kurumu = str(get_cell(11)) if get_cell(11) else None
-                telefon = str(get_cell(12)) if get_cell(12) else None
-                durum = str(get_cell(13)) if get_cell(13) else "Aktif"
-                aciklama = str(get_cell(14)) if get_cell(14) else None
-                
-                if not makine_turu or not firma:
-                    errors.append(f"Satır {row_idx}: Zorunlu alanlar eksik (Makine Türü, Firma)")
-                    continue
-                
-                # Plaka kontrolü (eğer varsa)
-                if plaka_seri_no:
-                    existing = await db.makineler.find_one({"plaka_seri_no": plaka_seri_no})
-                    if existing:
-                        errors.append(f"Satır {row_idx}: Bu plaka/seri numarası zaten kayıtlı - '{plaka_seri_no}'")
-                        continue
-                
-                makine_data = {
-                    "id": str(uuid.uuid4()),
-                    "proje_id": proje_id,
-                    "proje_adi": proje_adi,
-                    "makine_turu": makine_turu,
-                    "firma": firma,
-                    "plaka_seri_no": plaka_seri_no,
-                    "sasi_motor_no": sasi_motor_no,
-                    "imalat_yili": imalat_yili,
-                    "servis_bakim_tarihi": servis_bakim_tarihi,
-                    "sigorta_tarihi": sigorta_tarihi,
-                    "periyodik_kontrol_tarihi": periyodik_kontrol_tarihi,
-                    "ruhsat_muayene_tarihi": ruhsat_muayene_tarihi,
-                    "operator_adi": operator_adi,
-                    "operator_belge_tarihi": operator_belge_tarihi,
-                    "belge_kurumu": belge_kurumu,
-                    "telefon": telefon,
-                    "durum": durum,
-                    "aciklama": aciklama,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
-                
-                await db.makineler.insert_one(makine_data)
-                imported_count += 1
-                
-            except Exception as e:
-                errors.append(f"Satır {row_idx}: {str(e)}")
-        
-        return {
-            "message": f"{imported_count} makine başarıyla içe aktarıldı",
-            "imported_count": imported_count,
-            "errors": errors
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Excel işleme hatası: {str(e)}")
+    context = {"proje_id": proje_id, "proje_adi": proje.get("proje_adi", "")}
+    return await run_import("makineler", file, context, current_user, dry_run)
@@ -13,10 +13,15 @@ import io
 import uuid
 
 from database import db
+from indexes import register_index
 from routers.auth import get_current_user
 
 router = APIRouter(prefix="/metraj", tags=["Metraj Cetveli"])
 
+register_index("metraj_cetvelleri", "id", unique=True)
+register_index("metraj_cetvelleri", "proje_id")
+register_index("metraj_cetvelleri", "rapor_id")
+
 
 # ==================== MODELS ====================
 
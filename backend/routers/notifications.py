@@ -5,9 +5,14 @@ from datetime import datetime, timezone
 from models import Notification, NotificationType, FeedbackCreate, AdminMessageCreate
 from routers.auth import get_current_user
 from database import db
+from indexes import register_index
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
+register_index("notifications", "id", unique=True)
+register_index("notifications", [("recipient_id", 1), ("created_at", -1)])
+register_index("notifications", [("recipient_id", 1), ("is_read", 1)])
+
 
 @router.get("")
 async def get_my_notifications(current_user: dict = Depends(get_current_user)):
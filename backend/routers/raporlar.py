@@ -1,25 +1,67 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Request, Query, BackgroundTasks
 from fastapi.responses import StreamingResponse, Response
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, TypeAdapter
+from typing import List, Literal, Optional
 from datetime import datetime, timezone
 from pathlib import Path
 import io
 import os
+import json
+import re
+import uuid
+import base64
+import asyncio
+import secrets
+import socket
 import zipfile
-import shutil
 import tempfile
+import time
+import unicodedata
+from urllib.parse import quote
 import qrcode
 from qrcode.constants import ERROR_CORRECT_M
 
 from models import Rapor, RaporCreate, RaporUpdate
 from routers.auth import get_current_user
 from database import db
+from indexes import register_index
+from medya import delete_medya, medya_by_rapor
+from rapor_search import SEARCH_FIELD, rank, search_fields, search_filter
+from zip_stream import ZipEntry, iter_zip, safe_name, unique_arcname, write_entries
 from utils import generate_rapor_no
 from constants import SEHIRLER
 
 router = APIRouter(prefix="/raporlar", tags=["Raporlar"])
 
+register_index("raporlar", "id", unique=True)
+register_index("raporlar", "rapor_no", unique=True)
+register_index("raporlar", "kategori")
+register_index("raporlar", "created_at")
+register_index("raporlar", "gecerlilik_tarihi")
+register_index("raporlar", "uygunluk")
+register_index("raporlar", [("created_at", -1)])  # Descending for latest first
+register_index("raporlar", [("created_at", -1), ("id", -1)])  # Keyset pagination
+register_index("raporlar", [("proje_id", 1), ("created_at", -1), ("id", -1)])
+register_index("raporlar", [("firma", 1), ("created_at", -1), ("id", -1)])
+register_index("raporlar", SEARCH_FIELD)
+register_index("raporlar", [("proje_id", 1), ("kategori", 1), ("rapor_no", 1)])  # Project ZIP export order
+
+RAPOR_LIST_MAX_LIMIT = 5000
+SEARCH_CANDIDATE_LIMIT = 1000
+
+# Project ZIP exports run as background jobs spooled to disk; each job's
+# state is a {job_id}.json next to its archive, so every worker can serve it
+PROJE_EXPORT_DIR = Path(tempfile.gettempdir()) / "ekos_proje_exports"
+PROJE_EXPORT_JOB_ID = re.compile(r"^pzip_[0-9a-f]{12}$")
+PROJE_EXPORT_BATCH_SIZE = 200
+MAX_FINISHED_EXPORT_JOBS = 20
+PROJE_EXPORT_TTL_SECONDS = 24 * 60 * 60  # files left behind by a restart
+# A running job saves its state after every batch; one silent for this long is dead
+PROJE_EXPORT_STALE_SECONDS = 15 * 60
+# host:pid:boot of this process, recorded as the owner of the jobs it runs
+PROJE_EXPORT_WORKER = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 # ZIP Export Request Model
 class ZipExportRequest(BaseModel):
     rapor_ids: List[str]
@@ -49,18 +91,15 @@ class RaporMigration(BaseModel):
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
-@router.get("", response_model=List[Rapor])
-async def get_raporlar(
+def _rapor_list_query(
+    current_user: dict,
     arama: Optional[str] = None,
     kategori: Optional[str] = None,
     periyot: Optional[str] = None,
     uygunluk: Optional[str] = None,
     firma: Optional[str] = None,
-    proje_id: Optional[str] = None,
-    limit: int = 500,
-    skip: int = 0,
-    current_user: dict = Depends(get_current_user)
-):
+    proje_id: Optional[str] = None
+) -> dict:
     query = {}
     
     # Proje filtresi - en öncelikli
@@ -73,22 +112,8 @@ async def get_raporlar(
     elif firma:
         query["firma"] = firma
     
-    if arama:
-        if user_firma and current_user.get("role") == "viewer":
-            query["$and"] = [
-                {"firma": user_firma},
-                {"$or": [
-                    {"rapor_no": {"$regex": arama, "$options": "i"}},
-                    {"ekipman_adi": {"$regex": arama, "$options": "i"}},
-                    {"firma": {"$regex": arama, "$options": "i"}}
-                ]}
-            ]
-        else:
-            query["$or"] = [
-                {"rapor_no": {"$regex": arama, "$options": "i"}},
-                {"ekipman_adi": {"$regex": arama, "$options": "i"}},
-                {"firma": {"$regex": arama, "$options": "i"}}
-            ]
+    # Prefix search over the indexed, Turkish-folded tokens of rapor_no / ekipman_adi / firma
+    query.update(search_filter(arama))
     
     if kategori:
         query["kategori"] = kategori
@@ -99,18 +124,155 @@ async def get_raporlar(
     if uygunluk:
         query["uygunluk"] = uygunluk
     
-    raporlar = await db.raporlar.find(query, {"_id": 0}).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
-    
+    return query
+
+
+def _encode_rapor_cursor(created_at, rapor_id: str) -> str:
+    """Opaque cursor for the last row of a page: its (created_at, id) sort key"""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([created_at, rapor_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_rapor_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, rapor_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Geçersiz imleç (cursor)")
+    if not isinstance(created_at, str) or not isinstance(rapor_id, str):
+        raise HTTPException(status_code=400, detail="Geçersiz imleç (cursor)")
+    return created_at, rapor_id
+
+
+def _rapor_list_projection(fields: Optional[str]) -> dict:
+    """
+    Projection for the list endpoint. Without `fields` every Rapor field is
+    returned; otherwise only the requested ones plus the sort key (id, created_at).
+    """
+    if not fields:
+        return {"_id": 0, **{name: 1 for name in Rapor.model_fields}}
+    
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(Rapor.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Geçersiz alan(lar): {', '.join(sorted(unknown))}")
+    return {"_id": 0, "id": 1, "created_at": 1, **{name: 1 for name in requested}}
+
+
+# Rows leave the list endpoints in the Rapor model's JSON form (as response_model=List[Rapor] did)
+_RAPOR_LIST_ADAPTER = TypeAdapter(List[Rapor])
+_DATETIME_ADAPTER = TypeAdapter(datetime)
+
+
+def _serialize_rapor_list(raporlar: List[dict], fields: Optional[str]) -> List[dict]:
+    """
+    Full rows are validated and dumped through Rapor (defaults, datetime
+    format). Projected rows cannot be validated as a whole; their timestamps
+    get the same format.
+    """
     for rapor in raporlar:
-        if isinstance(rapor['created_at'], str):
-            rapor['created_at'] = datetime.fromisoformat(rapor['created_at'])
-        if isinstance(rapor['updated_at'], str):
-            rapor['updated_at'] = datetime.fromisoformat(rapor['updated_at'])
-        if 'created_by_username' not in rapor or not rapor['created_by_username']:
-            rapor['created_by_username'] = 'Bilinmiyor'
-    
+        if "created_by_username" in rapor or not fields:
+            if not rapor.get("created_by_username"):
+                rapor["created_by_username"] = "Bilinmiyor"
+    if not fields:
+        return _RAPOR_LIST_ADAPTER.dump_python(_RAPOR_LIST_ADAPTER.validate_python(raporlar), mode="json")
+    for rapor in raporlar:
+        for key in ("created_at", "updated_at"):
+            if rapor.get(key) is not None:
+                rapor[key] = _DATETIME_ADAPTER.dump_python(_DATETIME_ADAPTER.validate_python(rapor[key]), mode="json")
     return raporlar
 
+
+@router.get("")
+async def get_raporlar(
+    response: Response,
+    arama: Optional[str] = None,
+    kategori: Optional[str] = None,
+    periyot: Optional[str] = None,
+    uygunluk: Optional[str] = None,
+    firma: Optional[str] = None,
+    proje_id: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=RAPOR_LIST_MAX_LIMIT),
+    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    total: Optional[Literal["estimated", "exact"]] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Raporları listele (sayfalı).
+    Keyset pagination on (created_at, id), newest first: pass the X-Next-Cursor
+    header of a page as `cursor` to get the next one (`skip` is kept for old
+    callers). `fields` is a comma separated projection (e.g. id,rapor_no,firma).
+    `total=exact` counts the matching reports, `total=estimated` uses the
+    collection metadata when there is no filter; either is sent as X-Total-Count.
+    """
+    query = _rapor_list_query(current_user, arama, kategori, periyot, uygunluk, firma, proje_id)
+    projection = _rapor_list_projection(fields)
+    
+    if total == "exact" or (total == "estimated" and query):
+        response.headers["X-Total-Count"] = str(await db.raporlar.count_documents(query))
+    elif total == "estimated":
+        response.headers["X-Total-Count"] = str(await db.raporlar.estimated_document_count())
+    
+    page_query = query
+    if cursor:
+        created_at, rapor_id = _decode_rapor_cursor(cursor)
+        after = {"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": rapor_id}}
+        ]}
+        page_query = {"$and": [query, after]} if query else after
+    
+    find = db.raporlar.find(page_query, projection).sort([("created_at", -1), ("id", -1)])
+    if skip and not cursor:
+        find = find.skip(skip)
+    raporlar = await find.limit(limit).to_list(limit)
+    
+    if fields and "durum" in projection:
+        for rapor in raporlar:
+            rapor.setdefault("durum", "Aktif")
+    
+    if len(raporlar) == limit:
+        last = raporlar[-1]
+        response.headers["X-Next-Cursor"] = _encode_rapor_cursor(last.get("created_at"), last["id"])
+    
+    return _serialize_rapor_list(raporlar, fields)
+
+@router.get("/search")
+async def search_raporlar(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Rapor ara (alaka sırasına göre).
+    Matches reports whose rapor_no / ekipman_adi / firma words start with every
+    word of `q` (Turkish letters folded, so 'iskele' finds 'İSKELE'), then ranks
+    the newest SEARCH_CANDIDATE_LIMIT matches.
+    """
+    query = _rapor_list_query(current_user, arama=q)
+    if SEARCH_FIELD not in query:
+        return []
+    
+    projection = _rapor_list_projection(fields)
+    ranking_projection = {**projection, "rapor_no": 1, "ekipman_adi": 1, "firma": 1}
+    candidates = await db.raporlar.find(query, ranking_projection).sort(
+        [("created_at", -1), ("id", -1)]
+    ).limit(SEARCH_CANDIDATE_LIMIT).to_list(SEARCH_CANDIDATE_LIMIT)
+    
+    # sort is stable: equal scores keep the newest-first order
+    candidates.sort(key=lambda rapor: rank(rapor, q), reverse=True)
+    results = candidates[:limit]
+    
+    if fields:
+        requested = set(projection)
+        results = [{k: v for k, v in rapor.items() if k in requested} for rapor in results]
+    return _serialize_rapor_list(results, fields)
+
 @router.get("/{rapor_id}", response_model=Rapor)
 async def get_rapor(rapor_id: str, current_user: dict = Depends(get_current_user)):
     rapor = await db.raporlar.find_one({"id": rapor_id}, {"_id": 0})
@@ -165,6 +327,7 @@ async def create_rapor(rapor_create: RaporCreate, current_user: dict = Depends(g
     doc = rapor.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
     doc['updated_at'] = doc['updated_at'].isoformat()
+    doc.update(search_fields(doc))
     await db.raporlar.insert_one(doc)
     
     return rapor
@@ -184,6 +347,7 @@ async def update_rapor(
     
     update_data = {k: v for k, v in rapor_update.model_dump().items() if v is not None}
     update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+    update_data.update(search_fields({**rapor, **update_data}))
     
     await db.raporlar.update_one({"id": rapor_id}, {"$set": update_data})
     
@@ -200,13 +364,7 @@ async def delete_rapor(rapor_id: str, current_user: dict = Depends(get_current_u
     if current_user["role"] not in ["admin", "inspector"]:
         raise HTTPException(status_code=403, detail="Rapor silme yetkiniz yok")
     
-    dosyalar = await db.medya_dosyalari.find({"rapor_id": rapor_id}, {"_id": 0}).to_list(100)
-    for dosya in dosyalar:
-        dosya_path = Path(dosya["dosya_yolu"])
-        if dosya_path.exists():
-            dosya_path.unlink()
-    
-    await db.medya_dosyalari.delete_many({"rapor_id": rapor_id})
+    await delete_medya([rapor_id])
     
     result = await db.raporlar.delete_one({"id": rapor_id})
     if result.deleted_count == 0:
@@ -237,17 +395,62 @@ async def bulk_delete_raporlar(rapor_ids: List[str], current_user: dict = Depend
     if current_user["role"] not in ["admin", "inspector"]:
         raise HTTPException(status_code=403, detail="Rapor silme yetkiniz yok")
     
-    for rapor_id in rapor_ids:
-        dosyalar = await db.medya_dosyalari.find({"rapor_id": rapor_id}, {"_id": 0}).to_list(100)
-        for dosya in dosyalar:
-            dosya_path = Path(dosya["dosya_yolu"])
-            if dosya_path.exists():
-                dosya_path.unlink()
-        await db.medya_dosyalari.delete_many({"rapor_id": rapor_id})
+    await delete_medya(rapor_ids)
     
     result = await db.raporlar.delete_many({"id": {"$in": rapor_ids}})
     return {"message": f"{result.deleted_count} rapor silindi", "deleted_count": result.deleted_count}
 
+def _rapor_bilgi_text(rapor: dict, footer: bool = True) -> str:
+    """bilgi.txt placed in each report folder of the ZIP exports"""
+    content = f"""╔══════════════════════════════════════════════════════════════╗
+║                    RAPOR BİLGİLERİ                           ║
+╚══════════════════════════════════════════════════════════════╝
+
+📋 Rapor No        : {rapor.get('rapor_no', 'Belirtilmemiş')}
+📅 Oluşturma Tarihi: {rapor.get('created_at', 'Belirtilmemiş')[:10] if rapor.get('created_at') else 'Belirtilmemiş'}
+🏢 Firma           : {rapor.get('firma', 'Belirtilmemiş')}
+🔧 Ekipman Adı     : {rapor.get('ekipman_adi', 'Belirtilmemiş')}
+📂 Kategori        : {rapor.get('kategori', 'Belirtilmemiş')}
+📁 Alt Kategori    : {rapor.get('alt_kategori', 'Belirtilmemiş')}
+📍 Lokasyon        : {rapor.get('lokasyon', 'Belirtilmemiş')}
+🏭 Marka/Model     : {rapor.get('marka_model', 'Belirtilmemiş')}
+🔢 Seri No         : {rapor.get('seri_no', 'Belirtilmemiş')}
+⏱️ Periyot         : {rapor.get('periyot', 'Belirtilmemiş')}
+📅 Geçerlilik      : {rapor.get('gecerlilik_tarihi', 'Belirtilmemiş')}
+✅ Uygunluk        : {rapor.get('uygunluk', 'Belirtilmemiş')}
+🏙️ Şehir           : {rapor.get('sehir', 'Belirtilmemiş')}
+📝 Proje           : {rapor.get('proje_adi', 'Belirtilmemiş')}
+👤 Oluşturan       : {rapor.get('created_by_username', 'Belirtilmemiş')}
+📊 Durum           : {rapor.get('durum', 'Aktif')}
+
+═══════════════════════════════════════════════════════════════
+📝 AÇIKLAMA:
+───────────────────────────────────────────────────────────────
+{rapor.get('aciklama', 'Açıklama bulunmamaktadır.')}
+═══════════════════════════════════════════════════════════════
+"""
+    if footer:
+        content += f"""
+Bu dosya EKOS - Ekipman Kontrol Otomasyon Sistemi tarafından 
+otomatik olarak oluşturulmuştur.
+Tarih: {datetime.now(timezone.utc).strftime('%d.%m.%Y %H:%M:%S')} UTC
+"""
+    return content
+
+
+def _rapor_zip_entries(rapor: dict, rapor_folder: str, dosyalar: List[dict], used: set, footer: bool = True) -> List[ZipEntry]:
+    """bilgi.txt and the media files of one report, under rapor_folder"""
+    entries = [ZipEntry(unique_arcname(f"{rapor_folder}/bilgi.txt", used), text=_rapor_bilgi_text(rapor, footer))]
+    for idx, dosya in enumerate(dosyalar):
+        dosya_path = Path(dosya.get("dosya_yolu", ""))
+        if dosya_path.is_file():
+            # Orijinal dosya adını kullan, aynı isimde dosya varsa numara ekle
+            original_name = dosya.get("dosya_adi") or f"dosya_{idx}"
+            arcname = unique_arcname(f"{rapor_folder}/{safe_name(original_name)}", used)
+            entries.append(ZipEntry(arcname, path=str(dosya_path)))
+    return entries
+
+
 # ZIP Export Route - Seçili raporları ZIP olarak indir
 @router.post("/zip-export")
 async def zip_export_raporlar(
@@ -267,149 +470,325 @@ async def zip_export_raporlar(
     ├── Kategori_B/
     │   └── RAPOR_003/
     └── ...
+    
+    The archive is streamed as it is written: media files are read straight
+    from uploads/ and JPG/PDF are stored without recompression.
     """
     rapor_ids = request.rapor_ids
     
     if not rapor_ids:
         raise HTTPException(status_code=400, detail="En az bir rapor seçilmelidir")
     
-    if len(rapor_ids) > 100:
-        raise HTTPException(status_code=400, detail="En fazla 100 rapor seçilebilir")
-    
     # Seçilen raporları getir
-    raporlar = await db.raporlar.find({"id": {"$in": rapor_ids}}, {"_id": 0}).to_list(100)
+    raporlar = await db.raporlar.find(
+        {"id": {"$in": rapor_ids}}, {"_id": 0, SEARCH_FIELD: 0}
+    ).to_list(None)
     
     if not raporlar:
         raise HTTPException(status_code=404, detail="Seçilen raporlar bulunamadı")
     
-    # Geçici klasör oluştur
-    temp_dir = tempfile.mkdtemp()
-    
-    try:
-        # Raporları kategoriye göre grupla
-        kategori_raporlar = {}
-        for rapor in raporlar:
-            kategori = rapor.get("kategori", "Kategorisiz")
-            if kategori not in kategori_raporlar:
-                kategori_raporlar[kategori] = []
-            kategori_raporlar[kategori].append(rapor)
-        
-        # Her kategori için klasör oluştur ve raporları içine yerleştir
-        for kategori, kategori_rapor_listesi in kategori_raporlar.items():
-            # Kategori klasör adını güvenli hale getir
-            safe_kategori = "".join(c if c.isalnum() or c in "-_ ()" else "_" for c in kategori)
-            kategori_folder = os.path.join(temp_dir, safe_kategori)
-            os.makedirs(kategori_folder, exist_ok=True)
-            
-            # Bu kategorideki her rapor için klasör oluştur
-            for rapor in kategori_rapor_listesi:
-                rapor_no = rapor.get("rapor_no", f"RAPOR_{rapor.get('id', 'unknown')[:8]}")
-                # Klasör adını güvenli hale getir (özel karakterleri kaldır)
-                safe_rapor_no = "".join(c if c.isalnum() or c in "-_" else "_" for c in rapor_no)
-                rapor_folder = os.path.join(kategori_folder, f"RAPOR_{safe_rapor_no}")
-                os.makedirs(rapor_folder, exist_ok=True)
-                
-                # bilgi.txt dosyası oluştur
-                bilgi_content = f"""╔══════════════════════════════════════════════════════════════╗
-║                    RAPOR BİLGİLERİ                           ║
+    # Raporları kategoriye göre grupla
+    kategori_raporlar = {}
+    for rapor in raporlar:
+        kategori_raporlar.setdefault(rapor.get("kategori", "Kategorisiz"), []).append(rapor)
+    
+    medya = await medya_by_rapor(rapor["id"] for rapor in raporlar)
+    entries = []
+    used = set()
+    for kategori, kategori_rapor_listesi in kategori_raporlar.items():
+        # Klasör adlarını güvenli hale getir (özel karakterleri kaldır)
+        safe_kategori = safe_name(kategori, "-_ ()")
+        for rapor in kategori_rapor_listesi:
+            rapor_no = rapor.get("rapor_no", f"RAPOR_{rapor.get('id', 'unknown')[:8]}")
+            rapor_folder = f"{safe_kategori}/RAPOR_{safe_name(rapor_no, '-_')}"
+            entries.extend(_rapor_zip_entries(rapor, rapor_folder, medya[rapor["id"]], used))
+    
+    # Dosya adı oluştur - kategori sayısını da ekle
+    now = datetime.now(timezone.utc)
+    zip_filename = f"Raporlar_{len(kategori_raporlar)}Kategori_{len(raporlar)}Rapor_{now.strftime('%Y%m%d_%H%M')}.zip"
+    
+    return StreamingResponse(
+        iter_zip(entries),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{zip_filename}"',
+            "Content-Type": "application/zip"
+        }
+    )
+
+
+def _proje_ozet_text(proje: dict, kategori_counts: dict, stats: dict, username: str) -> str:
+    """proje_ozet.txt at the root of the project ZIP export"""
+    ozet_content = f"""╔══════════════════════════════════════════════════════════════╗
+║                    PROJE ÖZETİ                                ║
 ╚══════════════════════════════════════════════════════════════╝
 
-📋 Rapor No        : {rapor.get('rapor_no', 'Belirtilmemiş')}
-📅 Oluşturma Tarihi: {rapor.get('created_at', 'Belirtilmemiş')[:10] if rapor.get('created_at') else 'Belirtilmemiş'}
-🏢 Firma           : {rapor.get('firma', 'Belirtilmemiş')}
-🔧 Ekipman Adı     : {rapor.get('ekipman_adi', 'Belirtilmemiş')}
-📂 Kategori        : {rapor.get('kategori', 'Belirtilmemiş')}
-📁 Alt Kategori    : {rapor.get('alt_kategori', 'Belirtilmemiş')}
-📍 Lokasyon        : {rapor.get('lokasyon', 'Belirtilmemiş')}
-🏭 Marka/Model     : {rapor.get('marka_model', 'Belirtilmemiş')}
-🔢 Seri No         : {rapor.get('seri_no', 'Belirtilmemiş')}
-⏱️ Periyot         : {rapor.get('periyot', 'Belirtilmemiş')}
-📅 Geçerlilik      : {rapor.get('gecerlilik_tarihi', 'Belirtilmemiş')}
-✅ Uygunluk        : {rapor.get('uygunluk', 'Belirtilmemiş')}
-🏙️ Şehir           : {rapor.get('sehir', 'Belirtilmemiş')}
-📝 Proje           : {rapor.get('proje_adi', 'Belirtilmemiş')}
-👤 Oluşturan       : {rapor.get('created_by_username', 'Belirtilmemiş')}
-📊 Durum           : {rapor.get('durum', 'Aktif')}
+🏗️ PROJE BİLGİLERİ
+───────────────────────────────────────────────────────────────
+📁 Proje Adı       : {proje.get('proje_adi', 'Proje')}
+🏢 Firma           : {proje.get('firma_adi', 'Belirtilmemiş')}
+📍 Lokasyon        : {proje.get('lokasyon', 'Belirtilmemiş')}
+📅 Başlangıç       : {proje.get('baslangic_tarihi', 'Belirtilmemiş')}
+📅 Bitiş           : {proje.get('bitis_tarihi', 'Belirtilmemiş')}
+📊 Durum           : {proje.get('durum', 'Aktif')}
 
 ═══════════════════════════════════════════════════════════════
-📝 AÇIKLAMA:
+📊 İSTATİSTİKLER
 ───────────────────────────────────────────────────────────────
-{rapor.get('aciklama', 'Açıklama bulunmamaktadır.')}
+📋 Toplam Rapor    : {sum(kategori_counts.values())}
+📂 Kategori Sayısı : {len(kategori_counts)}
+🖼️ Toplam Resim    : {stats['toplam_resim']}
+📄 Toplam PDF      : {stats['toplam_pdf']}
+📁 Toplam Dosya    : {stats['toplam_dosya']}
+
+═══════════════════════════════════════════════════════════════
+📂 KATEGORİ DAĞILIMI
+───────────────────────────────────────────────────────────────
+"""
+    for kategori, count in kategori_counts.items():
+        ozet_content += f"• {kategori}: {count} rapor\n"
+    
+    ozet_content += f"""
 ═══════════════════════════════════════════════════════════════
 
 Bu dosya EKOS - Ekipman Kontrol Otomasyon Sistemi tarafından 
 otomatik olarak oluşturulmuştur.
 Tarih: {datetime.now(timezone.utc).strftime('%d.%m.%Y %H:%M:%S')} UTC
+İndiren: {username}
 """
-                
-                bilgi_path = os.path.join(rapor_folder, "bilgi.txt")
-                with open(bilgi_path, "w", encoding="utf-8") as f:
-                    f.write(bilgi_content)
-                
-                # Rapora ait dosyaları kopyala
-                rapor_id = rapor.get("id")
-                dosyalar = await db.medya_dosyalari.find({"rapor_id": rapor_id}, {"_id": 0}).to_list(100)
-                
-                for idx, dosya in enumerate(dosyalar):
-                    dosya_path = Path(dosya.get("dosya_yolu", ""))
-                    if dosya_path.exists():
-                        # Orijinal dosya adını kullan
-                        original_name = dosya.get("dosya_adi", f"dosya_{idx}")
-                        # Dosya adını güvenli hale getir
-                        safe_name = "".join(c if c.isalnum() or c in ".-_" else "_" for c in original_name)
-                        dest_path = os.path.join(rapor_folder, safe_name)
-                        
-                        # Aynı isimde dosya varsa numara ekle
-                        counter = 1
-                        base_name, ext = os.path.splitext(safe_name)
-                        while os.path.exists(dest_path):
-                            dest_path = os.path.join(rapor_folder, f"{base_name}_{counter}{ext}")
-                            counter += 1
-                        
-                        shutil.copy2(str(dosya_path), dest_path)
-        
-        # ZIP dosyası oluştur
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, temp_dir)
-                    zip_file.write(file_path, arcname)
-        
-        zip_buffer.seek(0)
+    return ozet_content
+
+
+def _proje_export_path(job_id: str) -> Path:
+    return PROJE_EXPORT_DIR / f"{job_id}.zip"
+
+
+def _proje_export_job_path(job_id: str) -> Path:
+    return PROJE_EXPORT_DIR / f"{job_id}.json"
+
+
+def _save_proje_export_job(job: dict):
+    """Write the job state atomically (temp file + rename)"""
+    job["updated_at"] = time.time()
+    PROJE_EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=PROJE_EXPORT_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(job, f, ensure_ascii=False)
+    os.replace(tmp, _proje_export_job_path(job["job_id"]))
+
+
+def _load_proje_export_job(job_id: str) -> Optional[dict]:
+    if not PROJE_EXPORT_JOB_ID.match(job_id):
+        return None
+    try:
+        with open(_proje_export_job_path(job_id), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _proje_export_job_orphaned(job: dict) -> bool:
+    """
+    A starting/processing job nobody is running any more: its state was not
+    saved for PROJE_EXPORT_STALE_SECONDS, or its owner process on this host
+    is gone (a restarted process gets a new boot token even with the same pid)
+    """
+    if job["status"] not in ("starting", "processing"):
+        return False
+    if time.time() - job.get("updated_at", 0) > PROJE_EXPORT_STALE_SECONDS:
+        return True
+    host, pid, boot = (job.get("worker") or "::").split(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        return f"{host}:{pid}:{boot}" != PROJE_EXPORT_WORKER
+    return not _pid_alive(int(pid))
+
+
+def _fail_orphaned_proje_export_job(job: dict):
+    _proje_export_path(job["job_id"]).with_suffix(".part").unlink(missing_ok=True)
+    job.update({"status": "failed", "message": "Arşiv oluşturma yarıda kesildi, lütfen tekrar deneyin"})
+    _save_proje_export_job(job)
+
+
+def _prune_proje_export_jobs():
+    """Forget the oldest finished jobs (and their files) and remove files older than the TTL"""
+    if not PROJE_EXPORT_DIR.exists():
+        return
+    finished = []
+    for path in PROJE_EXPORT_DIR.glob("*.json"):
+        job = _load_proje_export_job(path.stem)
+        if job and job["status"] in ("completed", "failed"):
+            finished.append((path.stat().st_mtime, path.stem))
+    for _, job_id in sorted(finished)[:-MAX_FINISHED_EXPORT_JOBS]:
+        _proje_export_path(job_id).unlink(missing_ok=True)
+        _proje_export_job_path(job_id).unlink(missing_ok=True)
+    
+    for path in PROJE_EXPORT_DIR.iterdir():
+        try:
+            if time.time() - path.stat().st_mtime > PROJE_EXPORT_TTL_SECONDS:
+                path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+async def _write_proje_batch(zf: zipfile.ZipFile, raporlar: List[dict], root: str, used: set, kategori_counts: dict, stats: dict):
+    """Add one batch of reports (bilgi.txt + media) to the project archive"""
+    medya = await medya_by_rapor(rapor["id"] for rapor in raporlar)
+    entries = []
+    for rapor in raporlar:
+        kategori = rapor.get("kategori", "Kategorisiz")
+        kategori_counts[kategori] = kategori_counts.get(kategori, 0) + 1
+        rapor_no = rapor.get("rapor_no", f"RAPOR_{rapor.get('id', 'unknown')[:8]}")
+        rapor_folder = f"{root}/{safe_name(kategori, '-_ ()')}/{safe_name(rapor_no, '-_')}"
+        entries.extend(_rapor_zip_entries(rapor, rapor_folder, medya[rapor["id"]], used, footer=False))
+    
+    # Dosya türü istatistikleri
+    for entry in entries:
+        if entry.path is None:
+            continue
+        stats["toplam_dosya"] += 1
+        ext_lower = os.path.splitext(entry.arcname)[1].lower()
+        if ext_lower in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp']:
+            stats["toplam_resim"] += 1
+        elif ext_lower == '.pdf':
+            stats["toplam_pdf"] += 1
+    
+    await asyncio.to_thread(write_entries, zf, entries)
+
+
+async def _proje_zip_export_task(job: dict, proje: dict, username: str):
+    """Write the project archive to disk report batch by report batch"""
+    job_id = job["job_id"]
+    job["status"] = "processing"
+    job["message"] = "Raporlar ve medya dosyaları arşivleniyor..."
+    _save_proje_export_job(job)
+    
+    part_path = _proje_export_path(job_id).with_suffix(".part")
+    safe_proje_adi = safe_name(proje.get("proje_adi", "Proje"), "-_ ()")
+    root = f"{safe_proje_adi}_Raporlar"
+    kategori_counts = {}
+    stats = {"toplam_dosya": 0, "toplam_resim": 0, "toplam_pdf": 0}
+    used = set()
+    try:
+        PROJE_EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        with open(part_path, "wb") as fileobj, zipfile.ZipFile(fileobj, "w", allowZip64=True) as zf:
+            batch = []
+            async for rapor in db.raporlar.find(
+                {"proje_id": proje["id"]}, {"_id": 0, SEARCH_FIELD: 0}
+            ).sort([("kategori", 1), ("rapor_no", 1)]):
+                batch.append(rapor)
+                if len(batch) >= PROJE_EXPORT_BATCH_SIZE:
+                    await _write_proje_batch(zf, batch, root, used, kategori_counts, stats)
+                    job["processed_raporlar"] += len(batch)
+                    job["toplam_dosya"] = stats["toplam_dosya"]
+                    job["bytes_written"] = fileobj.tell()
+                    job["progress"] = min(99, job["processed_raporlar"] * 100 // max(job["total_raporlar"], 1))
+                    _save_proje_export_job(job)
+                    batch = []
+            if batch:
+                await _write_proje_batch(zf, batch, root, used, kategori_counts, stats)
+                job["processed_raporlar"] += len(batch)
+            
+            ozet = ZipEntry(f"{root}/proje_ozet.txt", text=_proje_ozet_text(proje, kategori_counts, stats, username))
+            await asyncio.to_thread(write_entries, zf, [ozet])
         
-        # Dosya adı oluştur - kategori sayısını da ekle
+        final_path = _proje_export_path(job_id)
+        os.replace(part_path, final_path)
         now = datetime.now(timezone.utc)
-        username = current_user.get("username", "user")
-        kategori_count = len(kategori_raporlar)
-        rapor_count = len(raporlar)
-        zip_filename = f"Raporlar_{kategori_count}Kategori_{rapor_count}Rapor_{now.strftime('%Y%m%d_%H%M')}.zip"
-        
-        return StreamingResponse(
-            zip_buffer,
-            media_type="application/zip",
-            headers={
-                "Content-Disposition": f'attachment; filename="{zip_filename}"',
-                "Content-Type": "application/zip"
-            }
-        )
-        
+        job.update({
+            "status": "completed",
+            "progress": 100,
+            "message": "Arşiv hazır",
+            "toplam_dosya": stats["toplam_dosya"],
+            "bytes_written": final_path.stat().st_size,
+            "size": final_path.stat().st_size,
+            "filename": f"{safe_proje_adi}_{job['processed_raporlar']}Rapor_{stats['toplam_dosya']}Dosya_{now.strftime('%Y%m%d_%H%M')}.zip"
+        })
+    except Exception as e:
+        part_path.unlink(missing_ok=True)
+        job.update({"status": "failed", "message": f"Arşiv oluşturulamadı: {str(e)}"})
     finally:
-        # Geçici klasörü temizle
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        _save_proje_export_job(job)
+        _prune_proje_export_jobs()
+
+
+def _get_proje_export_job(job_id: str, current_user: dict) -> dict:
+    job = _load_proje_export_job(job_id)
+    if not job or (job["user_id"] != current_user["id"] and current_user.get("role") != "admin"):
+        raise HTTPException(status_code=404, detail="Dışa aktarma işi bulunamadı")
+    if _proje_export_job_orphaned(job):
+        _fail_orphaned_proje_export_job(job)
+    return job
+
+
+def _parse_range(range_header: Optional[str], size: int):
+    """(start, end) of a single 'bytes=' range; None to send the whole file"""
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    start_str, _, end_str = range_header[len("bytes="):].strip().partition("-")
+    try:
+        if start_str:
+            start = int(start_str)
+            if end_str and int(end_str) < start:
+                # Invalid range-spec (e.g. bytes=500-100): ignored, the whole file is sent (RFC 9110)
+                return None
+            end = min(int(end_str), size - 1) if end_str else size - 1
+        else:
+            # bytes=-N: the last N bytes
+            suffix = int(end_str)
+            start, end = max(0, size - suffix), size - 1
+            if suffix == 0:
+                start = size
+    except ValueError:
+        return None
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="İstenen aralık dosya boyutunu aşıyor",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+
+def _content_disposition(filename: str) -> str:
+    """Attachment header safe for non-ASCII (Turkish) file names: ASCII fallback + RFC 5987 filename*"""
+    fallback = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode() or "arsiv.zip"
+    return f'attachment; filename="{fallback}"; filename*=UTF-8\'\'{quote(filename)}'
+
+
+def _iter_file_range(path: Path, start: int, end: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
 
 
 # Proje bazlı ZIP Export - Projeye ait tüm raporları ve medyaları indir
-@router.get("/proje-zip-export/{proje_id}")
-async def proje_zip_export(
+@router.post("/proje-zip-export/{proje_id}")
+async def start_proje_zip_export(
     proje_id: str,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user)
 ):
     """
     Belirli bir projeye ait tüm raporları ve medya dosyalarını 
-    kategoriye ve rapor numarasına göre gruplandırılmış ZIP olarak indirir.
+    kategoriye ve rapor numarasına göre gruplandırılmış ZIP olarak hazırlar.
     
     Yapı:
     ProjeAdi_Raporlar/
@@ -422,189 +801,80 @@ async def proje_zip_export(
     ├── Kategori_B/
     │   └── RaporNo_003/
     └── proje_ozet.txt
-    """
     
+    The archive is written to disk in the background: poll
+    /proje-zip-export/jobs/{job_id} and fetch .../download when completed.
+    """
     # Proje bilgilerini getir
     proje = await db.projeler.find_one({"id": proje_id}, {"_id": 0})
     if not proje:
         raise HTTPException(status_code=404, detail="Proje bulunamadı")
     
-    proje_adi = proje.get("proje_adi", "Proje")
-    
-    # Projeye ait tüm raporları getir
-    raporlar = await db.raporlar.find({"proje_id": proje_id}, {"_id": 0}).to_list(1000)
-    
-    if not raporlar:
+    total = await db.raporlar.count_documents({"proje_id": proje_id})
+    if not total:
         raise HTTPException(status_code=404, detail="Bu projeye ait rapor bulunamadı")
     
-    # Geçici klasör oluştur
-    temp_dir = tempfile.mkdtemp()
-    
-    # Ana proje klasörü - güvenli isim
-    safe_proje_adi = "".join(c if c.isalnum() or c in "-_ ()" else "_" for c in proje_adi)
-    proje_folder = os.path.join(temp_dir, f"{safe_proje_adi}_Raporlar")
-    os.makedirs(proje_folder, exist_ok=True)
+    job_id = f"pzip_{uuid.uuid4().hex[:12]}"
+    job = {
+        "job_id": job_id,
+        "user_id": current_user["id"],
+        "proje_id": proje_id,
+        "status": "starting",
+        "progress": 0,
+        "message": "Arşiv hazırlanıyor...",
+        "total_raporlar": total,
+        "processed_raporlar": 0,
+        "toplam_dosya": 0,
+        "bytes_written": 0,
+        "size": None,
+        "filename": None,
+        "worker": PROJE_EXPORT_WORKER
+    }
+    _save_proje_export_job(job)
+    background_tasks.add_task(_proje_zip_export_task, job, proje, current_user.get("username", "user"))
     
-    try:
-        # Raporları kategoriye göre grupla
-        kategori_raporlar = {}
-        for rapor in raporlar:
-            kategori = rapor.get("kategori", "Kategorisiz")
-            if kategori not in kategori_raporlar:
-                kategori_raporlar[kategori] = []
-            kategori_raporlar[kategori].append(rapor)
-        
-        # İstatistikler için sayaçlar
-        toplam_dosya = 0
-        toplam_resim = 0
-        toplam_pdf = 0
-        
-        # Her kategori için klasör oluştur
-        for kategori, kategori_rapor_listesi in kategori_raporlar.items():
-            safe_kategori = "".join(c if c.isalnum() or c in "-_ ()" else "_" for c in kategori)
-            kategori_folder = os.path.join(proje_folder, safe_kategori)
-            os.makedirs(kategori_folder, exist_ok=True)
-            
-            # Bu kategorideki her rapor için klasör oluştur
-            for rapor in kategori_rapor_listesi:
-                rapor_no = rapor.get("rapor_no", f"RAPOR_{rapor.get('id', 'unknown')[:8]}")
-                safe_rapor_no = "".join(c if c.isalnum() or c in "-_" else "_" for c in rapor_no)
-                rapor_folder = os.path.join(kategori_folder, safe_rapor_no)
-                os.makedirs(rapor_folder, exist_ok=True)
-                
-                # bilgi.txt dosyası oluştur
-                bilgi_content = f"""╔══════════════════════════════════════════════════════════════╗
-║                    RAPOR BİLGİLERİ                           ║
-╚══════════════════════════════════════════════════════════════╝
-
-📋 Rapor No        : {rapor.get('rapor_no', 'Belirtilmemiş')}
-📅 Oluşturma Tarihi: {rapor.get('created_at', 'Belirtilmemiş')[:10] if rapor.get('created_at') else 'Belirtilmemiş'}
-🏢 Firma           : {rapor.get('firma', 'Belirtilmemiş')}
-🔧 Ekipman Adı     : {rapor.get('ekipman_adi', 'Belirtilmemiş')}
-📂 Kategori        : {rapor.get('kategori', 'Belirtilmemiş')}
-📁 Alt Kategori    : {rapor.get('alt_kategori', 'Belirtilmemiş')}
-📍 Lokasyon        : {rapor.get('lokasyon', 'Belirtilmemiş')}
-🏭 Marka/Model     : {rapor.get('marka_model', 'Belirtilmemiş')}
-🔢 Seri No         : {rapor.get('seri_no', 'Belirtilmemiş')}
-⏱️ Periyot         : {rapor.get('periyot', 'Belirtilmemiş')}
-📅 Geçerlilik      : {rapor.get('gecerlilik_tarihi', 'Belirtilmemiş')}
-✅ Uygunluk        : {rapor.get('uygunluk', 'Belirtilmemiş')}
-🏙️ Şehir           : {rapor.get('sehir', 'Belirtilmemiş')}
-📝 Proje           : {rapor.get('proje_adi', 'Belirtilmemiş')}
-👤 Oluşturan       : {rapor.get('created_by_username', 'Belirtilmemiş')}
-📊 Durum           : {rapor.get('durum', 'Aktif')}
+    return {"job_id": job_id, "total_raporlar": total, "message": "Proje arşivi hazırlanıyor"}
 
-═══════════════════════════════════════════════════════════════
-📝 AÇIKLAMA:
-───────────────────────────────────────────────────────────────
-{rapor.get('aciklama', 'Açıklama bulunmamaktadır.')}
-═══════════════════════════════════════════════════════════════
-"""
-                
-                bilgi_path = os.path.join(rapor_folder, "bilgi.txt")
-                with open(bilgi_path, "w", encoding="utf-8") as f:
-                    f.write(bilgi_content)
-                
-                # Rapora ait medya dosyalarını kopyala
-                rapor_id = rapor.get("id")
-                dosyalar = await db.medya_dosyalari.find({"rapor_id": rapor_id}, {"_id": 0}).to_list(100)
-                
-                for idx, dosya in enumerate(dosyalar):
-                    dosya_path = Path(dosya.get("dosya_yolu", ""))
-                    if dosya_path.exists():
-                        original_name = dosya.get("dosya_adi", f"dosya_{idx}")
-                        safe_name = "".join(c if c.isalnum() or c in ".-_" else "_" for c in original_name)
-                        dest_path = os.path.join(rapor_folder, safe_name)
-                        
-                        # Aynı isimde dosya varsa numara ekle
-                        counter = 1
-                        base_name, ext = os.path.splitext(safe_name)
-                        while os.path.exists(dest_path):
-                            dest_path = os.path.join(rapor_folder, f"{base_name}_{counter}{ext}")
-                            counter += 1
-                        
-                        shutil.copy2(str(dosya_path), dest_path)
-                        toplam_dosya += 1
-                        
-                        # Dosya türü istatistikleri
-                        ext_lower = ext.lower()
-                        if ext_lower in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp']:
-                            toplam_resim += 1
-                        elif ext_lower == '.pdf':
-                            toplam_pdf += 1
-        
-        # Proje özet dosyası oluştur
-        ozet_content = f"""╔══════════════════════════════════════════════════════════════╗
-║                    PROJE ÖZETİ                                ║
-╚══════════════════════════════════════════════════════════════╝
 
-🏗️ PROJE BİLGİLERİ
-───────────────────────────────────────────────────────────────
-📁 Proje Adı       : {proje_adi}
-🏢 Firma           : {proje.get('firma_adi', 'Belirtilmemiş')}
-📍 Lokasyon        : {proje.get('lokasyon', 'Belirtilmemiş')}
-📅 Başlangıç       : {proje.get('baslangic_tarihi', 'Belirtilmemiş')}
-📅 Bitiş           : {proje.get('bitis_tarihi', 'Belirtilmemiş')}
-📊 Durum           : {proje.get('durum', 'Aktif')}
+@router.get("/proje-zip-export/jobs/{job_id}")
+async def get_proje_zip_export_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Proje ZIP dışa aktarımının ilerlemesi"""
+    return _get_proje_export_job(job_id, current_user)
 
-═══════════════════════════════════════════════════════════════
-📊 İSTATİSTİKLER
-───────────────────────────────────────────────────────────────
-📋 Toplam Rapor    : {len(raporlar)}
-📂 Kategori Sayısı : {len(kategori_raporlar)}
-🖼️ Toplam Resim    : {toplam_resim}
-📄 Toplam PDF      : {toplam_pdf}
-📁 Toplam Dosya    : {toplam_dosya}
-
-═══════════════════════════════════════════════════════════════
-📂 KATEGORİ DAĞILIMI
-───────────────────────────────────────────────────────────────
-"""
-        for kategori, rapor_listesi in kategori_raporlar.items():
-            ozet_content += f"• {kategori}: {len(rapor_listesi)} rapor\n"
-        
-        ozet_content += f"""
-═══════════════════════════════════════════════════════════════
-
-Bu dosya EKOS - Ekipman Kontrol Otomasyon Sistemi tarafından 
-otomatik olarak oluşturulmuştur.
-Tarih: {datetime.now(timezone.utc).strftime('%d.%m.%Y %H:%M:%S')} UTC
-İndiren: {current_user.get("username", "user")}
-"""
-        
-        ozet_path = os.path.join(proje_folder, "proje_ozet.txt")
-        with open(ozet_path, "w", encoding="utf-8") as f:
-            f.write(ozet_content)
-        
-        # ZIP dosyası oluştur
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, temp_dir)
-                    zip_file.write(file_path, arcname)
-        
-        zip_buffer.seek(0)
-        
-        # Dosya adı oluştur
-        now = datetime.now(timezone.utc)
-        zip_filename = f"{safe_proje_adi}_{len(raporlar)}Rapor_{toplam_dosya}Dosya_{now.strftime('%Y%m%d_%H%M')}.zip"
-        
-        return StreamingResponse(
-            zip_buffer,
-            media_type="application/zip",
-            headers={
-                "Content-Disposition": f'attachment; filename="{zip_filename}"',
-                "Content-Type": "application/zip"
-            }
-        )
-        
-    finally:
-        # Geçici klasörü temizle
-        shutil.rmtree(temp_dir, ignore_errors=True)
 
+@router.get("/proje-zip-export/jobs/{job_id}/download")
+async def download_proje_zip_export(job_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    """
+    Hazırlanan proje arşivini indir.
+    Supports a single HTTP Range (bytes=start-end, bytes=start-, bytes=-N) so
+    interrupted downloads can be resumed; the file stays available until the job
+    is pruned.
+    """
+    job = _get_proje_export_job(job_id, current_user)
+    if job["status"] != "completed":
+        raise HTTPException(status_code=400, detail="Arşiv henüz hazır değil")
+    
+    path = _proje_export_path(job_id)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Arşiv dosyası bulunamadı")
+    
+    size = path.stat().st_size
+    byte_range = _parse_range(request.headers.get("range"), size)
+    start, end = byte_range or (0, size - 1)
+    headers = {
+        "Content-Disposition": _content_disposition(job["filename"]),
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1)
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    
+    return StreamingResponse(
+        _iter_file_range(path, start, end),
+        status_code=206 if byte_range else 200,
+        media_type="application/zip",
+        headers=headers
+    )
 
 
 # Migration endpoint - raporu ID ile birlikte oluştur
@@ -622,6 +892,8 @@ async def migrate_rapor(rapor_data: RaporMigration, current_user: dict = Depends
     if doc.get('updated_at') is None:
         doc['updated_at'] = datetime.now(timezone.utc).isoformat()
     
+    doc.update(search_fields(doc))
+    
     # Eğer aynı ID'li rapor varsa sil
     await db.raporlar.delete_one({"id": doc['id']})
     
@@ -643,6 +915,7 @@ async def migrate_raporlar_bulk(raporlar: List[RaporMigration], current_user: di
                 doc['created_at'] = datetime.now(timezone.utc).isoformat()
             if doc.get('updated_at') is None:
                 doc['updated_at'] = datetime.now(timezone.utc).isoformat()
+            doc.update(search_fields(doc))
             
             await db.raporlar.delete_one({"id": doc['id']})
             await db.raporlar.insert_one(doc)
@@ -662,7 +935,7 @@ async def get_public_rapor(rapor_id: str):
     Public rapor görüntüleme - login gerektirmez
     Sadece rapor bilgileri ve medya dosyaları görüntülenebilir
     """
-    rapor = await db.raporlar.find_one({"id": rapor_id}, {"_id": 0})
+    rapor = await db.raporlar.find_one({"id": rapor_id}, {"_id": 0, SEARCH_FIELD: 0})
     if not rapor:
         raise HTTPException(status_code=404, detail="Rapor bulunamadı")
     
@@ -675,10 +948,7 @@ async def get_public_rapor(rapor_id: str):
         rapor['created_by_username'] = 'Belirtilmemiş'
     
     # Medya dosyalarını getir
-    medya_dosyalari = await db.medya_dosyalari.find(
-        {"rapor_id": rapor_id}, 
-        {"_id": 0}
-    ).to_list(100)
+    medya_dosyalari = (await medya_by_rapor([rapor_id]))[rapor_id]
     
     # Dosya URL'lerini oluştur
     for dosya in medya_dosyalari:
@@ -12,10 +12,14 @@ import uuid
 from difflib import get_close_matches
 
 from database import db
+from indexes import register_index
 from routers.auth import get_current_user
 
 router = APIRouter(prefix="/vocabulary", tags=["vocabulary"])
 
+register_index("vocabulary", [("user_id", 1), ("word", 1)])
+register_index("vocabulary", [("user_id", 1), ("added_date", -1)])
+
 
 # Models
 class WordCreate(BaseModel):
@@ -20,9 +20,13 @@ from pathlib import Path
 from datetime import datetime, timezone
 
 from database import db
+from indexes import apply_indexes
+from rapor_search import backfill_search_tokens
+from utils import backfill_rapor_no_counters
 from constants import KATEGORI_ALT_KATEGORI
 from models import User, Kategori, Proje
 from routers.auth import get_password_hash
+from routers.draws import backfill_participant_search
 
 # Routers
 from routers import (
@@ -104,6 +108,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Snapshot"],
 )
 
 
@@ -111,26 +116,25 @@ app.add_middleware(
 async def startup_db():
     """Initialize database indexes and default data on startup"""
     
-    # Create indexes for better performance
-    try:
-        # Users collection indexes
-        await db.users.create_index("email", unique=True)
-        await db.users.create_index("username")
-        
-        # Raporlar collection indexes
-        await db.raporlar.create_index("rapor_no", unique=True)
-        await db.raporlar.create_index("kategori")
-        await db.raporlar.create_index("created_at")
-        await db.raporlar.create_index("gecerlilik_tarihi")
-        await db.raporlar.create_index("uygunluk")
-        await db.raporlar.create_index([("created_at", -1)])  # Descending for latest first
-        
-        # Kategoriler collection indexes
-        await db.kategoriler.create_index("isim", unique=True)
-        
-        logger.info("Database indexes created successfully")
-    except Exception as e:
-        logger.warning(f"Index creation error (may already exist): {e}")
+    # Create the indexes registered by the router modules (idempotent)
+    report = await apply_indexes(db)
+    logger.info(
+        f"Database indexes: {len(report['created'])} created, "
+        f"{len(report['existing'])} already present, {len(report['failed'])} failed"
+    )
+    for failure in report["failed"]:
+        logger.warning(f"Index {failure['index']} missing: {failure['error']}")
+    
+    # Search tokens for reports created before report search existed
+    await backfill_search_tokens(db)
+    
+    # Folded name fields for participants uploaded before name search was indexed
+    await backfill_participant_search()
+    
+    # Report number counters, seeded once from the existing reports
+    seeded = await backfill_rapor_no_counters()
+    if seeded:
+        logger.info(f"Report number counters seeded for {seeded} year/city pairs")
     
     # Create default admin if not exists
     admin_exists = await db.users.find_one({"email": "ibrahimznrmak@gmail.com"})
@@ -0,0 +1,48 @@
+"""
+Shared fixtures
+Most suites call a running server over HTTP (REACT_APP_BACKEND_URL). Tests of
+database helpers use `scratch_db` instead: a throwaway database on MONGO_URL
+that is dropped afterwards; they are skipped when MongoDB is unreachable.
+"""
+
+import contextlib
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def scratch_db():
+    """
+    Async context manager factory yielding an empty database. Motor clients
+    are bound to an event loop, so enter it inside the test's asyncio.run().
+    """
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo.errors import ServerSelectionTimeoutError
+
+    load_dotenv(BACKEND_DIR / ".env")
+    mongo_url = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+    name = f"{os.environ.get('DB_NAME', 'ekipman_db')}_test_{uuid.uuid4().hex[:8]}"
+
+    @contextlib.asynccontextmanager
+    async def open_db():
+        client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=2000)
+        try:
+            await client.admin.command("ping")
+        except ServerSelectionTimeoutError:
+            client.close()
+            pytest.skip(f"MongoDB not reachable at {mongo_url}")
+        try:
+            yield client[name]
+        finally:
+            await client.drop_database(name)
+            client.close()
+
+    return open_db
@@ -7,7 +7,10 @@ Test suite for Çekiliş (Raffle) features:
 import pytest
 import requests
 import os
+import io
+import time
 import uuid
+from openpyxl import load_workbook
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://bill-of-quantities-3.preview.emergentagent.com')
 
@@ -158,6 +161,180 @@ class TestDrawsAPI:
         assert response.status_code == 404
 
 
+class TestParticipantUpload:
+    """Tests for chunked participant upload"""
+    
+    def test_upload_csv_with_duplicates(self, auth_headers):
+        """CSV upload should skip repeated and already registered ID Nos and report progress"""
+        response = requests.post(
+            f"{BASE_URL}/api/draws",
+            json={"name": f"TEST_Upload_{uuid.uuid4().hex[:8]}", "main_count": 1, "backup_count": 0},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        draw_id = response.json()["id"]
+        
+        prefix = uuid.uuid4().hex[:6]
+        rows = "".join(f"{prefix}{i % 40},Ad{i},Soyad{i},test{i}@example.com\n" for i in range(50))
+        csv_content = ("ID No,Ad,Soyad,İletişim\n" + rows + ",,,\n").encode("utf-8")
+        
+        try:
+            response = requests.post(
+                f"{BASE_URL}/api/draws/{draw_id}/participants/upload",
+                files={"file": ("katilimcilar.csv", csv_content, "text/csv")},
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert data["added"] == 40
+            assert data["duplicates"] == 10
+            assert data["skipped"] == 1
+            assert data["total_participants"] == 40
+            
+            progress = requests.get(
+                f"{BASE_URL}/api/draws/{draw_id}/participants/upload/progress",
+                headers=auth_headers
+            ).json()
+            assert progress["status"] == "completed"
+            assert progress["progress"] == 100
+            
+            # Uploading the same file again adds nothing
+            response = requests.post(
+                f"{BASE_URL}/api/draws/{draw_id}/participants/upload",
+                files={"file": ("katilimcilar.csv", csv_content, "text/csv")},
+                headers=auth_headers
+            )
+            assert response.json()["added"] == 0
+            assert response.json()["duplicates"] == 50
+        finally:
+            requests.delete(f"{BASE_URL}/api/draws/{draw_id}", headers=auth_headers)
+
+
+class TestParticipantListing:
+    """Tests for paginated participant listing and count"""
+    
+    def test_keyset_pages_and_count(self, auth_headers):
+        """Pages should follow X-Next-Cursor in ID No order; count comes from the draw"""
+        response = requests.post(
+            f"{BASE_URL}/api/draws",
+            json={"name": f"TEST_Listing_{uuid.uuid4().hex[:8]}", "main_count": 1, "backup_count": 0},
+            headers=auth_headers
+        )
+        draw_id = response.json()["id"]
+        
+        prefix = uuid.uuid4().hex[:6]
+        rows = "".join(f"{prefix}{i:03d},Ad{i},Soyad{i},test{i}@example.com\n" for i in range(150))
+        requests.post(
+            f"{BASE_URL}/api/draws/{draw_id}/participants/upload",
+            files={"file": ("katilimcilar.csv", ("ID No,Ad,Soyad,İletişim\n" + rows).encode("utf-8"), "text/csv")},
+            headers=auth_headers
+        )
+        
+        try:
+            url = f"{BASE_URL}/api/draws/{draw_id}/participants"
+            first = requests.get(url, params={"limit": 100}, headers=auth_headers)
+            assert first.status_code == 200
+            assert len(first.json()) == 100
+            assert set(first.json()[0]) == {"id", "id_no", "first_name", "last_name", "contact"}
+            
+            second = requests.get(
+                url, params={"limit": 100, "after": first.headers["X-Next-Cursor"]}, headers=auth_headers
+            )
+            assert len(second.json()) == 50
+            assert "X-Next-Cursor" not in second.headers
+            ids = [p["id_no"] for p in first.json() + second.json()]
+            assert ids == sorted(ids) and len(set(ids)) == 150
+            
+            found = requests.get(url, params={"q": f"{prefix}14"}, headers=auth_headers).json()
+            assert len(found) == 10
+            
+            count = requests.get(f"{url}/count", headers=auth_headers).json()
+            assert count["count"] == 150
+            count = requests.get(f"{url}/count", params={"q": "Ad14"}, headers=auth_headers).json()
+            assert count["count"] == 11
+        finally:
+            requests.delete(f"{BASE_URL}/api/draws/{draw_id}", headers=auth_headers)
+
+
+class TestDrawsBatchExecute:
+    """Tests for POST /api/draws/execute-batch"""
+    
+    def test_batch_execute_reports_per_draw_status(self, auth_headers):
+        """Ready draws complete, an under-filled one fails without stopping the rest"""
+        draw_ids = []
+        try:
+            for participants in (2, 2, 1):
+                response = requests.post(
+                    f"{BASE_URL}/api/draws",
+                    json={"name": f"TEST_Batch_{uuid.uuid4().hex[:8]}", "main_count": 1, "backup_count": 1},
+                    headers=auth_headers
+                )
+                draw_id = response.json()["id"]
+                draw_ids.append(draw_id)
+                for i in range(participants):
+                    requests.post(
+                        f"{BASE_URL}/api/draws/{draw_id}/participants",
+                        json={"id_no": f"B{i}", "first_name": "Test", "last_name": "User", "contact": "x"},
+                        headers=auth_headers
+                    )
+            
+            response = requests.post(
+                f"{BASE_URL}/api/draws/execute-batch",
+                json={"draw_ids": draw_ids},
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert data["completed"] == 2
+            assert data["failed"] == 1
+            assert [r["status"] for r in data["results"]] == ["completed", "completed", "failed"]
+            
+            results = requests.get(f"{BASE_URL}/api/draws/{draw_ids[0]}/results", headers=auth_headers)
+            assert results.status_code == 200
+            assert len(results.json()["winners"]) == 1
+        finally:
+            for draw_id in draw_ids:
+                requests.delete(f"{BASE_URL}/api/draws/{draw_id}", headers=auth_headers)
+
+
+class TestDrawsBulkDelete:
+    """Tests for soft delete with background participant cleanup"""
+    
+    def test_bulk_delete_with_progress(self, auth_headers):
+        """Draws disappear at once; the cleanup job reports progress until completed"""
+        draw_ids = []
+        for _ in range(2):
+            response = requests.post(
+                f"{BASE_URL}/api/draws",
+                json={"name": f"TEST_Delete_{uuid.uuid4().hex[:8]}", "main_count": 1, "backup_count": 0},
+                headers=auth_headers
+            )
+            draw_id = response.json()["id"]
+            draw_ids.append(draw_id)
+            rows = "".join(f"D{i},Ad{i},Soyad{i},x\n" for i in range(30))
+            requests.post(
+                f"{BASE_URL}/api/draws/{draw_id}/participants/upload",
+                files={"file": ("k.csv", ("ID No,Ad,Soyad,İletişim\n" + rows).encode("utf-8"), "text/csv")},
+                headers=auth_headers
+            )
+        
+        response = requests.post(f"{BASE_URL}/api/draws/bulk-delete", json=draw_ids, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["deleted_count"] == 2
+        
+        for draw_id in draw_ids:
+            assert requests.get(f"{BASE_URL}/api/draws/{draw_id}", headers=auth_headers).status_code == 404
+        
+        for _ in range(50):
+            job = requests.get(f"{BASE_URL}/api/draws/delete-jobs/{data['job_id']}", headers=auth_headers).json()
+            if job["status"] not in ("starting", "processing"):
+                break
+            time.sleep(0.2)
+        assert job["status"] == "completed"
+        assert job["deleted_participants"] >= 60
+
+
 # ==================== VOCABULARY API TESTS ====================
 
 class TestVocabularyAPI:
@@ -346,8 +523,31 @@ class TestDrawsIntegration:
         assert response.status_code == 200
         results = response.json()
         assert len(results["winners"]) == 2
+        assert results["algorithm"] == "hmac-sha256-fisher-yates-v1"
+        assert results["participant_total"] == 3
+        assert len(results["seed"]) == 64
         print("Results retrieved successfully")
         
+        # 4b. Replay the draw from the stored seed
+        response = requests.get(
+            f"{BASE_URL}/api/draws/{draw_id}/results/verify",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["verified"] == True
+        
+        # 4c. Export results with the participant sheet
+        response = requests.get(
+            f"{BASE_URL}/api/draws/{draw_id}/export",
+            params={"include_participants": "true"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.content[:2] == b"PK"
+        workbook = load_workbook(io.BytesIO(response.content), read_only=True)
+        assert workbook.sheetnames == ["Asıl Talihliler", "Yedek Talihliler", "Özet", "Katılımcılar"]
+        assert workbook["Katılımcılar"].max_row == 4
+        
         # 5. Verify draw status is completed
         response = requests.get(
             f"{BASE_URL}/api/draws/{draw_id}",
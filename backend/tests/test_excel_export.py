@@ -5,6 +5,10 @@ Tests the /api/excel/export-filtered endpoint
 import pytest
 import requests
 import os
+import time
+import io
+import uuid
+from openpyxl import Workbook
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
 
@@ -180,6 +184,51 @@ class TestDashboardStats:
             assert "id" in report or "rapor_no" in report
             print(f"Reports list: {len(data)} reports")
     
+    def test_get_raporlar_cursor_pages(self):
+        """Test keyset pages: cursor chain, no overlap, total and projection"""
+        params = {"limit": 5, "total": "exact", "fields": "rapor_no,firma"}
+        first = requests.get(f"{BASE_URL}/api/raporlar", headers=self.headers, params=params)
+        
+        assert first.status_code == 200
+        assert "x-total-count" in first.headers
+        page = first.json()
+        for report in page:
+            assert set(report) <= {"id", "created_at", "rapor_no", "firma"}
+        
+        cursor = first.headers.get("x-next-cursor")
+        if cursor:
+            second = requests.get(
+                f"{BASE_URL}/api/raporlar",
+                headers=self.headers,
+                params={**params, "cursor": cursor}
+            )
+            assert second.status_code == 200
+            assert not {r["id"] for r in page} & {r["id"] for r in second.json()}
+        print(f"Cursor pages: total {first.headers['x-total-count']}")
+    
+    def test_get_raporlar_invalid_cursor(self):
+        """Test that a malformed cursor or unknown field is rejected"""
+        response = requests.get(f"{BASE_URL}/api/raporlar", headers=self.headers, params={"cursor": "bozuk"})
+        assert response.status_code == 400
+        response = requests.get(f"{BASE_URL}/api/raporlar", headers=self.headers, params={"fields": "yok"})
+        assert response.status_code == 400
+    
+    def test_search_raporlar_folds_turkish_letters(self):
+        """Test that report search ignores case and Turkish diacritics"""
+        reports = requests.get(f"{BASE_URL}/api/raporlar", headers=self.headers, params={"limit": 1}).json()
+        if not reports:
+            pytest.skip("No reports to search")
+        
+        rapor_no = reports[0]["rapor_no"]
+        for q in (rapor_no, rapor_no.lower()):
+            response = requests.get(f"{BASE_URL}/api/raporlar/search", headers=self.headers, params={"q": q})
+            assert response.status_code == 200
+            assert response.json()[0]["rapor_no"] == rapor_no
+        
+        upper = requests.get(f"{BASE_URL}/api/raporlar", headers=self.headers, params={"arama": "İSKELE"}).json()
+        folded = requests.get(f"{BASE_URL}/api/raporlar", headers=self.headers, params={"arama": "iskele"}).json()
+        assert {r["id"] for r in upper} == {r["id"] for r in folded}
+    
     def test_get_projeler_list(self):
         """Test getting projects list for filter dropdown"""
         response = requests.get(
@@ -198,5 +247,140 @@ class TestDashboardStats:
             print(f"Projects list: {len(data)} projects")
 
 
+class TestProjeZipExport:
+    """Project ZIP export job tests"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup - get auth token"""
+        login_response = requests.post(
+            f"{BASE_URL}/api/auth/login",
+            json={"email": "ibrahimznrmak@gmail.com", "password": "Szd.dl_34"}
+        )
+        assert login_response.status_code == 200, "Login failed"
+        self.token = login_response.json()["access_token"]
+        self.headers = {"Authorization": f"Bearer {self.token}"}
+    
+    def test_proje_zip_job_and_range_download(self):
+        """Test that the project archive is built in the background and can be resumed"""
+        reports = requests.get(f"{BASE_URL}/api/raporlar", headers=self.headers, params={"limit": 1}).json()
+        if not reports:
+            pytest.skip("No reports to export")
+        
+        start = requests.post(
+            f"{BASE_URL}/api/raporlar/proje-zip-export/{reports[0]['proje_id']}",
+            headers=self.headers
+        )
+        assert start.status_code == 200
+        job_id = start.json()["job_id"]
+        
+        for _ in range(120):
+            job = requests.get(f"{BASE_URL}/api/raporlar/proje-zip-export/jobs/{job_id}", headers=self.headers).json()
+            if job["status"] in ("completed", "failed"):
+                break
+            time.sleep(1)
+        assert job["status"] == "completed", job
+        
+        url = f"{BASE_URL}/api/raporlar/proje-zip-export/jobs/{job_id}/download"
+        full = requests.get(url, headers=self.headers)
+        assert full.status_code == 200
+        assert full.content[:2] == b"PK"
+        assert len(full.content) == job["size"]
+        
+        tail = requests.get(url, headers={**self.headers, "Range": "bytes=100-"})
+        assert tail.status_code == 206
+        assert tail.headers["content-range"] == f"bytes 100-{job['size'] - 1}/{job['size']}"
+        assert tail.content == full.content[100:]
+    
+    def test_proje_zip_unknown_job(self):
+        """Test that an unknown job id returns 404"""
+        response = requests.get(f"{BASE_URL}/api/raporlar/proje-zip-export/jobs/yok", headers=self.headers)
+        assert response.status_code == 404
+
+
+class TestExcelImportDryRun:
+    """Excel import preview (dry_run) and commit tests"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup - get auth token"""
+        login_response = requests.post(
+            f"{BASE_URL}/api/auth/login",
+            json={"email": "ibrahimznrmak@gmail.com", "password": "Szd.dl_34"}
+        )
+        assert login_response.status_code == 200, "Login failed"
+        self.token = login_response.json()["access_token"]
+        self.headers = {"Authorization": f"Bearer {self.token}"}
+    
+    def _sheet(self, rows):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["Şehir", "Ekipman Adı", "Kategori", "Firma"])
+        for row in rows:
+            ws.append(row)
+        buf = io.BytesIO()
+        wb.save(buf)
+        return buf.getvalue()
+    
+    def _imported(self, firma):
+        response = requests.get(
+            f"{BASE_URL}/api/raporlar",
+            headers=self.headers,
+            params={"firma": firma, "fields": "rapor_no,sehir"}
+        )
+        assert response.status_code == 200
+        return response.json()
+    
+    def test_rapor_import_dry_run_then_commit(self):
+        """Test that a dry run writes nothing and its token commits the valid rows once"""
+        projeler = requests.get(f"{BASE_URL}/api/projeler", headers=self.headers).json()
+        if not projeler:
+            pytest.skip("No project to import into")
+        
+        firma = f"TEST Firma {uuid.uuid4().hex[:8]}"
+        rows = [
+            ["Ankara", "TEST Forklift", "TEST", firma],
+            ["Atlantis", "TEST Ekipman", "TEST", firma],
+            ["istanbul", "TEST Vinç", "TEST", firma],
+            ["İZMİR", "TEST Platform", "TEST", firma]
+        ]
+        preview = requests.post(
+            f"{BASE_URL}/api/excel/import",
+            headers=self.headers,
+            files={"file": ("test.xlsx", self._sheet(rows))},
+            data={"proje_id": projeler[0]["id"], "dry_run": "true"}
+        )
+        assert preview.status_code == 200
+        data = preview.json()
+        assert data["dry_run"] is True
+        assert data["total_rows"] == 4
+        assert data["valid_count"] == 3
+        assert data["error_count"] == 1
+        assert data["error_rows"] == [{"row": 3, "field": "sehir", "message": "Geçersiz şehir - 'Atlantis'"}]
+        assert [(row["row"], row["sehir"]) for row in data["preview"]] == [(2, "Ankara"), (4, "İstanbul"), (5, "İzmir")]
+        assert self._imported(firma) == []
+        
+        commit_url = f"{BASE_URL}/api/excel/import/{data['token']}/commit"
+        commit = requests.post(commit_url, headers=self.headers)
+        try:
+            assert commit.status_code == 200
+            assert commit.json()["imported_count"] == data["valid_count"]
+            imported = self._imported(firma)
+            assert sorted(rapor["sehir"] for rapor in imported) == ["Ankara", "İstanbul", "İzmir"]
+            assert len({rapor["rapor_no"] for rapor in imported}) == 3
+            # The preview is used up
+            assert requests.post(commit_url, headers=self.headers).status_code == 404
+            assert len(self._imported(firma)) == 3
+        finally:
+            rapor_ids = [rapor["id"] for rapor in self._imported(firma)]
+            if rapor_ids:
+                requests.post(f"{BASE_URL}/api/raporlar/bulk-delete", headers=self.headers, json=rapor_ids)
+    
+    def test_import_unknown_token(self):
+        """Test that an unknown preview token returns 404"""
+        response = requests.post(f"{BASE_URL}/api/excel/import/yok/commit", headers=self.headers)
+        assert response.status_code == 404
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
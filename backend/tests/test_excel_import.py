@@ -0,0 +1,94 @@
+"""
+Test cases for the streaming Excel importer
+Runs a raporlar import that spans several IMPORT_BATCH_SIZE blocks through
+excel_import.run_import on a scratch database and checks the inserted count
+and that every rejected row is reported against its own sheet row
+"""
+import asyncio
+import io
+from datetime import datetime, timezone
+
+from fastapi import UploadFile
+from openpyxl import Workbook
+
+import utils
+from excel_import import IMPORT_BATCH_SIZE, run_import
+from routers import excel
+
+YEAR = datetime.now(timezone.utc).strftime("%Y")
+TOTAL_ROWS = 2 * IMPORT_BATCH_SIZE + 500
+CONTEXT = {
+    "proje_id": "test-proje",
+    "proje_adi": "Test Projesi",
+    "created_by": "test-user",
+    "created_by_username": "tester"
+}
+USER = {"id": "test-user", "role": "admin"}
+
+# Sheet row -> (row values, expected error field); rows start at 2 under the header
+# and the first, last and both sides of each batch boundary are rejected
+INVALID_ROWS = {
+    2: (("Atlantis", "Forklift", "Kaldırma", "Firma"), "sehir"),
+    IMPORT_BATCH_SIZE + 1: (("Ankara", "Forklift", "Kaldırma", None), "firma"),
+    IMPORT_BATCH_SIZE + 2: ((None, "Forklift", "Kaldırma", "Firma"), "sehir"),
+    2 * IMPORT_BATCH_SIZE + 1: (("Ankara", None, "Kaldırma", "Firma"), "ekipman_adi"),
+    TOTAL_ROWS + 1: (("Ankara", "Forklift", None, "Firma"), "kategori")
+}
+# İzmir rows in the last insert chunk; the second one gets IZM002, which is taken
+IZMIR_ROWS = (2 * IMPORT_BATCH_SIZE + 100, 2 * IMPORT_BATCH_SIZE + 200, 2 * IMPORT_BATCH_SIZE + 300)
+
+
+def _upload() -> UploadFile:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Şehir", "Ekipman Adı", "Kategori", "Firma"])
+    for row_idx in range(2, TOTAL_ROWS + 2):
+        if row_idx in INVALID_ROWS:
+            ws.append(list(INVALID_ROWS[row_idx][0]))
+        elif row_idx in IZMIR_ROWS:
+            ws.append(["izmir", f"Vinç {row_idx}", "Kaldırma", "Firma"])
+        else:
+            ws.append(["ANKARA", f"Forklift {row_idx}", "Kaldırma", "Firma"])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    return UploadFile(file=buffer, filename="raporlar.xlsx")
+
+
+class TestRaporImportBatches:
+    """raporlar import across batch boundaries"""
+
+    def test_import_spanning_batches(self, scratch_db, monkeypatch):
+        """Test inserted count, per-row errors and unique report numbers over several batches"""
+        async def scenario():
+            async with scratch_db() as db:
+                monkeypatch.setattr(excel, "db", db)
+                monkeypatch.setattr(utils, "db", db)
+                await db.rapor_no_counters.create_index([("year", 1), ("sehir_kodu", 1)], unique=True)
+                await db.raporlar.create_index("rapor_no", unique=True)
+                await db.raporlar.insert_one({"id": "eski", "rapor_no": f"PK{YEAR}-IZM002"})
+
+                result = await run_import("raporlar", _upload(), CONTEXT, USER)
+                stored = await db.raporlar.find(
+                    {"proje_id": CONTEXT["proje_id"]}, {"_id": 0, "rapor_no": 1, "sehir": 1}
+                ).to_list(None)
+                return result, stored
+
+        result, stored = asyncio.run(scenario())
+        expected = TOTAL_ROWS - len(INVALID_ROWS) - 1
+        assert result["total_rows"] == TOTAL_ROWS
+        assert result["imported_count"] == expected
+        assert len(stored) == expected
+
+        errors = {error["row"]: error for error in result["error_rows"]}
+        assert [error["row"] for error in result["error_rows"]] == sorted(errors)
+        assert set(errors) == set(INVALID_ROWS) | {IZMIR_ROWS[1]}
+        for row_idx, (_, field) in INVALID_ROWS.items():
+            assert errors[row_idx]["field"] == field
+        assert errors[IZMIR_ROWS[1]]["message"] == "Kayıt zaten mevcut"
+        assert len(result["errors"]) == len(errors)
+
+        rapor_nos = [rapor["rapor_no"] for rapor in stored]
+        assert len(set(rapor_nos)) == len(rapor_nos)
+        assert sorted(r for r in rapor_nos if "-IZM" in r) == [f"PK{YEAR}-IZM001", f"PK{YEAR}-IZM003"]
+        assert sum(rapor["sehir"] == "Ankara" for rapor in stored) == expected - 2
@@ -1,26 +1,50 @@
 """
 Test suite for Kombinasyonlar (Şans Topu Tahmin Üretici) API endpoints
-Tests: /api/kombinasyonlar/stats, /generate, /clear, /search, /sample, /export-excel
+Tests: /api/kombinasyonlar/stats, /analytics, /generate, /jobs, /clear, /search, /filter, /sample, /range, /stream, /export-excel
 """
 
 import pytest
 import requests
 import os
+import time
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
 
+# Test credentials
+TEST_EMAIL = "ibrahimznrmak@gmail.com"
+TEST_PASSWORD = "Szd.dl_34"
+
+# Authenticated session; every kombinasyonlar endpoint works on the caller's workspace
+api = requests.Session()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def auth_session():
+    """Log in once for the module"""
+    response = requests.post(
+        f"{BASE_URL}/api/auth/login",
+        json={"email": TEST_EMAIL, "password": TEST_PASSWORD}
+    )
+    assert response.status_code == 200, f"Login failed: {response.text}"
+    api.headers.update({"Authorization": f"Bearer {response.json()['access_token']}"})
+
 
 class TestKombinasyonlarStats:
     """Test /api/kombinasyonlar/stats endpoint"""
     
+    def test_stats_requires_auth(self):
+        """Stats endpoint should reject anonymous requests"""
+        response = requests.get(f"{BASE_URL}/api/kombinasyonlar/stats")
+        assert response.status_code in (401, 403)
+    
     def test_stats_returns_200(self):
         """Stats endpoint should return 200"""
-        response = requests.get(f"{BASE_URL}/api/kombinasyonlar/stats")
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/stats")
         assert response.status_code == 200
         
     def test_stats_returns_total_combinations(self):
         """Stats should return total_combinations field"""
-        response = requests.get(f"{BASE_URL}/api/kombinasyonlar/stats")
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/stats")
         data = response.json()
         assert "total_combinations" in data
         assert isinstance(data["total_combinations"], int)
@@ -32,9 +56,9 @@ class TestKombinasyonlarGenerate:
     def test_generate_small_batch(self):
         """Generate small batch of combinations"""
         # First clear cache
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
         
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
@@ -48,14 +72,14 @@ class TestKombinasyonlarGenerate:
     def test_generate_adds_to_existing(self):
         """Generate should add to existing combinations"""
         # Clear and generate initial batch
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 50}
         )
         
         # Generate more
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 50}
         )
@@ -64,7 +88,7 @@ class TestKombinasyonlarGenerate:
         
     def test_generate_invalid_count(self):
         """Generate with invalid count should return 400"""
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 0}
         )
@@ -72,7 +96,7 @@ class TestKombinasyonlarGenerate:
         
     def test_generate_exceeds_max(self):
         """Generate exceeding max should return 400"""
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 20000000}
         )
@@ -85,13 +109,13 @@ class TestKombinasyonlarClear:
     def test_clear_cache(self):
         """Clear should remove all combinations"""
         # Generate some combinations first
-        requests.post(
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
         
         # Clear
-        response = requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        response = api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
         assert response.status_code == 200
         
         data = response.json()
@@ -99,7 +123,7 @@ class TestKombinasyonlarClear:
         assert "message" in data
         
         # Verify stats is 0
-        stats = requests.get(f"{BASE_URL}/api/kombinasyonlar/stats").json()
+        stats = api.get(f"{BASE_URL}/api/kombinasyonlar/stats").json()
         assert stats["total_combinations"] == 0
 
 
@@ -108,9 +132,9 @@ class TestKombinasyonlarSearch:
     
     def test_search_empty_cache(self):
         """Search in empty cache should return not found"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
         
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/api/kombinasyonlar/search",
             json={"combination_str": "5,12,23,27,34+8"}
         )
@@ -123,13 +147,13 @@ class TestKombinasyonlarSearch:
     def test_search_format_with_plus(self):
         """Search with format: 5,12,23,27,34+8"""
         # Generate combinations first
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
         
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/api/kombinasyonlar/search",
             json={"combination_str": "5,12,23,27,34+8"}
         )
@@ -142,13 +166,13 @@ class TestKombinasyonlarSearch:
         
     def test_search_format_with_dash(self):
         """Search with format: 5-12-23-27-34-8"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
         
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/api/kombinasyonlar/search",
             json={"combination_str": "5-12-23-27-34-8"}
         )
@@ -159,13 +183,13 @@ class TestKombinasyonlarSearch:
         
     def test_search_format_with_spaces(self):
         """Search with format: 5 12 23 27 34 8"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
         
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/api/kombinasyonlar/search",
             json={"combination_str": "5 12 23 27 34 8"}
         )
@@ -173,13 +197,13 @@ class TestKombinasyonlarSearch:
         
     def test_search_invalid_main_numbers(self):
         """Search with invalid main numbers (>34)"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
         
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/api/kombinasyonlar/search",
             json={"combination_str": "5,12,23,27,50+8"}
         )
@@ -189,13 +213,13 @@ class TestKombinasyonlarSearch:
         
     def test_search_invalid_bonus_number(self):
         """Search with invalid bonus number (>14)"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
         
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/api/kombinasyonlar/search",
             json={"combination_str": "5,12,23,27,34+20"}
         )
@@ -205,13 +229,13 @@ class TestKombinasyonlarSearch:
         
     def test_search_duplicate_main_numbers(self):
         """Search with duplicate main numbers"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
         
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/api/kombinasyonlar/search",
             json={"combination_str": "5,5,23,27,34+8"}
         )
@@ -220,14 +244,55 @@ class TestKombinasyonlarSearch:
         assert "farklı" in data["message"]
 
 
+class TestKombinasyonlarFilter:
+    """Test /api/kombinasyonlar/filter endpoint"""
+    
+    def test_filter_exact_five(self):
+        """Filtering by a generated five should find it"""
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
+            f"{BASE_URL}/api/kombinasyonlar/generate",
+            json={"num_combinations": 100}
+        )
+        comb = api.get(f"{BASE_URL}/api/kombinasyonlar/combination/1").json()
+        
+        response = api.post(
+            f"{BASE_URL}/api/kombinasyonlar/filter",
+            json={"main_numbers": comb["main_numbers"], "bonus_number": comb["bonus_number"]}
+        )
+        data = response.json()
+        assert data["found"] == True
+        assert data["mode"] == "exact"
+        assert data["results"][0]["index"] == 1
+        
+    def test_filter_partial_numbers(self):
+        """Filtering by fewer than 5 numbers returns rows containing all of them"""
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
+            f"{BASE_URL}/api/kombinasyonlar/generate",
+            json={"num_combinations": 10000}
+        )
+        
+        response = api.post(
+            f"{BASE_URL}/api/kombinasyonlar/filter",
+            json={"main_numbers": [7, 23]}
+        )
+        data = response.json()
+        assert data["mode"] == "partial"
+        assert data["total_found"] > 0
+        for item in data["results"]:
+            assert 7 in item["main_numbers"]
+            assert 23 in item["main_numbers"]
+
+
 class TestKombinasyonlarSample:
     """Test /api/kombinasyonlar/sample endpoint"""
     
     def test_sample_empty_cache(self):
         """Sample from empty cache should return empty list"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
         
-        response = requests.get(f"{BASE_URL}/api/kombinasyonlar/sample?count=5")
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/sample?count=5")
         assert response.status_code == 200
         
         data = response.json()
@@ -235,13 +300,13 @@ class TestKombinasyonlarSample:
         
     def test_sample_returns_correct_count(self):
         """Sample should return requested count"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
         
-        response = requests.get(f"{BASE_URL}/api/kombinasyonlar/sample?count=5")
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/sample?count=5")
         assert response.status_code == 200
         
         data = response.json()
@@ -249,13 +314,13 @@ class TestKombinasyonlarSample:
         
     def test_sample_structure(self):
         """Sample items should have correct structure"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
         
-        response = requests.get(f"{BASE_URL}/api/kombinasyonlar/sample?count=1")
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/sample?count=1")
         data = response.json()
         
         assert len(data) == 1
@@ -273,20 +338,20 @@ class TestKombinasyonlarExportExcel:
     
     def test_export_empty_cache(self):
         """Export from empty cache should return 400"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
         
-        response = requests.get(f"{BASE_URL}/api/kombinasyonlar/export-excel")
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/export-excel")
         assert response.status_code == 400
         
     def test_export_returns_excel(self):
         """Export should return Excel file"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
         
-        response = requests.get(f"{BASE_URL}/api/kombinasyonlar/export-excel")
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/export-excel")
         assert response.status_code == 200
         assert "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" in response.headers.get("Content-Type", "")
         assert len(response.content) > 0
@@ -297,13 +362,13 @@ class TestKombinasyonlarCombinationByIndex:
     
     def test_get_combination_by_index(self):
         """Get specific combination by index"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 100}
         )
         
-        response = requests.get(f"{BASE_URL}/api/kombinasyonlar/combination/1")
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/combination/1")
         assert response.status_code == 200
         
         data = response.json()
@@ -313,20 +378,145 @@ class TestKombinasyonlarCombinationByIndex:
         
     def test_get_combination_not_found(self):
         """Get non-existent combination should return 404"""
-        requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
-        requests.post(
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
             f"{BASE_URL}/api/kombinasyonlar/generate",
             json={"num_combinations": 10}
         )
         
-        response = requests.get(f"{BASE_URL}/api/kombinasyonlar/combination/999")
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/combination/999")
+        assert response.status_code == 404
+
+
+class TestKombinasyonlarAnalytics:
+    """Test /api/kombinasyonlar/analytics endpoint"""
+    
+    def test_analytics_shapes(self):
+        """Analytics should cover all numbers and add up to the set size"""
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        api.post(
+            f"{BASE_URL}/api/kombinasyonlar/generate",
+            json={"num_combinations": 1000}
+        )
+        
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/analytics")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["total"] == 1000
+        assert len(data["number_frequency"]) == 34
+        assert sum(data["number_frequency"]) == 5000
+        assert sum(data["bonus_distribution"]) == 1000
+        assert len(data["pair_matrix"]) == 34
+        assert sum(data["odd_counts"]) == 1000
+        assert sum(data["high_counts"]) == 1000
+        
+    def test_analytics_empty_cache(self):
+        """Analytics on an empty set should return 400"""
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/analytics")
+        assert response.status_code == 400
+
+
+class TestKombinasyonlarJobs:
+    """Test background generation jobs (/generate background=true, /jobs/{job_id})"""
+    
+    def test_background_generate_returns_job(self):
+        """Background generate should return a job id that can be polled"""
+        api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+        
+        response = api.post(
+            f"{BASE_URL}/api/kombinasyonlar/generate",
+            json={"num_combinations": 1000, "seed": 42, "background": True}
+        )
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["job_id"]
+        
+        for _ in range(50):
+            job = api.get(f"{BASE_URL}/api/kombinasyonlar/jobs/{data['job_id']}").json()
+            if job["status"] not in ("starting", "processing"):
+                break
+            time.sleep(0.2)
+        
+        assert job["status"] == "completed"
+        assert job["generated"] == 1000
+        assert "rate" in job
+        
+        stats = api.get(f"{BASE_URL}/api/kombinasyonlar/stats").json()
+        assert stats["total_combinations"] == 1000
+        assert stats["active_job"] is None
+        
+    def test_unknown_job(self):
+        """Unknown job id should report not_found"""
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/jobs/gen_yok")
+        assert response.json()["status"] == "not_found"
+        
+        response = api.post(f"{BASE_URL}/api/kombinasyonlar/jobs/gen_yok/cancel")
         assert response.status_code == 404
 
 
+class TestKombinasyonlarRange:
+    """Test /api/kombinasyonlar/range and /stream endpoints"""
+    
+    def test_range_window(self):
+        """Range should return compact rows starting at the requested index"""
+        api.post(f"{BASE_URL}/api/kombinasyonlar/generate", json={"num_combinations": 500, "seed": 9})
+        
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/range", params={"start": 491, "limit": 20})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 500
+        assert data["count"] == 10
+        assert data["next_start"] is None
+        assert len(data["rows"][0]) == 6
+        
+        single = api.get(f"{BASE_URL}/api/kombinasyonlar/combination/491").json()
+        assert data["rows"][0] == single["main_numbers"] + [single["bonus_number"]]
+        
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/range", params={"start": 0})
+        assert response.status_code == 400
+        
+    def test_stream_cursor(self):
+        """Stream pages should continue through X-Next-Cursor"""
+        api.post(f"{BASE_URL}/api/kombinasyonlar/generate", json={"num_combinations": 300, "seed": 9})
+        
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/stream", params={"limit": 200})
+        assert response.status_code == 200
+        first = [line for line in response.text.splitlines() if line]
+        assert len(first) == 200
+        assert response.headers["X-Total-Count"] == "300"
+        cursor = response.headers["X-Next-Cursor"]
+        
+        response = api.get(f"{BASE_URL}/api/kombinasyonlar/stream", params={"cursor": cursor})
+        rest = [line for line in response.text.splitlines() if line]
+        assert len(rest) == 100
+        assert "X-Next-Cursor" not in response.headers
+        assert rest[0].startswith("[201,")
+
+
+
+class TestKombinasyonlarSnapshots:
+    """Test snapshot retention"""
+    
+    def test_old_versions_are_pruned(self):
+        """Only the newest versions of a snapshot name are kept, the active one included"""
+        for _ in range(5):
+            response = api.post(f"{BASE_URL}/api/kombinasyonlar/generate", json={"num_combinations": 10})
+            assert response.status_code == 200
+        
+        data = api.get(f"{BASE_URL}/api/kombinasyonlar/snapshots", params={"name": "varsayilan"}).json()
+        versions = [snapshot["version"] for snapshot in data["snapshots"]]
+        assert 1 <= len(versions) <= 3
+        assert data["active"]["version"] == versions[0]
+
+
 # Cleanup fixture
 @pytest.fixture(scope="module", autouse=True)
 def cleanup():
     """Cleanup after all tests"""
     yield
     # Clear cache after tests
-    requests.post(f"{BASE_URL}/api/kombinasyonlar/clear")
+    api.post(f"{BASE_URL}/api/kombinasyonlar/clear")
@@ -0,0 +1,199 @@
+"""
+Offline benchmark suite for the Kombinasyonlar router
+Drives the router in-process with the FastAPI TestClient (no live server, no database)
+and measures time (pytest-benchmark) and peak memory (tracemalloc) for
+generate (10k / 100k / 1.03M), search, filter, sample and export.
+
+Run:     pytest tests/test_kombinasyonlar_benchmark.py
+Record:  KOMBINASYON_BENCH_RECORD=1 pytest tests/test_kombinasyonlar_benchmark.py
+
+Each result is checked against tests/benchmarks/kombinasyonlar_baseline.json:
+mean time may grow up to KOMBINASYON_BENCH_TIME_TOLERANCE (default 2.0x) and
+peak memory up to KOMBINASYON_BENCH_MEMORY_TOLERANCE (default 1.25x).
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import json
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import kombinasyon_store
+from routers.auth import get_current_user
+from routers.kombinasyonlar import router
+
+BASELINE_FILE = Path(__file__).parent / "benchmarks" / "kombinasyonlar_baseline.json"
+RECORD = os.environ.get("KOMBINASYON_BENCH_RECORD") == "1"
+TIME_TOLERANCE = float(os.environ.get("KOMBINASYON_BENCH_TIME_TOLERANCE", "2.0"))
+MEMORY_TOLERANCE = float(os.environ.get("KOMBINASYON_BENCH_MEMORY_TOLERANCE", "1.25"))
+
+FULL_SET = 1030144
+SMALL_SET = 10000
+SEED = 20240101
+
+# Workspace the in-process requests run as
+USER = {"id": "bench"}
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    """TestClient over the router alone, with snapshots in a temp directory"""
+    snapshot_dir = kombinasyon_store.SNAPSHOT_DIR
+    kombinasyon_store.SNAPSHOT_DIR = tmp_path_factory.mktemp("kombinasyonlar")
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.dependency_overrides[get_current_user] = lambda: USER
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    kombinasyon_store.SNAPSHOT_DIR = snapshot_dir
+    kombinasyon_store.SNAPSHOT_CACHE.clear()
+
+
+@pytest.fixture(scope="module")
+def baselines():
+    """Recorded baselines; rewritten at the end of the module in record mode"""
+    data = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+    yield data
+    if RECORD:
+        BASELINE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_FILE.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def _use_workspace(client, workspace: str, size: int):
+    """Switch to a workspace holding a `size`-row set, generating it once"""
+    USER["id"] = workspace
+    stats = client.get("/api/kombinasyonlar/stats").json()
+    if stats["total_combinations"] != size:
+        response = client.post(
+            "/api/kombinasyonlar/generate",
+            json={"num_combinations": size, "seed": SEED}
+        )
+        assert response.status_code == 200
+
+
+@pytest.fixture
+def full_set(client):
+    _use_workspace(client, "bench-full", FULL_SET)
+    return client
+
+
+@pytest.fixture
+def small_set(client):
+    _use_workspace(client, "bench-small", SMALL_SET)
+    return client
+
+
+def _peak_memory(fn) -> int:
+    """Peak traced allocation (bytes) of one call"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(benchmark, baselines, name: str, fn, rounds: int = 3):
+    """Time `fn`, measure its peak memory and compare both against the baseline"""
+    result = benchmark.pedantic(fn, rounds=rounds, iterations=1, warmup_rounds=1)
+    peak_mb = _peak_memory(fn) / (1024 * 1024)
+    mean_s = benchmark.stats.stats.mean
+    benchmark.extra_info["peak_memory_mb"] = round(peak_mb, 2)
+
+    if RECORD:
+        baselines[name] = {"mean_s": round(mean_s, 4), "peak_memory_mb": round(peak_mb, 2)}
+        return result
+
+    baseline = baselines.get(name)
+    if baseline:
+        # 10ms of slack keeps millisecond-scale endpoints from flaking on timer noise
+        assert mean_s <= baseline["mean_s"] * TIME_TOLERANCE + 0.01, (
+            f"{name}: {mean_s:.4f}s, baseline {baseline['mean_s']}s"
+        )
+        assert peak_mb <= baseline["peak_memory_mb"] * MEMORY_TOLERANCE, (
+            f"{name}: {peak_mb:.2f}MB, baseline {baseline['peak_memory_mb']}MB"
+        )
+    return result
+
+
+@pytest.mark.parametrize("size", [10000, 100000, FULL_SET], ids=["10k", "100k", "1.03M"])
+def test_generate(benchmark, baselines, client, size):
+    """Generate (and publish) a new set"""
+    USER["id"] = f"bench-generate-{size}"
+
+    def generate():
+        response = client.post(
+            "/api/kombinasyonlar/generate",
+            json={"num_combinations": size, "seed": SEED}
+        )
+        assert response.status_code == 200
+        return response
+
+    response = run_benchmark(benchmark, baselines, f"generate_{size}", generate)
+    assert response.json()["total_count"] == size
+
+
+def test_search(benchmark, baselines, full_set):
+    """Exact search of a row from the middle of the full set"""
+    target = full_set.get(f"/api/kombinasyonlar/combination/{FULL_SET // 2}").json()
+
+    def search():
+        return full_set.post(
+            "/api/kombinasyonlar/search",
+            json={"combination_str": target["formatted"]}
+        )
+
+    response = run_benchmark(benchmark, baselines, "search", search, rounds=20)
+    assert FULL_SET // 2 in response.json()["indices"]
+
+
+@pytest.mark.parametrize("numbers", [[3, 9, 17, 25, 31], [7, 23]], ids=["exact", "partial"])
+def test_filter(benchmark, baselines, full_set, numbers):
+    """Filter by all five numbers (rank index) and by two numbers (bitmaps)"""
+    def filter_combinations():
+        return full_set.post("/api/kombinasyonlar/filter", json={"main_numbers": numbers})
+
+    response = run_benchmark(
+        benchmark, baselines, f"filter_{len(numbers)}", filter_combinations, rounds=10
+    )
+    assert response.status_code == 200
+
+
+def test_sample(benchmark, baselines, full_set):
+    """Random sample from the full set"""
+    def sample():
+        return full_set.get("/api/kombinasyonlar/sample", params={"count": 100})
+
+    response = run_benchmark(benchmark, baselines, "sample", sample, rounds=20)
+    assert len(response.json()) == 100
+
+
+def test_export_csv(benchmark, baselines, full_set):
+    """Streamed CSV export of the full set"""
+    def export():
+        return full_set.get("/api/kombinasyonlar/export-excel", params={"format": "csv"})
+
+    response = run_benchmark(benchmark, baselines, "export_csv_full", export, rounds=2)
+    # header + one line per row
+    assert response.content.count(b"\n") == FULL_SET + 1
+
+
+def test_export_xlsx(benchmark, baselines, small_set):
+    """Write-only XLSX export (10k rows; openpyxl cost grows linearly)"""
+    def export():
+        return small_set.get("/api/kombinasyonlar/export-excel")
+
+    response = run_benchmark(benchmark, baselines, "export_xlsx_10k", export, rounds=2)
+    assert response.content[:2] == b"PK"
@@ -0,0 +1,72 @@
+"""
+Test cases for the media lookup
+Tests medya_by_rapor, delete_medya and the report ZIP entries built from
+them on a scratch database, with one media file on disk and one whose file
+is missing
+"""
+import asyncio
+
+import medya
+from routers.raporlar import _rapor_zip_entries
+
+RAPOR = {"id": "rapor-1", "rapor_no": "PK2026-ANK001", "ekipman_adi": "Forklift", "sehir": "Ankara"}
+
+
+async def _seed(db, tmp_path):
+    """rapor-1 has a photo on disk and a PDF whose file is gone; rapor-2 has no media"""
+    photo = tmp_path / "foto.jpg"
+    photo.write_bytes(b"\xff\xd8 foto")
+    await db.medya_dosyalari.insert_many([
+        {"id": "m1", "rapor_id": "rapor-1", "dosya_adi": "ön foto.jpg", "dosya_yolu": str(photo)},
+        {"id": "m2", "rapor_id": "rapor-1", "dosya_adi": "sertifika.pdf", "dosya_yolu": str(tmp_path / "yok.pdf")},
+        {"id": "m3", "rapor_id": "rapor-3", "dosya_adi": "diger.jpg", "dosya_yolu": str(tmp_path / "diger.jpg")}
+    ])
+    return photo
+
+
+class TestMedyaByRapor:
+    """Grouped media lookup"""
+
+    def test_existing_missing_and_empty(self, scratch_db, monkeypatch, tmp_path):
+        """Test grouping, projection and that only the existing file makes it into the ZIP"""
+        async def scenario():
+            async with scratch_db() as db:
+                monkeypatch.setattr(medya, "db", db)
+                # Two reports per query, so the lookup runs in more than one chunk
+                monkeypatch.setattr(medya, "MEDYA_LOOKUP_CHUNK", 2)
+                photo = await _seed(db, tmp_path)
+                grouped = await medya.medya_by_rapor(["rapor-1", "rapor-2", "rapor-1", "rapor-3"])
+                projected = await medya.medya_by_rapor(["rapor-1"], {"_id": 0, "rapor_id": 1, "id": 1})
+                return photo, grouped, projected
+
+        photo, grouped, projected = asyncio.run(scenario())
+        assert list(grouped) == ["rapor-1", "rapor-2", "rapor-3"]
+        assert sorted(dosya["id"] for dosya in grouped["rapor-1"]) == ["m1", "m2"]
+        assert grouped["rapor-2"] == []
+        assert all("_id" not in dosya for dosya in grouped["rapor-1"])
+        assert sorted(projected["rapor-1"], key=lambda dosya: dosya["id"]) == [
+            {"rapor_id": "rapor-1", "id": "m1"}, {"rapor_id": "rapor-1", "id": "m2"}
+        ]
+
+        entries = _rapor_zip_entries(RAPOR, "Forklift/PK2026-ANK001", grouped["rapor-1"], set())
+        assert [entry.arcname for entry in entries] == ["Forklift/PK2026-ANK001/bilgi.txt", "Forklift/PK2026-ANK001/ön_foto.jpg"]
+        assert entries[1].path == str(photo)
+
+
+class TestDeleteMedya:
+    """Media deletion"""
+
+    def test_delete_removes_files_and_documents(self, scratch_db, monkeypatch, tmp_path):
+        """Test that files and documents go, a missing file is tolerated and other reports are kept"""
+        async def scenario():
+            async with scratch_db() as db:
+                monkeypatch.setattr(medya, "db", db)
+                photo = await _seed(db, tmp_path)
+                deleted = await medya.delete_medya(["rapor-1", "rapor-2"])
+                remaining = await db.medya_dosyalari.find({}, {"_id": 0, "id": 1}).to_list(None)
+                return photo, deleted, remaining
+
+        photo, deleted, remaining = asyncio.run(scenario())
+        assert deleted == 2
+        assert not photo.exists()
+        assert remaining == [{"id": "m3"}]
@@ -0,0 +1,87 @@
+"""
+Test cases for report number allocation
+Tests reserve_rapor_nos / generate_rapor_no (atomic per-city counters) and
+backfill_rapor_no_counters on a scratch database
+"""
+import asyncio
+from datetime import datetime, timezone
+
+import utils
+from utils import RAPOR_NO_PATTERN, backfill_rapor_no_counters, generate_rapor_no, reserve_rapor_nos
+
+YEAR = datetime.now(timezone.utc).strftime("%Y")
+
+
+async def _counters_db(db, monkeypatch):
+    """Point utils at the scratch database, with the unique counter index startup creates"""
+    monkeypatch.setattr(utils, "db", db)
+    await db.rapor_no_counters.create_index([("year", 1), ("sehir_kodu", 1)], unique=True)
+
+
+def _sira(rapor_no: str) -> int:
+    return int(RAPOR_NO_PATTERN.match(rapor_no).group(3))
+
+
+class TestReserveRaporNos:
+    """Concurrent reservations for the same city"""
+
+    def test_concurrent_reservations_are_unique_and_consecutive(self, scratch_db, monkeypatch):
+        """Test that concurrent blocks never overlap and together cover 1..N without gaps"""
+        async def scenario():
+            async with scratch_db() as db:
+                await _counters_db(db, monkeypatch)
+                blocks = await asyncio.gather(
+                    *(reserve_rapor_nos("Ankara", 3) for _ in range(20)),
+                    *(generate_rapor_no("Ankara") for _ in range(10))
+                )
+                return [block if isinstance(block, list) else [block] for block in blocks]
+
+        blocks = asyncio.run(scenario())
+        numbers = [rapor_no for block in blocks for rapor_no in block]
+        assert len(numbers) == 70
+        assert len(set(numbers)) == 70
+        assert all(rapor_no.startswith(f"PK{YEAR}-ANK") for rapor_no in numbers)
+        assert sorted(_sira(rapor_no) for rapor_no in numbers) == list(range(1, 71))
+        for block in blocks:
+            siralar = [_sira(rapor_no) for rapor_no in block]
+            assert siralar == list(range(siralar[0], siralar[0] + len(block)))
+
+    def test_cities_have_separate_counters(self, scratch_db, monkeypatch):
+        """Test that each city starts its own sequence"""
+        async def scenario():
+            async with scratch_db() as db:
+                await _counters_db(db, monkeypatch)
+                return await reserve_rapor_nos("Ankara", 2), await reserve_rapor_nos("İzmir", 1)
+
+        ankara, izmir = asyncio.run(scenario())
+        assert ankara == [f"PK{YEAR}-ANK001", f"PK{YEAR}-ANK002"]
+        assert izmir == [f"PK{YEAR}-IZM001"]
+
+
+class TestBackfillRaporNoCounters:
+    """Counter seeding from existing reports"""
+
+    def test_backfill_seeds_from_existing_max(self, scratch_db, monkeypatch):
+        """Test that counters continue after the highest stored number, once"""
+        async def scenario():
+            async with scratch_db() as db:
+                await _counters_db(db, monkeypatch)
+                await db.raporlar.insert_many([
+                    {"rapor_no": f"PK{YEAR}-ANK007"},
+                    {"rapor_no": f"PK{YEAR}-ANK012"},
+                    {"rapor_no": f"PK{YEAR}-ANK003"},
+                    {"rapor_no": f"PK{YEAR}-IST004"},
+                    {"rapor_no": "ESKI-001"}
+                ])
+                seeded = await backfill_rapor_no_counters()
+                ankara = await generate_rapor_no("Ankara")
+                istanbul = await reserve_rapor_nos("İstanbul", 2)
+                again = await backfill_rapor_no_counters()
+                return seeded, ankara, istanbul, again
+
+        seeded, ankara, istanbul, again = asyncio.run(scenario())
+        assert seeded == 2
+        assert ankara == f"PK{YEAR}-ANK013"
+        assert istanbul == [f"PK{YEAR}-IST005", f"PK{YEAR}-IST006"]
+        # The counters exist now: a second backfill leaves them alone
+        assert again == 0
@@ -0,0 +1,81 @@
+"""
+Test cases for the streaming ZIP writer
+Archives produced by iter_zip / write_entries are read back with
+zipfile.ZipFile; no server or database needed
+"""
+import io
+import os
+import zipfile
+
+from zip_stream import COPY_CHUNK_SIZE, ZipEntry, iter_file_and_remove, iter_zip, unique_arcname, write_entries
+
+
+def _files(tmp_path):
+    """Entries for a multi-chunk photo, a text file, in-memory text and a file that is gone"""
+    photo = tmp_path / "foto.jpg"
+    photo.write_bytes(os.urandom(2 * COPY_CHUNK_SIZE + 123))
+    notes = tmp_path / "notlar.txt"
+    notes.write_text("Periyodik kontrol notları\n" * 5000, encoding="utf-8")
+    entries = [
+        ZipEntry("rapor/foto.jpg", path=str(photo)),
+        ZipEntry("rapor/notlar.txt", path=str(notes)),
+        ZipEntry("rapor/bilgi.txt", text="Rapor No: PK2026-ANK001\nŞehir: Ankara"),
+        ZipEntry("rapor/silinen.png", path=str(tmp_path / "silinen.png"))
+    ]
+    return entries, photo, notes
+
+
+class TestIterZip:
+    """iter_zip round trip"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that streamed entries read back intact and missing files are skipped"""
+        entries, photo, notes = _files(tmp_path)
+        chunks = list(iter_zip(entries))
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 2 * COPY_CHUNK_SIZE for chunk in chunks)
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+            assert zf.testzip() is None
+            assert zf.namelist() == ["rapor/foto.jpg", "rapor/notlar.txt", "rapor/bilgi.txt"]
+            assert zf.read("rapor/foto.jpg") == photo.read_bytes()
+            assert zf.read("rapor/notlar.txt") == notes.read_bytes()
+            assert zf.read("rapor/bilgi.txt").decode("utf-8") == "Rapor No: PK2026-ANK001\nŞehir: Ankara"
+            assert zf.getinfo("rapor/foto.jpg").compress_type == zipfile.ZIP_STORED
+            assert zf.getinfo("rapor/notlar.txt").compress_type == zipfile.ZIP_DEFLATED
+            assert zf.getinfo("rapor/notlar.txt").compress_size < notes.stat().st_size
+
+    def test_empty_archive(self):
+        """Test that no entries still give a valid (empty) archive"""
+        with zipfile.ZipFile(io.BytesIO(b"".join(iter_zip([])))) as zf:
+            assert zf.namelist() == []
+
+    def test_write_entries_matches(self, tmp_path):
+        """Test that write_entries on disk writes the same entries and counts them"""
+        entries, photo, _ = _files(tmp_path)
+        archive = tmp_path / "arsiv.zip"
+        with zipfile.ZipFile(archive, "w", allowZip64=True) as zf:
+            assert write_entries(zf, entries) == 3
+        with zipfile.ZipFile(archive) as zf:
+            assert zf.namelist() == ["rapor/foto.jpg", "rapor/notlar.txt", "rapor/bilgi.txt"]
+            assert zf.read("rapor/foto.jpg") == photo.read_bytes()
+
+
+class TestHelpers:
+    """unique_arcname and iter_file_and_remove"""
+
+    def test_unique_arcname(self):
+        """Test that repeated names get _1, _2 before the extension"""
+        used = set()
+        names = [unique_arcname("foto.jpg", used) for _ in range(3)]
+        assert names == ["foto.jpg", "foto_1.jpg", "foto_2.jpg"]
+
+    def test_iter_file_and_remove(self, tmp_path):
+        """Test that the file is streamed in chunks and deleted afterwards"""
+        path = tmp_path / "export.zip"
+        data = os.urandom(COPY_CHUNK_SIZE + 10)
+        path.write_bytes(data)
+        chunks = list(iter_file_and_remove(str(path)))
+        assert [len(chunk) for chunk in chunks] == [COPY_CHUNK_SIZE, 10]
+        assert b"".join(chunks) == data
+        assert not path.exists()
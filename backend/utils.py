@@ -1,6 +1,15 @@
+import re
 from datetime import datetime, timezone
+from typing import List
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from constants import SEHIRLER
 from database import db
+from indexes import register_index
+
+register_index("rapor_no_counters", [("year", 1), ("sehir_kodu", 1)], unique=True)
+
+RAPOR_NO_PATTERN = re.compile(r"^PK(\d{4})-(\D+)(\d+)$")
 
 def get_sehir_kodu(sehir_ismi: str) -> str:
     """Get city code from city name"""
@@ -9,29 +18,60 @@ def get_sehir_kodu(sehir_ismi: str) -> str:
             return sehir['kod']
     return "XXX"  # Default if not found
 
+def _rapor_no_counter_key(sehir: str) -> dict:
+    year = datetime.now(timezone.utc).strftime("%Y")
+    return {"year": year, "sehir_kodu": get_sehir_kodu(sehir)}
+
+
+def format_rapor_no(year: str, sehir_kodu: str, sira: int) -> str:
+    """PKYYYY-SEHIRKODU### (the sequence is zero-padded to at least 3 digits)"""
+    return f"PK{year}-{sehir_kodu}{str(sira).zfill(3)}"
+
+
+async def reserve_rapor_nos(sehir: str, count: int) -> List[str]:
+    """
+    Atomically reserve `count` consecutive report numbers for the city in the
+    current year ($inc on the (year, sehir_kodu) counter, created on first use)
+    """
+    key = _rapor_no_counter_key(sehir)
+    try:
+        counter = await db.rapor_no_counters.find_one_and_update(
+            key, {"$inc": {"seq": count}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # Two first-time upserts raced on the unique key; the counter exists now
+        counter = await db.rapor_no_counters.find_one_and_update(
+            key, {"$inc": {"seq": count}}, return_document=ReturnDocument.AFTER
+        )
+    last = counter["seq"]
+    return [format_rapor_no(key["year"], key["sehir_kodu"], sira) for sira in range(last - count + 1, last + 1)]
+
+
 async def generate_rapor_no(sehir: str):
     """
     Generate report number in format: PKYYYY-SEHIRKODU###
     Example: PK2025-ANK025 (for Ankara)
     """
-    now = datetime.now(timezone.utc)
-    year = now.strftime("%Y")
-    
-    # Get city code from city name
-    sehir_kodu = get_sehir_kodu(sehir)
-    prefix = f"PK{year}-{sehir_kodu}"
-    
-    # Get the last report for this city and year
-    last_report = await db.raporlar.find_one(
-        {"rapor_no": {"$regex": f"^{prefix}"}},
-        sort=[("created_at", -1)]
-    )
+    return (await reserve_rapor_nos(sehir, 1))[0]
+
+
+async def backfill_rapor_no_counters() -> int:
+    """
+    Seed the counters from existing report numbers (once: only while the
+    counter collection is empty). $max keeps a counter that already moved on.
+    """
+    if await db.rapor_no_counters.count_documents({}, limit=1):
+        return 0
     
-    if last_report:
-        last_no_str = last_report["rapor_no"].split(sehir_kodu)[-1]
-        last_no = int(last_no_str)
-        new_no = last_no + 1
-    else:
-        new_no = 1
+    highest = {}
+    async for rapor in db.raporlar.find({"rapor_no": {"$regex": "^PK"}}, {"_id": 0, "rapor_no": 1}):
+        match = RAPOR_NO_PATTERN.match(rapor.get("rapor_no") or "")
+        if match:
+            year, sehir_kodu, sira = match.group(1), match.group(2), int(match.group(3))
+            highest[(year, sehir_kodu)] = max(highest.get((year, sehir_kodu), 0), sira)
     
-    return f"{prefix}{str(new_no).zfill(3)}"
+    for (year, sehir_kodu), sira in highest.items():
+        await db.rapor_no_counters.update_one(
+            {"year": year, "sehir_kodu": sehir_kodu}, {"$max": {"seq": sira}}, upsert=True
+        )
+    return len(highest)
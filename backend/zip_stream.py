@@ -0,0 +1,140 @@
+"""
+Streaming ZIP writer
+Archives are described as a list of ZipEntry (a file on disk or in-memory
+text) and written entry by entry: iter_zip() yields the archive as it is
+produced so a StreamingResponse can send media straight from uploads/
+without staging copies, and write_entries() appends to an archive on disk.
+Already-compressed formats (JPG, PNG, PDF, Office files, ...) are STORED;
+everything else is deflated. iter_file_and_remove() streams a finished
+temporary file (archive or export) and deletes it afterwards.
+"""
+
+import os
+import time
+import zipfile
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Deflating these costs CPU for (almost) no size gain
+STORED_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".pdf",
+    ".zip", ".rar", ".7z", ".gz", ".mp4", ".mov", ".mp3",
+    ".docx", ".xlsx", ".pptx"
+}
+
+
+class ZipEntry(NamedTuple):
+    arcname: str
+    path: Optional[str] = None
+    text: Optional[str] = None
+
+
+def compression_for(name: str) -> int:
+    return zipfile.ZIP_STORED if os.path.splitext(name)[1].lower() in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+def safe_name(name: str, allowed: str = ".-_") -> str:
+    """Replace every character that is not alphanumeric or in `allowed` with '_'"""
+    return "".join(c if c.isalnum() or c in allowed else "_" for c in name)
+
+
+def unique_arcname(arcname: str, used: set) -> str:
+    """arcname, or arcname with _1, _2, ... before the extension if already taken"""
+    base, ext = os.path.splitext(arcname)
+    candidate, counter = arcname, 1
+    while candidate in used:
+        candidate = f"{base}_{counter}{ext}"
+        counter += 1
+    used.add(candidate)
+    return candidate
+
+
+def _zip_info(entry: ZipEntry) -> zipfile.ZipInfo:
+    mtime = os.path.getmtime(entry.path) if entry.path else time.time()
+    info = zipfile.ZipInfo(entry.arcname, date_time=time.localtime(mtime)[:6])
+    info.compress_type = compression_for(entry.arcname) if entry.path else zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def _write_entry(zf: zipfile.ZipFile, entry: ZipEntry) -> Iterator[None]:
+    """Write one entry, pausing (yield) after every chunk"""
+    if entry.path is None:
+        zf.writestr(_zip_info(entry), entry.text or "")
+        yield
+        return
+
+    with open(entry.path, "rb") as src, zf.open(_zip_info(entry), "w", force_zip64=True) as dst:
+        while True:
+            chunk = src.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            dst.write(chunk)
+            yield
+
+
+class _StreamSink:
+    """Write-only, unseekable target: zipfile then writes data descriptors and never seeks back"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(entries: Iterable[ZipEntry]) -> Iterator[bytes]:
+    """
+    Yield the archive piece by piece (at most about COPY_CHUNK_SIZE buffered).
+    A sync generator on purpose: StreamingResponse runs it in the threadpool,
+    so the file reads never block the event loop. Files that disappeared
+    since the entry list was built are skipped.
+    """
+    sink = _StreamSink()
+    with zipfile.ZipFile(sink, "w", allowZip64=True) as zf:
+        for entry in entries:
+            if entry.path is not None and not os.path.isfile(entry.path):
+                continue
+            for _ in _write_entry(zf, entry):
+                data = sink.drain()
+                if data:
+                    yield data
+    # central directory
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def write_entries(zf: zipfile.ZipFile, entries: Iterable[ZipEntry]) -> int:
+    """Append entries to an open ZipFile (blocking); returns how many were written"""
+    written = 0
+    for entry in entries:
+        if entry.path is not None and not os.path.isfile(entry.path):
+            continue
+        for _ in _write_entry(zf, entry):
+            pass
+        written += 1
+    return written
+
+
+def iter_file_and_remove(path: str) -> Iterator[bytes]:
+    """Stream a file in COPY_CHUNK_SIZE chunks and delete it afterwards"""
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(COPY_CHUNK_SIZE):
+                yield chunk
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
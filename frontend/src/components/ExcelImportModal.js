@@ -26,6 +26,7 @@ const ExcelImportModal = ({ open, onClose, onSuccess }) => {
   const [file, setFile] = useState(null);
   const [uploading, setUploading] = useState(false);
   const [result, setResult] = useState(null);
+  const [preview, setPreview] = useState(null);
   const [projeler, setProjeler] = useState([]);
   const [selectedProje, setSelectedProje] = useState('');
 
@@ -76,10 +77,22 @@ const ExcelImportModal = ({ open, onClose, onSuccess }) => {
       }
       setFile(selectedFile);
       setResult(null);
+      discardPreview();
     }
   };
 
-  const handleUpload = async () => {
+  const discardPreview = () => {
+    if (preview) {
+      const token = localStorage.getItem('token');
+      axios.delete(`${API}/excel/import/${preview.token}`, {
+        headers: { Authorization: `Bearer ${token}` },
+      }).catch(() => {});
+    }
+    setPreview(null);
+  };
+
+  // Step 1: the file is validated on the server (dry run), nothing is written yet
+  const handlePreview = async () => {
     if (!selectedProje) {
       toast.error('Lütfen bir proje seçin');
       return;
@@ -96,6 +109,7 @@ const ExcelImportModal = ({ open, onClose, onSuccess }) => {
       const formData = new FormData();
       formData.append('file', file);
       formData.append('proje_id', selectedProje);
+      formData.append('dry_run', 'true');
 
       const response = await axios.post(`${API}/excel/import`, formData, {
         headers: {
@@ -104,6 +118,25 @@ const ExcelImportModal = ({ open, onClose, onSuccess }) => {
         },
       });
 
+      setResult(null);
+      setPreview(response.data);
+    } catch (error) {
+      toast.error(error.response?.data?.detail || 'Excel dosyası doğrulanamadı');
+    } finally {
+      setUploading(false);
+    }
+  };
+
+  // Step 2: the validated rows are written without uploading the file again
+  const handleUpload = async () => {
+    setUploading(true);
+    try {
+      const token = localStorage.getItem('token');
+      const response = await axios.post(`${API}/excel/import/${preview.token}/commit`, null, {
+        headers: { Authorization: `Bearer ${token}` },
+      });
+
+      setPreview(null);
       setResult(response.data);
       toast.success(response.data.message);
       
@@ -111,6 +144,7 @@ const ExcelImportModal = ({ open, onClose, onSuccess }) => {
         onSuccess();
       }
     } catch (error) {
+      setPreview(null);
       toast.error(error.response?.data?.detail || 'Excel içe aktarma başarısız');
     } finally {
       setUploading(false);
@@ -118,6 +152,7 @@ const ExcelImportModal = ({ open, onClose, onSuccess }) => {
   };
 
   const handleClose = () => {
+    discardPreview();
     setFile(null);
     setResult(null);
     setSelectedProje('');
@@ -141,7 +176,7 @@ const ExcelImportModal = ({ open, onClose, onSuccess }) => {
           {/* Project Selection */}
           <div className="bg-purple-50 border border-purple-200 rounded-lg p-4">
             <h4 className="font-semibold text-purple-900 mb-3">1. Proje Seçin</h4>
-            <Select value={selectedProje} onValueChange={setSelectedProje}>
+            <Select value={selectedProje} onValueChange={(value) => { setSelectedProje(value); discardPreview(); }}>
               <SelectTrigger className="w-full">
                 <SelectValue placeholder="Raporları hangi projeye eklensin?" />
               </SelectTrigger>
@@ -217,6 +252,63 @@ const ExcelImportModal = ({ open, onClose, onSuccess }) => {
             </div>
           </div>
 
+          {/* Preview */}
+          {preview && (
+            <div className="space-y-3" data-testid="excel-import-preview">
+              <div className="bg-blue-50 border border-blue-200 rounded-lg p-4">
+                <h4 className="font-semibold text-blue-900 mb-1">Önizleme</h4>
+                <p className="text-sm text-blue-800">
+                  {preview.total_rows} satırdan {preview.valid_count} rapor içe aktarılmaya hazır
+                  {preview.error_count > 0 ? `, ${preview.error_count} satırda hata var` : ''}
+                </p>
+                {preview.preview.length > 0 && (
+                  <div className="mt-3 max-h-40 overflow-auto">
+                    <table className="w-full text-xs text-left text-blue-900">
+                      <thead>
+                        <tr>
+                          <th className="pr-2">Satır</th>
+                          <th className="pr-2">Şehir</th>
+                          <th className="pr-2">Ekipman Adı</th>
+                          <th className="pr-2">Kategori</th>
+                          <th>Firma</th>
+                        </tr>
+                      </thead>
+                      <tbody>
+                        {preview.preview.map((row) => (
+                          <tr key={row.row}>
+                            <td className="pr-2">{row.row}</td>
+                            <td className="pr-2">{row.sehir}</td>
+                            <td className="pr-2">{row.ekipman_adi}</td>
+                            <td className="pr-2">{row.kategori}</td>
+                            <td>{row.firma}</td>
+                          </tr>
+                        ))}
+                      </tbody>
+                    </table>
+                  </div>
+                )}
+              </div>
+
+              {preview.errors.length > 0 && (
+                <div className="bg-red-50 border border-red-200 rounded-lg p-4">
+                  <div className="flex items-start gap-3">
+                    <AlertCircle className="h-5 w-5 text-red-600 mt-0.5" />
+                    <div className="flex-1">
+                      <h4 className="font-semibold text-red-900 mb-2">Hatalı Satırlar ({preview.errors.length})</h4>
+                      <div className="max-h-32 overflow-y-auto space-y-1">
+                        {preview.errors.map((error, index) => (
+                          <p key={index} className="text-xs text-red-800">
+                            {error}
+                          </p>
+                        ))}
+                      </div>
+                    </div>
+                  </div>
+                </div>
+              )}
+            </div>
+          )}
+
           {/* Results */}
           {result && (
             <div className="space-y-3">
@@ -269,13 +361,23 @@ const ExcelImportModal = ({ open, onClose, onSuccess }) => {
           <Button variant="outline" onClick={handleClose} data-testid="close-import-button">
             Kapat
           </Button>
-          <Button
-            onClick={handleUpload}
-            disabled={!selectedProje || !file || uploading}
-            data-testid="upload-excel-button"
-          >
-            {uploading ? 'İçe Aktarılıyor...' : 'İçe Aktar'}
-          </Button>
+          {preview ? (
+            <Button
+              onClick={handleUpload}
+              disabled={uploading || preview.valid_count === 0}
+              data-testid="upload-excel-button"
+            >
+              {uploading ? 'İçe Aktarılıyor...' : `${preview.valid_count} Raporu İçe Aktar`}
+            </Button>
+          ) : (
+            <Button
+              onClick={handlePreview}
+              disabled={!selectedProje || !file || uploading}
+              data-testid="preview-excel-button"
+            >
+              {uploading ? 'Doğrulanıyor...' : 'Önizle'}
+            </Button>
+          )}
         </DialogFooter>
       </DialogContent>
     </Dialog>
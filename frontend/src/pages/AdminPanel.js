@@ -106,6 +106,7 @@ const AdminPanel = () => {
   const [showKategoriImportDialog, setShowKategoriImportDialog] = useState(false);
   const [kategoriImportFile, setKategoriImportFile] = useState(null);
   const [kategoriImporting, setKategoriImporting] = useState(false);
+  const [kategoriImportPreview, setKategoriImportPreview] = useState(null);
 
   // Admin Message state
   const [showMessageDialog, setShowMessageDialog] = useState(false);
@@ -343,7 +344,24 @@ const AdminPanel = () => {
   };
 
   // Kategori Excel import
-  const handleKategoriImport = async () => {
+  const discardKategoriPreview = () => {
+    if (kategoriImportPreview) {
+      const token = localStorage.getItem('token');
+      axios.delete(`${API}/excel/import/${kategoriImportPreview.token}`, {
+        headers: { Authorization: `Bearer ${token}` },
+      }).catch(() => {});
+    }
+    setKategoriImportPreview(null);
+  };
+
+  const closeKategoriImportDialog = () => {
+    discardKategoriPreview();
+    setShowKategoriImportDialog(false);
+    setKategoriImportFile(null);
+  };
+
+  // Step 1: the file is validated on the server (dry run), nothing is written yet
+  const handleKategoriPreview = async () => {
     if (!kategoriImportFile) {
       toast.error('Lütfen bir dosya seçin');
       return;
@@ -354,6 +372,7 @@ const AdminPanel = () => {
       const token = localStorage.getItem('token');
       const formData = new FormData();
       formData.append('file', kategoriImportFile);
+      formData.append('dry_run', 'true');
 
       const response = await axios.post(`${API}/kategoriler/excel/import`, formData, {
         headers: {
@@ -362,6 +381,23 @@ const AdminPanel = () => {
         },
       });
 
+      setKategoriImportPreview(response.data);
+    } catch (error) {
+      toast.error(error.response?.data?.detail || 'Excel dosyası doğrulanamadı');
+    } finally {
+      setKategoriImporting(false);
+    }
+  };
+
+  // Step 2: the validated rows are written without uploading the file again
+  const handleKategoriImport = async () => {
+    setKategoriImporting(true);
+    try {
+      const token = localStorage.getItem('token');
+      const response = await axios.post(`${API}/excel/import/${kategoriImportPreview.token}/commit`, null, {
+        headers: { Authorization: `Bearer ${token}` },
+      });
+
       const { imported_count, skipped_count, errors } = response.data;
       
       if (imported_count > 0) {
@@ -374,10 +410,12 @@ const AdminPanel = () => {
         toast.warning(`${errors.length} satırda hata oluştu`);
       }
 
+      setKategoriImportPreview(null);
       setShowKategoriImportDialog(false);
       setKategoriImportFile(null);
       fetchKategoriler();
     } catch (error) {
+      setKategoriImportPreview(null);
       toast.error(error.response?.data?.detail || 'Import başarısız');
     } finally {
       setKategoriImporting(false);
@@ -1806,7 +1844,7 @@ const AdminPanel = () => {
       </Dialog>
 
       {/* Kategori Excel Import Dialog */}
-      <Dialog open={showKategoriImportDialog} onOpenChange={setShowKategoriImportDialog}>
+      <Dialog open={showKategoriImportDialog} onOpenChange={(open) => !open && closeKategoriImportDialog()}>
         <DialogContent data-testid="import-category-dialog">
           <DialogHeader>
             <DialogTitle className="flex items-center gap-2">
@@ -1841,7 +1879,10 @@ const AdminPanel = () => {
                 id="kategori-file"
                 type="file"
                 accept=".xlsx,.xls"
-                onChange={(e) => setKategoriImportFile(e.target.files[0])}
+                onChange={(e) => {
+                  setKategoriImportFile(e.target.files[0]);
+                  discardKategoriPreview();
+                }}
                 data-testid="category-import-file-input"
               />
               {kategoriImportFile && (
@@ -1850,36 +1891,106 @@ const AdminPanel = () => {
                 </p>
               )}
             </div>
+
+            {kategoriImportPreview && (
+              <div className="space-y-3">
+                <div className="bg-blue-50 border border-blue-200 rounded-lg p-4">
+                  <h4 className="font-medium text-blue-800 mb-1">Önizleme</h4>
+                  <p className="text-sm text-blue-700">
+                    {kategoriImportPreview.total_rows} satırdan {kategoriImportPreview.valid_count} kategori eklenmeye hazır
+                    {kategoriImportPreview.skipped_count > 0 ? `, ${kategoriImportPreview.skipped_count} kategori zaten mevcut (atlanacak)` : ''}
+                  </p>
+                  {kategoriImportPreview.preview.length > 0 && (
+                    <div className="mt-3 max-h-40 overflow-auto">
+                      <table className="w-full text-xs text-left text-blue-900">
+                        <thead>
+                          <tr>
+                            <th className="pr-2">Satır</th>
+                            <th className="pr-2">Kategori Adı</th>
+                            <th>Alt Kategoriler</th>
+                          </tr>
+                        </thead>
+                        <tbody>
+                          {kategoriImportPreview.preview.map((row) => (
+                            <tr key={row.row}>
+                              <td className="pr-2">{row.row}</td>
+                              <td className="pr-2">{row.isim}</td>
+                              <td>{row.alt_kategoriler.join(', ')}</td>
+                            </tr>
+                          ))}
+                        </tbody>
+                      </table>
+                    </div>
+                  )}
+                </div>
+
+                {kategoriImportPreview.errors.length > 0 && (
+                  <div className="bg-red-50 border border-red-200 rounded-lg p-4">
+                    <div className="flex items-start gap-3">
+                      <AlertCircle className="h-5 w-5 text-red-600 mt-0.5" />
+                      <div className="flex-1">
+                        <h4 className="font-medium text-red-800 mb-2">Hatalı Satırlar ({kategoriImportPreview.errors.length})</h4>
+                        <div className="max-h-32 overflow-y-auto space-y-1">
+                          {kategoriImportPreview.errors.map((error, index) => (
+                            <p key={index} className="text-xs text-red-700">
+                              {error}
+                            </p>
+                          ))}
+                        </div>
+                      </div>
+                    </div>
+                  </div>
+                )}
+              </div>
+            )}
           </div>
           <DialogFooter>
             <Button 
               variant="outline" 
-              onClick={() => {
-                setShowKategoriImportDialog(false);
-                setKategoriImportFile(null);
-              }}
+              onClick={closeKategoriImportDialog}
               disabled={kategoriImporting}
             >
               İptal
             </Button>
-            <Button 
-              onClick={handleKategoriImport}
-              disabled={!kategoriImportFile || kategoriImporting}
-              className="bg-emerald-600 hover:bg-emerald-700"
-              data-testid="submit-category-import-button"
-            >
-              {kategoriImporting ? (
-                <>
-                  <Loader2 className="h-4 w-4 mr-2 animate-spin" />
-                  İçe Aktarılıyor...
-                </>
-              ) : (
-                <>
-                  <Upload className="h-4 w-4 mr-2" />
-                  İçe Aktar
-                </>
-              )}
-            </Button>
+            {kategoriImportPreview ? (
+              <Button 
+                onClick={handleKategoriImport}
+                disabled={kategoriImporting || kategoriImportPreview.valid_count === 0}
+                className="bg-emerald-600 hover:bg-emerald-700"
+                data-testid="submit-category-import-button"
+              >
+                {kategoriImporting ? (
+                  <>
+                    <Loader2 className="h-4 w-4 mr-2 animate-spin" />
+                    İçe Aktarılıyor...
+                  </>
+                ) : (
+                  <>
+                    <Upload className="h-4 w-4 mr-2" />
+                    {kategoriImportPreview.valid_count} Kategoriyi İçe Aktar
+                  </>
+                )}
+              </Button>
+            ) : (
+              <Button 
+                onClick={handleKategoriPreview}
+                disabled={!kategoriImportFile || kategoriImporting}
+                className="bg-emerald-600 hover:bg-emerald-700"
+                data-testid="preview-category-import-button"
+              >
+                {kategoriImporting ? (
+                  <>
+                    <Loader2 className="h-4 w-4 mr-2 animate-spin" />
+                    Doğrulanıyor...
+                  </>
+                ) : (
+                  <>
+                    <Eye className="h-4 w-4 mr-2" />
+                    Önizle
+                  </>
+                )}
+              </Button>
+            )}
           </DialogFooter>
         </DialogContent>
       </Dialog>
@@ -44,6 +44,7 @@ const ProjeRaporlar = () => {
   const [loading, setLoading] = useState(true);
   const [user, setUser] = useState(null);
   const [exporting, setExporting] = useState(false);
+  const [zipProgress, setZipProgress] = useState(null);
   
   // Modal states
   const [showRaporModal, setShowRaporModal] = useState(false);
@@ -208,7 +209,7 @@ const ProjeRaporlar = () => {
     }
   };
 
-  // ZIP Export - Projeye ait tüm raporlar ve medya dosyaları
+  // ZIP Export - Projeye ait tüm raporlar ve medya dosyaları (arka planda hazırlanır)
   const handleZipExport = async () => {
     if (raporlar.length === 0) {
       showNotification('warning', 'Uyarı', 'İndirilecek rapor bulunamadı');
@@ -216,31 +217,35 @@ const ProjeRaporlar = () => {
     }
     
     setExporting(true);
+    setZipProgress(0);
     showNotification('info', 'Hazırlanıyor', `${raporlar.length} rapor ve medya dosyaları hazırlanıyor... Lütfen bekleyin.`);
     
     try {
       const token = localStorage.getItem('token');
+      const headers = { Authorization: `Bearer ${token}` };
       
-      // Proje bazlı ZIP endpoint'ini kullan - tüm medya dahil
-      const response = await axios.get(`${API}/raporlar/proje-zip-export/${projeId}`, 
-        {
-          headers: { Authorization: `Bearer ${token}` },
-          responseType: 'blob',
-          timeout: 300000, // 5 dakika timeout (büyük dosyalar için)
-        }
-      );
-
-      // Dosya adını response header'dan al
-      const contentDisposition = response.headers['content-disposition'];
-      let filename = `${proje?.proje_adi || 'Proje'}_Raporlar.zip`;
+      const startResponse = await axios.post(`${API}/raporlar/proje-zip-export/${projeId}`, {}, { headers });
+      const jobId = startResponse.data.job_id;
       
-      if (contentDisposition) {
-        const filenameMatch = contentDisposition.match(/filename[^;=\n]*=((['"]).*?\2|[^;\n]*)/);
-        if (filenameMatch && filenameMatch[1]) {
-          filename = filenameMatch[1].replace(/['"]/g, '');
+      // İş tamamlanana kadar ilerlemeyi takip et
+      let job = startResponse.data;
+      while (job.status !== 'completed') {
+        await new Promise(resolve => setTimeout(resolve, 1500));
+        const progressResponse = await axios.get(`${API}/raporlar/proje-zip-export/jobs/${jobId}`, { headers });
+        job = progressResponse.data;
+        if (job.status === 'failed') {
+          throw new Error(job.message);
         }
+        setZipProgress(job.progress || 0);
       }
-
+      
+      const response = await axios.get(`${API}/raporlar/proje-zip-export/jobs/${jobId}/download`, {
+        headers,
+        responseType: 'blob',
+        timeout: 0,
+      });
+      
+      const filename = job.filename || `${proje?.proje_adi || 'Proje'}_Raporlar.zip`;
       const saved = await downloadZip(new Blob([response.data]), filename);
       
       if (saved) {
@@ -248,13 +253,10 @@ const ProjeRaporlar = () => {
       }
     } catch (error) {
       console.error('ZIP export error:', error);
-      if (error.code === 'ECONNABORTED') {
-        showNotification('error', 'Hata', 'İndirme zaman aşımına uğradı. Dosya boyutu çok büyük olabilir.');
-      } else {
-        showNotification('error', 'Hata', error.response?.data?.detail || 'ZIP indirme başarısız');
-      }
+      showNotification('error', 'Hata', error.response?.data?.detail || error.message || 'ZIP indirme başarısız');
     } finally {
       setExporting(false);
+      setZipProgress(null);
     }
   };
 
@@ -353,7 +355,9 @@ const ProjeRaporlar = () => {
                   title="Tüm raporları medya dosyalarıyla birlikte indir"
                 >
                   <Archive className="h-4 w-4 mr-2" />
-                  {exporting ? 'Hazırlanıyor...' : 'Toplu ZIP (Medya Dahil)'}
+                  {exporting
+                    ? `Hazırlanıyor...${zipProgress !== null ? ` %${zipProgress}` : ''}`
+                    : 'Toplu ZIP (Medya Dahil)'}
                 </Button>
               </>
             )}
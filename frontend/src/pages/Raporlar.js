@@ -71,6 +71,9 @@ const Raporlar = () => {
   const [selectedRaporlar, setSelectedRaporlar] = useState([]);
   const [user, setUser] = useState(null);
   const [zipLoading, setZipLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalCount, setTotalCount] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   
   // Notification Modal state
   const [notification, setNotification] = useState({
@@ -115,6 +118,20 @@ const Raporlar = () => {
     }
   }, [location.state?.openNewRaporModal]);
 
+  const buildRaporParams = (customFilters = {}) => {
+    const params = new URLSearchParams();
+    
+    if (searchTerm) params.append('arama', searchTerm);
+    if (customFilters.kategori || filters.kategori) params.append('kategori', customFilters.kategori || filters.kategori);
+    if (customFilters.periyot || filters.periyot) params.append('periyot', customFilters.periyot || filters.periyot);
+    if (customFilters.uygunluk || filters.uygunluk) params.append('uygunluk', customFilters.uygunluk || filters.uygunluk);
+    if (customFilters.firma || filters.firma) params.append('firma', customFilters.firma || filters.firma);
+    
+    // Add limit for better performance
+    params.append('limit', '500');
+    return params;
+  };
+
   const fetchRaporlar = async (customFilters = {}, retryCount = 0) => {
     try {
       const token = localStorage.getItem('token');
@@ -123,22 +140,17 @@ const Raporlar = () => {
         return;
       }
       
-      const params = new URLSearchParams();
-      
-      if (searchTerm) params.append('arama', searchTerm);
-      if (customFilters.kategori || filters.kategori) params.append('kategori', customFilters.kategori || filters.kategori);
-      if (customFilters.periyot || filters.periyot) params.append('periyot', customFilters.periyot || filters.periyot);
-      if (customFilters.uygunluk || filters.uygunluk) params.append('uygunluk', customFilters.uygunluk || filters.uygunluk);
-      if (customFilters.firma || filters.firma) params.append('firma', customFilters.firma || filters.firma);
-      
-      // Add limit for better performance
-      params.append('limit', '500');
+      const params = buildRaporParams(customFilters);
+      params.append('total', 'estimated');
       
       const response = await axios.get(`${API}/raporlar?${params.toString()}`, {
         headers: { Authorization: `Bearer ${token}` },
         timeout: 10000, // 10 second timeout
       });
       setRaporlar(response.data);
+      setNextCursor(response.headers['x-next-cursor'] || null);
+      const total = response.headers['x-total-count'];
+      setTotalCount(total !== undefined ? parseInt(total, 10) : null);
     } catch (error) {
       if (error.response?.status === 401) {
         localStorage.removeItem('token');
@@ -154,6 +166,28 @@ const Raporlar = () => {
     }
   };
 
+  // Sonraki sayfayı (X-Next-Cursor) mevcut listeye ekle
+  const loadMoreRaporlar = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const token = localStorage.getItem('token');
+      const params = buildRaporParams();
+      params.append('cursor', nextCursor);
+      
+      const response = await axios.get(`${API}/raporlar?${params.toString()}`, {
+        headers: { Authorization: `Bearer ${token}` },
+        timeout: 10000,
+      });
+      setRaporlar(prev => [...prev, ...response.data]);
+      setNextCursor(response.headers['x-next-cursor'] || null);
+    } catch (error) {
+      toast.error('Raporlar yüklenemedi');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleSearch = () => {
     setCurrentPage(1);
     fetchRaporlar();
@@ -226,11 +260,6 @@ const Raporlar = () => {
       return;
     }
 
-    if (selectedRaporlar.length > 100) {
-      showNotification('warning', 'En fazla 100 rapor seçilebilir');
-      return;
-    }
-
     setZipLoading(true);
     toast.loading(`${selectedRaporlar.length} rapor hazırlanıyor...`);
 
@@ -245,7 +274,7 @@ const Raporlar = () => {
             'Content-Type': 'application/json'
           },
           responseType: 'blob',
-          timeout: 120000, // 2 dakika timeout (büyük dosyalar için)
+          timeout: 0, // ZIP akış halinde gelir, büyük seçimlerde süre sınırı yok
         }
       );
       
@@ -417,7 +446,9 @@ const Raporlar = () => {
             <div className="flex-1">
               <h1 className="text-2xl sm:text-3xl font-bold text-gray-800 mb-1">Raporlar</h1>
               <p className="text-sm sm:text-base text-gray-600">
-                {raporlar.length} rapor bulundu 
+                {totalCount !== null && totalCount > raporlar.length
+                  ? `${raporlar.length} / ${totalCount} rapor yüklendi `
+                  : `${raporlar.length} rapor bulundu `}
                 {selectedRaporlar.length > 0 && ` (${selectedRaporlar.length} seçili)`}
               </p>
             </div>
@@ -810,6 +841,14 @@ const Raporlar = () => {
               </CardContent>
             </Card>
           )}
+
+          {nextCursor && (
+            <div className="flex justify-center mt-4">
+              <Button onClick={loadMoreRaporlar} disabled={loadingMore} variant="outline">
+                {loadingMore ? 'Yükleniyor...' : 'Daha Fazla Rapor Yükle'}
+              </Button>
+            </div>
+          )}
           </>
         )}
       </div>
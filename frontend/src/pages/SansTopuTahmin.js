@@ -745,7 +745,7 @@ const SansTopuTahmin = () => {
                 <div>
                   <p className="font-semibold text-gray-900">Excel Olarak Kaydet</p>
                   <p className="text-sm text-gray-600">
-                    Tüm kombinasyonları Excel dosyasına aktarın (maks. 100.000 satır)
+                    Tüm kombinasyonları Excel dosyasına aktarın (satır sınırı yok, her 1.048.575 satırda yeni sayfa)
                   </p>
                 </div>
               </div>
@@ -16,6 +16,10 @@ const DrawDetailPage = () => {
   const navigate = useNavigate();
   const [draw, setDraw] = useState(null);
   const [participants, setParticipants] = useState([]);
+  const [participantCount, setParticipantCount] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [search, setSearch] = useState('');
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [showAddForm, setShowAddForm] = useState(false);
   
@@ -25,23 +29,48 @@ const DrawDetailPage = () => {
   const [lastName, setLastName] = useState('');
   const [contact, setContact] = useState('');
   const [uploading, setUploading] = useState(false);
+  const [uploadProgress, setUploadProgress] = useState(0);
   const [executing, setExecuting] = useState(false);
 
   useEffect(() => {
     loadData();
   }, [drawId]);
 
+  useEffect(() => {
+    if (loading) return;
+    const timer = setTimeout(() => loadParticipants(), 300);
+    return () => clearTimeout(timer);
+  }, [search]);
+
+  // First page (or the page after `cursor`) of participants plus the total count
+  const loadParticipants = async (cursor = null) => {
+    const token = localStorage.getItem('token');
+    const headers = { Authorization: `Bearer ${token}` };
+    const params = { q: search || undefined };
+    const [pageRes, countRes] = await Promise.all([
+      axios.get(`${API}/draws/${drawId}/participants`, {
+        headers,
+        params: { ...params, after: cursor || undefined }
+      }),
+      cursor ? Promise.resolve(null) : axios.get(`${API}/draws/${drawId}/participants/count`, { headers, params })
+    ]);
+    setParticipants((prev) => (cursor ? [...prev, ...pageRes.data] : pageRes.data));
+    setNextCursor(pageRes.headers['x-next-cursor'] || null);
+    if (countRes) {
+      setParticipantCount(countRes.data.count);
+    }
+  };
+
   const loadData = async () => {
     try {
       const token = localStorage.getItem('token');
       const headers = { Authorization: `Bearer ${token}` };
       
-      const [drawRes, participantsRes] = await Promise.all([
+      const [drawRes] = await Promise.all([
         axios.get(`${API}/draws/${drawId}`, { headers }),
-        axios.get(`${API}/draws/${drawId}/participants`, { headers })
+        loadParticipants()
       ]);
       setDraw(drawRes.data);
-      setParticipants(participantsRes.data);
     } catch (error) {
       console.error('Veri yüklenemedi:', error);
       toast.error('Veri yüklenemedi');
@@ -50,6 +79,18 @@ const DrawDetailPage = () => {
     }
   };
 
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    try {
+      await loadParticipants(nextCursor);
+    } catch (error) {
+      console.error('Veri yüklenemedi:', error);
+      toast.error('Veri yüklenemedi');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleAddParticipant = async (e) => {
     e.preventDefault();
     
@@ -90,8 +131,21 @@ const DrawDetailPage = () => {
     formData.append('file', file);
 
     setUploading(true);
+    setUploadProgress(0);
+    const token = localStorage.getItem('token');
+    const progressTimer = setInterval(async () => {
+      try {
+        const res = await axios.get(`${API}/draws/${drawId}/participants/upload/progress`, {
+          headers: { Authorization: `Bearer ${token}` }
+        });
+        if (res.data.status === 'processing') {
+          setUploadProgress(res.data.progress);
+        }
+      } catch (error) {
+        // progress is informational only
+      }
+    }, 1000);
     try {
-      const token = localStorage.getItem('token');
       const response = await axios.post(
         `${API}/draws/${drawId}/participants/upload`,
         formData,
@@ -112,6 +166,7 @@ const DrawDetailPage = () => {
       console.error('Yükleme hatası:', error);
       toast.error(error.response?.data?.detail || 'Dosya yüklenemedi');
     } finally {
+      clearInterval(progressTimer);
       setUploading(false);
       e.target.value = '';
     }
@@ -176,7 +231,7 @@ const DrawDetailPage = () => {
     );
   }
 
-  const canExecute = participants.length >= (draw.main_count + draw.backup_count);
+  const canExecute = draw.participant_count >= (draw.main_count + draw.backup_count);
 
   return (
     <Layout>
@@ -203,7 +258,7 @@ const DrawDetailPage = () => {
               <span>•</span>
               <span>Yedek: {draw.backup_count}</span>
               <span>•</span>
-              <span>Katılımcı: {participants.length}</span>
+              <span>Katılımcı: {draw.participant_count}</span>
             </div>
           </div>
         </div>
@@ -226,7 +281,7 @@ const DrawDetailPage = () => {
                   <label className="cursor-pointer">
                     <input
                       type="file"
-                      accept=".xlsx,.xls,.csv"
+                      accept=".xlsx,.csv"
                       onChange={handleFileUpload}
                       className="hidden"
                       disabled={uploading}
@@ -238,7 +293,7 @@ const DrawDetailPage = () => {
                       data-testid="upload-excel-button"
                     >
                       <Upload className="w-4 h-4 mr-2" />
-                      {uploading ? 'Yükleniyor...' : 'Excel Yükle'}
+                      {uploading ? `Yükleniyor... %${uploadProgress}` : 'Excel Yükle'}
                     </Button>
                   </label>
 
@@ -267,7 +322,7 @@ const DrawDetailPage = () => {
             {!canExecute && draw.status !== 'completed' && (
               <p className="text-amber-600 text-sm mt-4">
                 * Çekiliş için en az {draw.main_count + draw.backup_count} katılımcı gerekli. 
-                Eksik: {(draw.main_count + draw.backup_count) - participants.length}
+                Eksik: {(draw.main_count + draw.backup_count) - draw.participant_count}
               </p>
             )}
           </CardContent>
@@ -316,14 +371,25 @@ const DrawDetailPage = () => {
         {/* Participants Table */}
         <Card className="shadow-md">
           <CardHeader>
-            <CardTitle className="flex items-center gap-2">
-              <Users className="w-5 h-5" />
-              Katılımcılar ({participants.length})
-            </CardTitle>
+            <div className="flex flex-col sm:flex-row sm:items-center sm:justify-between gap-3">
+              <CardTitle className="flex items-center gap-2">
+                <Users className="w-5 h-5" />
+                Katılımcılar ({participantCount})
+              </CardTitle>
+              <Input
+                placeholder="ID No, ad veya soyad ile ara"
+                value={search}
+                onChange={(e) => setSearch(e.target.value)}
+                className="sm:w-72"
+                data-testid="participant-search-input"
+              />
+            </div>
           </CardHeader>
           <CardContent>
             {participants.length === 0 ? (
-              <p className="text-center text-gray-500 py-8">Henüz katılımcı eklenmemiş</p>
+              <p className="text-center text-gray-500 py-8">
+                {search ? 'Aramayla eşleşen katılımcı yok' : 'Henüz katılımcı eklenmemiş'}
+              </p>
             ) : (
               <div className="overflow-x-auto">
                 <table className="w-full">
@@ -363,6 +429,18 @@ const DrawDetailPage = () => {
                     ))}
                   </tbody>
                 </table>
+                {nextCursor && (
+                  <div className="flex justify-center pt-4">
+                    <Button
+                      onClick={handleLoadMore}
+                      disabled={loadingMore}
+                      variant="outline"
+                      data-testid="participants-load-more"
+                    >
+                      {loadingMore ? 'Yükleniyor...' : `Daha Fazla Göster (${participants.length}/${participantCount})`}
+                    </Button>
+                  </div>
+                )}
               </div>
             )}
           </CardContent>
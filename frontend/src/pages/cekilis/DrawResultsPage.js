@@ -41,12 +41,13 @@ const DrawResultsPage = () => {
     }
   };
 
-  const handleExport = async () => {
+  const handleExport = async (includeParticipants = false) => {
     setExporting(true);
     try {
       const token = localStorage.getItem('token');
       const response = await axios.get(`${API}/draws/${drawId}/export`, {
         headers: { Authorization: `Bearer ${token}` },
+        params: { include_participants: includeParticipants },
         responseType: 'blob'
       });
       
@@ -110,17 +111,33 @@ const DrawResultsPage = () => {
             <p className="text-gray-600 mt-1">
               Çekiliş Tarihi: {new Date(results.draw_date).toLocaleString('tr-TR')}
             </p>
+            {results.seed && (
+              <p className="text-xs text-gray-500 mt-1 font-mono break-all" data-testid="results-seed">
+                Seed: {results.seed} ({results.participant_total} katılımcı)
+              </p>
+            )}
           </div>
           
-          <Button
-            onClick={handleExport}
-            disabled={exporting}
-            className="bg-gradient-to-r from-amber-500 to-amber-600 hover:from-amber-600 hover:to-amber-700"
-            data-testid="export-results-button"
-          >
-            <Download className="w-5 h-5 mr-2" />
-            {exporting ? 'İndiriliyor...' : 'Excel İndir'}
-          </Button>
+          <div className="flex flex-wrap gap-2">
+            <Button
+              onClick={() => handleExport(false)}
+              disabled={exporting}
+              className="bg-gradient-to-r from-amber-500 to-amber-600 hover:from-amber-600 hover:to-amber-700"
+              data-testid="export-results-button"
+            >
+              <Download className="w-5 h-5 mr-2" />
+              {exporting ? 'İndiriliyor...' : 'Excel İndir'}
+            </Button>
+            <Button
+              onClick={() => handleExport(true)}
+              disabled={exporting}
+              variant="outline"
+              data-testid="export-results-participants-button"
+            >
+              <Download className="w-5 h-5 mr-2" />
+              Katılımcılarla İndir
+            </Button>
+          </div>
         </div>
 
         {/* Winners */}
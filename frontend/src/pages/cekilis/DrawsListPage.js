@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { useNavigate } from 'react-router-dom';
-import { Plus, Trophy, Users, Calendar, Trash2 } from 'lucide-react';
+import { Plus, Trophy, Users, Calendar, Trash2, Play } from 'lucide-react';
 import { Button } from '@/components/ui/button';
 import { toast } from 'sonner';
 import Layout from '@/components/Layout';
@@ -12,6 +12,7 @@ const API = `${BACKEND_URL}/api`;
 const DrawsListPage = () => {
   const [draws, setDraws] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [executingBatch, setExecutingBatch] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -51,6 +52,35 @@ const DrawsListPage = () => {
     }
   };
 
+  const readyDraws = draws.filter(
+    (d) => d.status !== 'completed' && d.participant_count >= d.main_count + d.backup_count
+  );
+
+  const handleExecuteBatch = async () => {
+    if (!window.confirm(`${readyDraws.length} çekiliş başlatılacak. Bu işlem geri alınamaz. Devam edilsin mi?`)) {
+      return;
+    }
+
+    setExecutingBatch(true);
+    try {
+      const token = localStorage.getItem('token');
+      const response = await axios.post(
+        `${API}/draws/execute-batch`,
+        { draw_ids: readyDraws.map((d) => d.id) },
+        { headers: { Authorization: `Bearer ${token}` } }
+      );
+      toast.success(`${response.data.completed} çekiliş tamamlandı`);
+      response.data.results
+        .filter((r) => r.status === 'failed')
+        .forEach((r) => toast.error(`${r.name || r.draw_id}: ${r.detail}`));
+      loadDraws();
+    } catch (error) {
+      toast.error(error.response?.data?.detail || 'Çekilişler yapılamadı');
+    } finally {
+      setExecutingBatch(false);
+    }
+  };
+
   const formatDate = (dateStr) => {
     const date = new Date(dateStr);
     return date.toLocaleDateString('tr-TR', {
@@ -85,14 +115,27 @@ const DrawsListPage = () => {
               Profesyonel çekiliş yönetim sistemi
             </p>
           </div>
-          <Button
-            onClick={() => navigate('/cekilis/olustur')}
-            className="bg-gradient-to-r from-purple-600 to-purple-700 hover:from-purple-700 hover:to-purple-800 text-white"
-            data-testid="create-draw-button"
-          >
-            <Plus className="w-4 h-4 mr-2" />
-            Yeni Çekiliş
-          </Button>
+          <div className="flex flex-wrap gap-2">
+            {readyDraws.length > 1 && (
+              <Button
+                onClick={handleExecuteBatch}
+                disabled={executingBatch}
+                className="bg-green-600 hover:bg-green-700 text-white"
+                data-testid="execute-batch-button"
+              >
+                <Play className="w-4 h-4 mr-2" />
+                {executingBatch ? 'Çekilişler yapılıyor...' : `Hazır Çekilişleri Başlat (${readyDraws.length})`}
+              </Button>
+            )}
+            <Button
+              onClick={() => navigate('/cekilis/olustur')}
+              className="bg-gradient-to-r from-purple-600 to-purple-700 hover:from-purple-700 hover:to-purple-800 text-white"
+              data-testid="create-draw-button"
+            >
+              <Plus className="w-4 h-4 mr-2" />
+              Yeni Çekiliş
+            </Button>
+          </div>
         </div>
 
         {/* Draws Grid */}